@@ -23,7 +23,9 @@ a = Analysis(
         'subprocess',
         'hashlib',
         'shutil',
-        'pathlib'
+        'pathlib',
+        'html',
+        'svg_report'
     ],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,178 @@
+# arrow_export.py
+"""
+Arrow IPC streaming export of monitoring samples.
+
+Samples from the collector's in-memory buffer or from stored history (the
+SQLite store, segment files, memmap files or the combined CSV files) are
+written as Arrow IPC stream record batches with the schema registry's native
+dtypes: timestamp[ns, UTC], float32, int16/int32, bool and dictionary-encoded
+text. Downstream tools read the columns directly (pyarrow.ipc.open_stream,
+pandas, polars, DuckDB) instead of parsing CSV text again.
+
+The stream goes to a file or to any writable binary object, including stdout,
+so it can be piped:
+    python arrow_export.py - data | python analyse.py
+
+pyarrow is optional and only imported when an export runs.
+
+Usage:
+    python arrow_export.py <output.arrows|-> [data_dir_or_file] [computer_id]
+"""
+
+import os
+import sys
+from data_schema import SCHEMA_COLUMNS, COLUMN_NAMES, flatten_status, apply_schema
+from timestamps import epoch_ns_series
+from zone_maps import frame_mask
+from history_loader import history_frames
+
+DEFAULT_BATCH_ROWS = 4096
+
+
+def _import_pyarrow():
+    """Import pyarrow on first use, with an install hint when it is missing"""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        raise ImportError("pyarrow is not installed. Please install it with: pip install pyarrow")
+    return pyarrow
+
+
+def arrow_schema():
+    """Arrow schema for samples, built from the schema registry's dtypes"""
+    pa = _import_pyarrow()
+    
+    types = {
+        'int64': pa.int64(),
+        'int32': pa.int32(),
+        'int16': pa.int16(),
+        'float32': pa.float32(),
+        'bool': pa.bool_(),
+        'category': pa.dictionary(pa.int32(), pa.string())
+    }
+    fields = []
+    for name, dtype, unit, _, _ in SCHEMA_COLUMNS:
+        arrow_type = pa.timestamp('ns', tz='UTC') if name == 'timestamp' else types[dtype]
+        metadata = {'unit': unit} if unit else None
+        fields.append(pa.field(name, arrow_type, metadata=metadata))
+    return pa.schema(fields)
+
+
+def frame_to_batches(df, schema=None, batch_rows=DEFAULT_BATCH_ROWS):
+    """Split a sample DataFrame into record batches with the sample schema"""
+    pa = _import_pyarrow()
+    
+    if schema is None:
+        schema = arrow_schema()
+    if len(df) == 0:
+        return []
+    
+    df = df.copy()
+    df['timestamp'] = epoch_ns_series(df['timestamp'])
+    df = df.dropna(subset=['timestamp'])
+    df['timestamp'] = df['timestamp'].astype('int64')
+    
+    present = [name for name in COLUMN_NAMES if name in df.columns]
+    df = apply_schema(df[present], add_missing=False, categories=True)
+    
+    arrays = []
+    for field in schema:
+        if field.name not in df.columns:
+            # Columns a file never recorded are null, not a made-up default
+            arrays.append(pa.nulls(len(df), type=field.type))
+        elif field.name == 'timestamp':
+            arrays.append(pa.array(df['timestamp'].to_numpy(), type=pa.int64()).cast(field.type))
+        else:
+            arrays.append(pa.array(df[field.name], type=field.type, from_pandas=True))
+    table = pa.Table.from_arrays(arrays, schema=schema)
+    return table.to_batches(max_chunksize=batch_rows)
+
+
+class ArrowStreamExporter:
+    """Writes sample frames or rows to an Arrow IPC stream, one record batch at a time"""
+    
+    def __init__(self, sink, batch_rows=DEFAULT_BATCH_ROWS):
+        pa = _import_pyarrow()
+        
+        self.batch_rows = batch_rows
+        self.schema = arrow_schema()
+        self.rows_written = 0
+        self.batches_written = 0
+        
+        # A path is opened (and closed) here; file objects such as stdout are left open
+        self.owns_sink = isinstance(sink, str)
+        self.sink = open(sink, 'wb') if self.owns_sink else sink
+        self.writer = pa.ipc.new_stream(self.sink, self.schema)
+    
+    def write_frame(self, df):
+        """Write a DataFrame of flat samples"""
+        for batch in frame_to_batches(df, self.schema, self.batch_rows):
+            self.writer.write_batch(batch)
+            self.rows_written += batch.num_rows
+            self.batches_written += 1
+    
+    def write_rows(self, rows):
+        """Write flat sample dicts or nested colector.py status records"""
+        import pandas as pd
+        
+        flat = [flatten_status(row) for row in rows]
+        if flat:
+            self.write_frame(pd.DataFrame(flat))
+    
+    def close(self):
+        """End the stream (and close the file if it was opened here)"""
+        self.writer.close()
+        if self.owns_sink:
+            self.sink.close()
+        else:
+            self.sink.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def export_history(sink, source="data", computer=None, start=None, end=None, where=None, batch_rows=DEFAULT_BATCH_ROWS):
+    """Stream stored history to an Arrow IPC sink; returns the number of rows written"""
+    with ArrowStreamExporter(sink, batch_rows) as exporter:
+        for df in history_frames(source, computer, start, end):
+            if where is not None and len(df):
+                df = df[frame_mask(df, where)]
+            exporter.write_frame(df)
+    return exporter.rows_written
+
+
+def export_samples(sink, rows, batch_rows=DEFAULT_BATCH_ROWS):
+    """Stream an in-memory sample buffer (e.g. the collector's data_log) to an Arrow IPC sink"""
+    with ArrowStreamExporter(sink, batch_rows) as exporter:
+        exporter.write_rows(rows)
+    return exporter.rows_written
+
+
+def main():
+    """Command line entry point: export stored history to an Arrow IPC stream file or stdout"""
+    if len(sys.argv) < 2:
+        print("Usage: python arrow_export.py <output.arrows|-> [data_dir_or_file] [computer_id]")
+        return
+    
+    output = sys.argv[1]
+    source = sys.argv[2] if len(sys.argv) > 2 else "data"
+    computer = sys.argv[3] if len(sys.argv) > 3 else None
+    
+    # Status goes to stderr when the stream itself goes to stdout
+    log = sys.stderr if output == '-' else sys.stdout
+    sink = sys.stdout.buffer if output == '-' else output
+    
+    try:
+        rows = export_history(sink, source, computer)
+    except ImportError as e:
+        print(f"❌ {e}", file=log)
+        return
+    print(f"✅ Exported {rows} samples from {source} as Arrow IPC to {'stdout' if output == '-' else output}", file=log)
+
+
+if __name__ == "__main__":
+    main()
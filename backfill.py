@@ -0,0 +1,382 @@
+# backfill.py
+"""
+Bulk backfill of the legacy CSV and JSON archive into a history store.
+
+Scans a data directory for the per-computer system_security_*_combined.csv
+files (flat rows from both monitors) and system_security_*_combined.json
+dumps (nested status records from colector.py), parses them in parallel and
+writes every sample into the SQLite, segment or memmap store. Rows are
+deduplicated on (computer_id, timestamp) - the CSV and JSON of one computer
+hold the same samples - both within a run and against what the store already
+holds.
+
+Progress is kept in a checkpoint file next to the store. A file is recorded
+only after its rows are written, and unchanged files (same size and mtime)
+are skipped on the next run, so an interrupted backfill resumes where it
+stopped; rows of a file that was half written are caught by the dedup.
+
+The checkpoint doubles as the store's coverage record: a file whose size and
+mtime still match its entry holds no rows the store lacks. Readers merge the
+store with every file that is not covered (uncovered_files), and a collector
+that writes each sample to both a file and the store keeps the file covered
+with extend_coverage, so enabling a store never hides earlier history.
+
+Usage:
+    python backfill.py [data_dir] [sqlite|segments|memmap] [workers] [--restart]
+"""
+
+import os
+import sys
+import json
+import time
+from timestamps import epoch_ns_series
+from data_schema import read_history_csv, flatten_status, apply_schema
+from file_catalog import HistoryFileCatalog, computer_id_from_json_filename
+from history_store import SQLiteHistoryStore, DEFAULT_DB_NAME
+from gorilla_store import GorillaSegmentWriter, GorillaSegmentReader, segment_filename
+from memmap_store import MemmapHistoryWriter, MemmapHistoryReader, memmap_filename
+
+STORE_FORMATS = ("sqlite", "segments", "memmap")
+
+
+def checkpoint_filename(store_format):
+    """Name of the resume checkpoint for one target store format"""
+    return f"backfill_{store_format}_checkpoint.json"
+
+
+def find_sources(data_dir):
+    """(computer_id, path) for every per-computer CSV and JSON history file"""
+    sources = []
+    for computer_id, paths in HistoryFileCatalog(data_dir).scan().items():
+        sources.extend((computer_id, path) for path in paths)
+    
+    try:
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                computer_id = computer_id_from_json_filename(entry.name)
+                if computer_id is not None and entry.is_file():
+                    sources.append((computer_id, entry.path))
+    except FileNotFoundError:
+        return []
+    return sorted(sources, key=lambda source: source[1])
+
+
+def parse_source(path, computer_id):
+    """Read one CSV or JSON file into schema rows with epoch-ns timestamps, deduplicated
+    
+    Module-level so it can run in a worker process.
+    """
+    import pandas as pd
+    
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        rows = []
+        for record in records if isinstance(records, list) else [records]:
+            try:
+                rows.append(flatten_status(record))
+            except (KeyError, TypeError):
+                continue
+        df = apply_schema(pd.DataFrame(rows), add_missing=False, categories=False)
+    else:
+        df = read_history_csv(path, categories=False)
+    
+    if len(df) == 0 or 'timestamp' not in df.columns:
+        return pd.DataFrame()
+    
+    # Rows written before computer_id was recorded belong to the file's computer
+    if 'computer_id' not in df.columns:
+        df['computer_id'] = computer_id
+    df['computer_id'] = df['computer_id'].fillna(computer_id).replace('', computer_id)
+    
+    df['timestamp'] = epoch_ns_series(df['timestamp'])
+    df = df.dropna(subset=['timestamp'])
+    df['timestamp'] = df['timestamp'].astype('int64')
+    return df.drop_duplicates(subset=['computer_id', 'timestamp']).reset_index(drop=True)
+
+
+def frame_records(df):
+    """DataFrame rows as dicts with None for missing values, as the store writers expect"""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+class BackfillTarget:
+    """Destination store that only writes (computer_id, timestamp) keys it does not hold yet"""
+    
+    def __init__(self, data_dir, store_format):
+        if store_format not in STORE_FORMATS:
+            raise ValueError(f"Unknown store format: {store_format} (expected one of {', '.join(STORE_FORMATS)})")
+        self.data_dir = data_dir
+        self.store_format = store_format
+        self.store = SQLiteHistoryStore(os.path.join(data_dir, DEFAULT_DB_NAME)) if store_format == "sqlite" else None
+        self.writers = {}
+        self.keys = {}
+    
+    def describe(self):
+        """Human-readable location of the target store"""
+        if self.store_format == "sqlite":
+            return self.store.db_path
+        pattern = segment_filename("*") if self.store_format == "segments" else memmap_filename("*")
+        return os.path.join(self.data_dir, pattern)
+    
+    def _writer(self, computer_id):
+        """Per-computer writer, seeding the key set from the file's existing timestamps"""
+        if computer_id in self.writers:
+            return self.writers[computer_id]
+        
+        if self.store_format == "segments":
+            path = os.path.join(self.data_dir, segment_filename(computer_id))
+            existing = GorillaSegmentReader(path).read_arrays(columns=['timestamp'])['timestamp'] if os.path.exists(path) else []
+            writer = GorillaSegmentWriter(path)
+        else:
+            path = os.path.join(self.data_dir, memmap_filename(computer_id))
+            existing = MemmapHistoryReader(path).column('timestamp') if os.path.exists(path) else []
+            writer = MemmapHistoryWriter(path)
+        
+        self.keys[computer_id] = {int(value) for value in existing}
+        self.writers[computer_id] = writer
+        return writer
+    
+    def write(self, df):
+        """Write a parsed file's rows; returns how many were new"""
+        if len(df) == 0:
+            return 0
+        if self.store is not None:
+            # The unique (computer_id, timestamp) index drops duplicates
+            return max(self.store.insert_samples(frame_records(df)), 0)
+        
+        written = 0
+        for computer_id, rows in df.groupby('computer_id', sort=False):
+            writer = self._writer(computer_id)
+            keys = self.keys[computer_id]
+            rows = rows[~rows['timestamp'].isin(keys)]
+            if len(rows) == 0:
+                continue
+            writer.insert_samples(frame_records(rows))
+            keys.update(int(value) for value in rows['timestamp'])
+            written += len(rows)
+        return written
+    
+    def close(self):
+        """Flush and close every open writer"""
+        for writer in self.writers.values():
+            writer.close()
+        if self.store is not None:
+            self.store.close()
+
+
+class Backfill:
+    """Parallel, resumable conversion of a data directory's CSV/JSON history into one store"""
+    
+    def __init__(self, data_dir="data", store_format="sqlite", workers=None, computers=None):
+        self.data_dir = data_dir
+        self.store_format = store_format
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        # Only these computers' files are converted (None = every computer)
+        self.computers = None if computers is None else set(computers)
+        self.checkpoint_path = os.path.join(data_dir, checkpoint_filename(store_format))
+        self.checkpoint = self._load_checkpoint()
+        self.dirty = False
+    
+    def _load_checkpoint(self):
+        """Files already converted into this store, by file name"""
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("store_format") == self.store_format:
+                return checkpoint
+        except (FileNotFoundError, ValueError):
+            pass
+        return {"store_format": self.store_format, "files": {}}
+    
+    def _save_checkpoint(self):
+        """Write the checkpoint atomically"""
+        temp = self.checkpoint_path + ".tmp"
+        with open(temp, 'w') as f:
+            json.dump(self.checkpoint, f, indent=2)
+        os.replace(temp, self.checkpoint_path)
+    
+    def reset(self):
+        """Forget the checkpoint so every file is converted again"""
+        self.checkpoint = {"store_format": self.store_format, "files": {}}
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+    
+    def is_covered(self, path):
+        """Whether the file was converted and has not changed since"""
+        entry = self.checkpoint["files"].get(os.path.basename(path))
+        if entry is None:
+            return False
+        stat = os.stat(path)
+        return entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+    
+    def _mark_done(self, path, stat, rows, written):
+        """Record a converted file in the checkpoint"""
+        self.checkpoint["files"][os.path.basename(path)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "rows": rows,
+            "written": written
+        }
+        self._save_checkpoint()
+    
+    def extend_coverage(self, path, previous_stat):
+        """Keep a file covered after rows were appended to it and also written to the store
+        
+        `previous_stat` is the file's os.stat before the append (None if it did
+        not exist yet). A file that was not covered before stays uncovered.
+        The checkpoint is written by save().
+        """
+        name = os.path.basename(path)
+        entry = self.checkpoint["files"].get(name)
+        if previous_stat is None:
+            if entry is not None:
+                return False
+            entry = self.checkpoint["files"][name] = {"rows": 0, "written": 0}
+        elif entry is None or entry.get("size") != previous_stat.st_size or entry.get("mtime_ns") != previous_stat.st_mtime_ns:
+            return False
+        
+        stat = os.stat(path)
+        entry["size"] = stat.st_size
+        entry["mtime_ns"] = stat.st_mtime_ns
+        self.dirty = True
+        return True
+    
+    def save(self):
+        """Write the checkpoint if extend_coverage changed it"""
+        if self.dirty:
+            self._save_checkpoint()
+            self.dirty = False
+    
+    def run(self, executor="process", verbose=True):
+        """Convert every pending source file; returns throughput statistics
+        
+        With verbose=False nothing is printed; read errors are only counted
+        in the returned "failed" statistic.
+        """
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+        
+        sources = find_sources(self.data_dir)
+        if self.computers is not None:
+            sources = [(computer_id, path) for computer_id, path in sources if computer_id in self.computers]
+        pending = [(computer_id, path) for computer_id, path in sources if not self.is_covered(path)]
+        stats = {
+            "files": len(pending),
+            "skipped": len(sources) - len(pending),
+            "converted": 0,
+            "failed": 0,
+            "bytes": 0,
+            "rows_read": 0,
+            "rows_written": 0,
+            "duplicates": 0,
+            "seconds": 0.0
+        }
+        
+        if stats["skipped"] and verbose:
+            print(f"⏭️  {stats['skipped']} files already converted (checkpoint {self.checkpoint_path})")
+        if not pending:
+            if verbose:
+                print("✅ Nothing to backfill")
+            return stats
+        
+        target = BackfillTarget(self.data_dir, self.store_format)
+        if verbose:
+            print(f"🚚 Backfilling {len(pending)} files into {target.describe()} with {min(self.workers, len(pending))} workers...")
+        
+        started = time.perf_counter()
+        
+        def finish(path, stat, df):
+            written = target.write(df)
+            self._mark_done(path, stat, len(df), written)
+            stats["bytes"] += stat.st_size
+            stats["rows_read"] += len(df)
+            stats["rows_written"] += written
+            stats["converted"] += 1
+            if verbose:
+                self._report_progress(stats, len(pending), started)
+        
+        try:
+            workers = min(self.workers, len(pending))
+            if workers <= 1:
+                for computer_id, path in pending:
+                    stat = os.stat(path)
+                    try:
+                        df = parse_source(path, computer_id)
+                    except Exception as e:
+                        stats["failed"] += 1
+                        if verbose:
+                            print(f"❌ Error reading {path}: {e}")
+                        continue
+                    finish(path, stat, df)
+            else:
+                pool_class = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+                with pool_class(max_workers=workers) as pool:
+                    # Stat before parsing, so a file appended to meanwhile is converted again next run
+                    futures = {
+                        pool.submit(parse_source, path, computer_id): (path, os.stat(path))
+                        for computer_id, path in pending
+                    }
+                    for future in as_completed(futures):
+                        path, stat = futures[future]
+                        try:
+                            df = future.result()
+                        except Exception as e:
+                            stats["failed"] += 1
+                            if verbose:
+                                print(f"❌ Error reading {path}: {e}")
+                                self._report_progress(stats, len(pending), started)
+                            continue
+                        finish(path, stat, df)
+        finally:
+            target.close()
+            stats["seconds"] = time.perf_counter() - started
+            stats["duplicates"] = stats["rows_read"] - stats["rows_written"]
+        
+        if verbose:
+            self._report_summary(stats)
+        return stats
+    
+    def _report_progress(self, stats, total, started):
+        """Print conversion progress roughly every 10% (and at the end)"""
+        done = stats["converted"] + stats["failed"]
+        step = max(1, total // 10)
+        if done % step == 0 or done == total:
+            elapsed = time.perf_counter() - started
+            print(f"📥 {done}/{total} files, {stats['rows_written']:,} rows written "
+                  f"({stats['rows_read'] / elapsed:,.0f} rows/s)")
+    
+    def _report_summary(self, stats):
+        """Print the final throughput statistics"""
+        seconds = max(stats["seconds"], 1e-9)
+        megabytes = stats["bytes"] / (1024**2)
+        print(f"✅ Backfill finished in {stats['seconds']:.2f}s")
+        print(f"   📁 {stats['converted']} files converted, {stats['skipped']} skipped, {stats['failed']} failed")
+        print(f"   📊 {stats['rows_read']:,} rows read, {stats['rows_written']:,} written, {stats['duplicates']:,} duplicates dropped")
+        print(f"   ⚡ {stats['rows_read'] / seconds:,.0f} rows/s, {megabytes / seconds:.1f} MB/s ({megabytes:.1f} MB read)")
+
+
+def uncovered_files(data_dir, store_format, paths):
+    """The given history files holding rows the store may lack (never backfilled, or changed since)"""
+    coverage = Backfill(data_dir, store_format)
+    return [path for path in paths if not coverage.is_covered(path)]
+
+
+def main():
+    """Command line entry point: backfill a data directory into a history store"""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    data_dir = args[0] if len(args) > 0 else "data"
+    store_format = args[1] if len(args) > 1 else "sqlite"
+    workers = int(args[2]) if len(args) > 2 else None
+    
+    if store_format not in STORE_FORMATS:
+        print(f"Usage: python backfill.py [data_dir] [{'|'.join(STORE_FORMATS)}] [workers] [--restart]")
+        return
+    
+    backfill = Backfill(data_dir, store_format, workers)
+    if '--restart' in sys.argv:
+        backfill.reset()
+    backfill.run()
+
+
+if __name__ == "__main__":
+    main()
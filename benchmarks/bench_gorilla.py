@@ -0,0 +1,105 @@
+# bench_gorilla.py
+"""
+Compression ratio and decode throughput of Gorilla segments vs. CSV.
+
+Every per-computer history CSV in the data directory is converted to a
+segment file in a temporary directory, checked for a lossless round trip,
+then decoded repeatedly and compared against read_history_csv (typed
+loading) and a plain pd.read_csv (parsing only) of the same file.
+
+Usage:
+    python benchmarks/bench_gorilla.py [data_dir] [repeats]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from data_schema import read_history_csv
+from file_catalog import HistoryFileCatalog
+from gorilla_store import GorillaSegmentReader, convert_csv, segment_filename
+
+
+def best_of(repeats, func):
+    """Fastest wall-clock time of `repeats` calls"""
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def plain_read_csv(path):
+    """pd.read_csv of a history file, skipping a legacy leading '#' line"""
+    with open(path, encoding='utf-8') as f:
+        skip = 1 if f.readline().startswith('#') else 0
+    return pd.read_csv(path, skiprows=skip)
+
+
+def main():
+    """Convert, verify and time every history CSV in the data directory"""
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "data"
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    
+    catalog = HistoryFileCatalog(data_dir).scan()
+    if not catalog:
+        print(f"❌ No history CSV files found in {data_dir}")
+        return
+    
+    totals = {"csv_bytes": 0, "segment_bytes": 0, "rows": 0, "values": 0, "decode": 0.0, "read_csv": 0.0, "pd_read_csv": 0.0}
+    
+    print(f"{'computer':<20}{'rows':>8}{'csv bytes':>12}{'gts bytes':>12}{'ratio':>8}"
+          f"{'decode rows/s':>16}{'read_history rows/s':>21}{'pd.read_csv rows/s':>20}")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for computer_id, paths in sorted(catalog.items()):
+            for csv_path in paths:
+                segment_path = os.path.join(temp_dir, segment_filename(computer_id))
+                rows = convert_csv(csv_path, segment_path)
+                if rows == 0:
+                    continue
+                
+                reader = GorillaSegmentReader(segment_path)
+                arrays = reader.read_arrays()
+                
+                # Lossless round trip for every numeric column
+                source = read_history_csv(csv_path, categories=False)
+                for name, kind in reader.columns:
+                    if kind == 'float' and name in source.columns:
+                        expected = source[name].astype('float64').to_numpy()
+                        order = np.argsort(arrays['timestamp'], kind='stable')
+                        assert np.array_equal(np.sort(arrays[name][order]), np.sort(expected), equal_nan=True), name
+                
+                decode_time = best_of(repeats, reader.read_arrays)
+                read_csv_time = best_of(repeats, lambda: read_history_csv(csv_path))
+                pd_read_csv_time = best_of(repeats, lambda: plain_read_csv(csv_path))
+                
+                csv_bytes = os.path.getsize(csv_path)
+                segment_bytes = os.path.getsize(segment_path)
+                print(f"{computer_id:<20}{rows:>8}{csv_bytes:>12,}{segment_bytes:>12,}"
+                      f"{csv_bytes / segment_bytes:>7.1f}x{rows / decode_time:>16,.0f}{rows / read_csv_time:>21,.0f}{rows / pd_read_csv_time:>20,.0f}")
+                
+                totals["csv_bytes"] += csv_bytes
+                totals["segment_bytes"] += segment_bytes
+                totals["rows"] += rows
+                totals["values"] += rows * len(reader.columns)
+                totals["decode"] += decode_time
+                totals["read_csv"] += read_csv_time
+                totals["pd_read_csv"] += pd_read_csv_time
+    
+    print(f"\n📊 Total: {totals['rows']} rows, {totals['csv_bytes']:,} → {totals['segment_bytes']:,} bytes "
+          f"({totals['csv_bytes'] / totals['segment_bytes']:.1f}x smaller)")
+    print(f"⚡ Decode: {totals['values'] / totals['decode']:,.0f} values/s "
+          f"({totals['rows'] / totals['decode']:,.0f} rows/s) vs read_history_csv "
+          f"{totals['rows'] / totals['read_csv']:,.0f} rows/s, pd.read_csv {totals['rows'] / totals['pd_read_csv']:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
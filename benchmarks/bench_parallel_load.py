@@ -0,0 +1,83 @@
+# bench_parallel_load.py
+"""
+Serial vs. parallel parsing of many per-computer history files.
+
+Generates synthetic combined-history CSVs for N hosts in a temporary
+directory, then loads them with IncrementalCSVLoader.load_many() serially,
+with a thread pool and with a process pool, and merges the results in
+timestamp order.
+
+Usage:
+    python benchmarks/bench_parallel_load.py [hosts] [rows_per_host] [workers]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from data_schema import COLUMN_NAMES, BOOLEAN_COLUMNS
+from file_catalog import history_filename
+from history_loader import IncrementalCSVLoader, merge_by_timestamp
+
+
+def write_synthetic_host(data_dir, index, rows, rng):
+    """Write one host's combined CSV with a minute-spaced random walk"""
+    computer_id = f"HOST_{index:04d}"
+    start = 1_750_000_000_000_000_000 + index * 1_000_000_000
+    data = {
+        'timestamp': start + np.arange(rows, dtype='int64') * 60_000_000_000 + rng.integers(0, 5_000_000, rows),
+        'computer_name': computer_id,
+        'computer_id': computer_id,
+        'os_system': 'Windows'
+    }
+    for name in COLUMN_NAMES:
+        if name in data:
+            continue
+        if name in BOOLEAN_COLUMNS:
+            data[name] = rng.random(rows) > 0.1
+        elif name.endswith('_count'):
+            data[name] = rng.integers(0, 5, rows)
+        else:
+            data[name] = np.clip(50 + np.cumsum(rng.normal(0, 1, rows)), 0, 100)
+    pd.DataFrame(data, columns=COLUMN_NAMES).to_csv(os.path.join(data_dir, history_filename(computer_id)), index=False)
+
+
+def timed_load(paths, workers, executor):
+    """Fresh loader, parse all files, merge; returns (seconds, merged rows)"""
+    started = time.perf_counter()
+    loaded = IncrementalCSVLoader().load_many(paths, workers=workers, executor=executor, progress=False)
+    merged = merge_by_timestamp(list(loaded.values()))
+    return time.perf_counter() - started, len(merged)
+
+
+def main():
+    """Generate the synthetic archive and time each loading strategy"""
+    hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+    
+    rng = np.random.default_rng(42)
+    with tempfile.TemporaryDirectory() as data_dir:
+        print(f"🏗️  Writing {hosts} synthetic host files with {rows} rows each...")
+        for index in range(hosts):
+            write_synthetic_host(data_dir, index, rows, rng)
+        paths = sorted(os.path.join(data_dir, name) for name in os.listdir(data_dir))
+        total_mb = sum(os.path.getsize(path) for path in paths) / (1024**2)
+        print(f"📁 {len(paths)} files, {total_mb:.1f} MB\n")
+        
+        serial_time, serial_rows = timed_load(paths, 1, "process")
+        print(f"{'serial':<22}{serial_time:>8.2f}s  {serial_rows:,} rows")
+        
+        for executor in ("thread", "process"):
+            elapsed, merged_rows = timed_load(paths, workers, executor)
+            assert merged_rows == serial_rows
+            print(f"{executor + f' pool ({workers})':<22}{elapsed:>8.2f}s  {serial_time / elapsed:.1f}x vs serial")
+
+
+if __name__ == "__main__":
+    main()
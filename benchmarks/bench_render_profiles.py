@@ -0,0 +1,73 @@
+# bench_render_profiles.py
+"""
+Render time and file size of every chart kind under each render profile.
+
+Builds a synthetic plotting frame (minute-spaced random walks for every
+charted column), renders the dashboard, CPU, memory and security charts
+with each profile in charts.RENDER_PROFILES into a temporary directory and
+reports seconds and bytes per chart.
+
+Usage:
+    python benchmarks/bench_render_profiles.py [rows] [profile,profile,...]
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from charts import CHART_KINDS, PLOT_COLUMNS, RENDER_PROFILES, render_job, chart_filename, _init_worker
+
+
+def synthetic_frame(rows, rng):
+    """Plotting frame with a minute-spaced random walk in every charted column"""
+    start = pd.Timestamp("2025-06-01 00:00:00")
+    data = {'timestamp': pd.date_range(start, periods=rows, freq='min')}
+    for name in PLOT_COLUMNS:
+        if name in ('antivirus_enabled', 'real_time_protection'):
+            data[name] = (rng.random(rows) > 0.05).astype('float64')
+        elif name.endswith('_count'):
+            data[name] = rng.integers(0, 5, rows).astype('float64')
+        elif name == 'memory_total_gb':
+            data[name] = np.full(rows, 16.0)
+        else:
+            data[name] = np.clip(50 + np.cumsum(rng.normal(0, 1, rows)), 0, 100)
+    data['memory_used_gb'] = data['memory_percent'] / 100 * 16
+    return pd.DataFrame(data)
+
+
+def main():
+    """Render every chart kind with each profile and print a time / size table"""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    profiles = sys.argv[2].split(',') if len(sys.argv) > 2 else list(RENDER_PROFILES)
+    
+    _init_worker()
+    df = synthetic_frame(rows, np.random.default_rng(42))
+    print(f"📊 {rows:,} rows, profiles: {', '.join(profiles)}\n")
+    print(f"{'chart':<12}" + "".join(f"{name:>22}" for name in profiles))
+    
+    totals = {name: [0.0, 0] for name in profiles}
+    with tempfile.TemporaryDirectory() as charts_dir:
+        # Warm-up so the first measurement does not pay for font loading
+        render_job("cpu", df, "BENCH", os.path.join(charts_dir, "warmup.png"), "preview")
+        
+        for kind in CHART_KINDS:
+            cells = []
+            for name in profiles:
+                extension = RENDER_PROFILES[name]["format"]
+                path = os.path.join(charts_dir, chart_filename(kind, f"BENCH_{name}", "bench", extension))
+                _, _, seconds = render_job(kind, df, "BENCH", path, name)
+                size = os.path.getsize(path)
+                totals[name][0] += seconds
+                totals[name][1] += size
+                cells.append(f"{seconds:>8.2f}s {size / 1024:>9,.0f} KB")
+            print(f"{kind:<12}" + "".join(f"{cell:>22}" for cell in cells))
+    
+    print(f"{'total':<12}" + "".join(f"{f'{seconds:.2f}s {size / 1024:,.0f} KB':>22}" for seconds, size in totals.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# bench_startup.py
+"""
+Cold import cost of the monitor, measured with python -X importtime.
+
+Imports a module (colector by default) in fresh interpreters, parses the
+importtime report on stderr and prints the median total, the slowest
+imports by cumulative time and whether any heavy module (pandas, numpy,
+matplotlib) was loaded. Status-only use should not need any of them; the
+exit code is 1 when one is loaded, so the check can run in CI.
+
+Usage:
+    python benchmarks/bench_startup.py [module] [runs] [top]
+"""
+
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib')
+
+
+def import_times(module):
+    """{module: (self us, cumulative us)} of one fresh `import module`"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    """Time fresh imports and report the total, the slowest imports and heavy modules"""
+    module = sys.argv[1] if len(sys.argv) > 1 else "colector"
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    top = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    
+    # The first run also writes the bytecode caches
+    import_times(module)
+    samples = [import_times(module) for _ in range(runs)]
+    totals = sorted(times[module][1] for times in samples)
+    median = samples[[times[module][1] for times in samples].index(totals[len(totals) // 2])]
+    
+    print(f"🚀 import {module}: median {totals[len(totals) // 2] / 1000:.1f} ms "
+          f"(min {totals[0] / 1000:.1f} ms, max {totals[-1] / 1000:.1f} ms, {runs} runs)\n")
+    print(f"{'module':<40}{'self ms':>10}{'cumulative ms':>16}")
+    for name, (self_us, cumulative_us) in sorted(median.items(), key=lambda item: -item[1][1])[1:top + 1]:
+        print(f"{name:<40}{self_us / 1000:>10.1f}{cumulative_us / 1000:>16.1f}")
+    
+    heavy = [name for name in HEAVY_MODULES if name in median]
+    if heavy:
+        print(f"\n❌ Heavy modules imported at startup: {', '.join(heavy)}")
+        sys.exit(1)
+    print(f"\n✅ No heavy modules ({', '.join(HEAVY_MODULES)}) imported at startup")
+
+
+if __name__ == "__main__":
+    main()
@@ -55,7 +55,9 @@ a = Analysis(
         'subprocess',
         'hashlib',
         'shutil',
-        'pathlib'
+        'pathlib',
+        'html',
+        'svg_report'
     ],
     hookspath=[],
     hooksconfig={},
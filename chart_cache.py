@@ -0,0 +1,164 @@
+# chart_cache.py
+"""
+Content-addressed cache of rendered chart images.
+
+Every run of the charts menu used to write a new timestamped PNG even when
+the history behind it had not changed. Each chart is now keyed by a SHA-256
+hash of its kind, the computer, the data it would be drawn from (row count,
+first and last timestamp and the values of the last row) and the render
+settings (dpi, render version). When the key is already in the cache and its
+image still exists, that path is returned and nothing is drawn.
+
+The index is a small JSON file in the charts directory. It is bounded by a
+number of entries and a total image size; when either limit is exceeded the
+least recently used images are deleted. Images the cache did not write are
+never touched.
+"""
+
+import os
+import json
+import hashlib
+from timestamps import now_ns
+
+CACHE_INDEX_NAME = "chart_cache.json"
+CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 200
+DEFAULT_MAX_BYTES = 256 * 1024**2
+
+
+def frame_fingerprint(df):
+    """Row count, time range and last-row values of a plotting frame"""
+    if len(df) == 0:
+        return {"rows": 0, "columns": sorted(str(col) for col in df.columns)}
+    
+    last_row = df.iloc[-1]
+    return {
+        "rows": len(df),
+        "columns": sorted(str(col) for col in df.columns),
+        "first": str(df['timestamp'].iloc[0]),
+        "last": str(df['timestamp'].iloc[-1]),
+        "last_row": {str(col): repr(last_row[col]) for col in df.columns}
+    }
+
+
+def chart_key(kind, computer_name, df, settings=None):
+    """Hex digest identifying one chart of one data state under given render settings"""
+    payload = {
+        "kind": kind,
+        "computer": computer_name,
+        "data": frame_fingerprint(df),
+        "settings": settings or {}
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ChartCache:
+    """LRU index of rendered chart images, keyed by chart_key"""
+    
+    def __init__(self, charts_dir, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.charts_dir = charts_dir
+        self.path = os.path.join(charts_dir, CACHE_INDEX_NAME)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = None
+        self.hits = 0
+        self.misses = 0
+    
+    def load(self):
+        """Load the index (an unreadable or outdated index starts empty)"""
+        if self.entries is not None:
+            return self.entries
+        self.entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data.get("entries", {})
+        except (OSError, ValueError):
+            pass
+        return self.entries
+    
+    def save(self):
+        """Atomically write the index"""
+        if self.entries is None:
+            return
+        if not os.path.exists(self.charts_dir):
+            os.makedirs(self.charts_dir)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": CACHE_VERSION, "entries": self.entries}, f, indent=2)
+        os.replace(temp_path, self.path)
+    
+    def lookup(self, key):
+        """Path of the cached image for `key`, or None; a hit marks the entry as recently used"""
+        entry = self.load().get(key)
+        if entry is not None:
+            path = os.path.join(self.charts_dir, entry["file"])
+            if os.path.exists(path):
+                entry["last_used"] = now_ns()
+                self.hits += 1
+                return path
+            # The image was deleted by hand
+            del self.entries[key]
+        self.misses += 1
+        return None
+    
+    def store(self, key, path, kind=None, computer_name=None):
+        """Record a freshly rendered image under `key`"""
+        entries = self.load()
+        filename = os.path.relpath(path, self.charts_dir)
+        # A re-render within the same second overwrites the file an older entry pointed to
+        for stale in [other for other, entry in entries.items() if entry["file"] == filename]:
+            del entries[stale]
+        now = now_ns()
+        entries[key] = {
+            "file": filename,
+            "kind": kind,
+            "computer": computer_name,
+            "bytes": os.path.getsize(path) if os.path.exists(path) else 0,
+            "created": now,
+            "last_used": now
+        }
+    
+    def evict(self, keep=()):
+        """Delete least recently used images until the index is within its limits; returns the evicted paths"""
+        entries = self.load()
+        evicted = []
+        total_bytes = sum(entry.get("bytes", 0) for entry in entries.values())
+        
+        for key in sorted(entries, key=lambda key: entries[key]["last_used"]):
+            over_entries = self.max_entries is not None and len(entries) > self.max_entries
+            over_bytes = self.max_bytes is not None and total_bytes > self.max_bytes
+            if not (over_entries or over_bytes):
+                break
+            if key in keep:
+                continue
+            entry = entries.pop(key)
+            total_bytes -= entry.get("bytes", 0)
+            path = os.path.join(self.charts_dir, entry["file"])
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            evicted.append(path)
+        return evicted
+    
+    def commit(self, keep=()):
+        """Evict down to the limits and save the index"""
+        evicted = self.evict(keep)
+        if evicted:
+            print(f"🧹 Chart cache: removed {len(evicted)} least recently used image(s)")
+        self.save()
+        return evicted
+    
+    def clear(self):
+        """Delete every cached image and empty the index"""
+        entries = self.load()
+        for entry in entries.values():
+            try:
+                os.remove(os.path.join(self.charts_dir, entry["file"]))
+            except OSError:
+                pass
+        self.entries = {}
+        self.save()
@@ -0,0 +1,607 @@
+# charts.py
+"""
+Chart rendering for the monitoring history, split into independent jobs.
+
+Each chart (the 9-panel dashboard, the CPU and memory detail charts and the
+security analysis) is a module-level render function, so the jobs can run in
+a process pool. Workers use the non-interactive Agg backend. The loaded frame
+is not pickled to every worker: it is written once to a NumPy file that each
+worker maps read-only (np.load(mmap_mode='r')), so all jobs share the same
+page-cache copy. A host's chart set then takes about as long as its slowest
+chart, and fleet mode renders every computer's charts in one pool.
+
+Output follows a render profile (RENDER_PROFILES): "preview" is a quick
+72-dpi PNG without the tight-bounding-box pass, "report" the 300-dpi PNG
+used so far, "vector" and "pdf" scalable SVG/PDF files.
+
+render_chart_images draws a chart set into memory (io.BytesIO) in worker
+processes and abandons them once a time budget is spent, for callers such as
+the sync package that attach the images elsewhere and must not wait on
+plotting.
+"""
+
+import io
+import os
+import sys
+import time
+import shutil
+import tempfile
+from downsample import lttb, minmax_envelope, bucket_reduce, axis_points
+
+DEFAULT_DPI = 300
+MAX_TICKS = 10
+
+# Output settings per use: dpi (also sets how many points are plotted), file format
+# and whether savefig crops to a tight bounding box (an extra layout pass)
+RENDER_PROFILES = {
+    "preview": {"dpi": 72, "format": "png", "tight": False},
+    "report": {"dpi": DEFAULT_DPI, "format": "png", "tight": True},
+    "vector": {"dpi": 150, "format": "svg", "tight": True},
+    "pdf": {"dpi": 150, "format": "pdf", "tight": True}
+}
+DEFAULT_PROFILE = "report"
+DEFAULT_BUDGET_SECONDS = 20
+# Part of the chart cache key; bump when a change to the render code alters the images
+RENDER_VERSION = 2
+
+# Columns the charts plot; only these are shared with the workers
+PLOT_COLUMNS = [
+    'cpu_percent', 'memory_percent', 'memory_used_gb', 'memory_total_gb', 'disk_percent',
+    'process_count', 'temperature', 'uptime_hours', 'network_sent_mb', 'network_recv_mb',
+    'security_score', 'antivirus_enabled', 'real_time_protection', 'suspicious_activity_count',
+    'vulnerability_count', 'security_software_count'
+]
+
+
+def _pyplot():
+    """pyplot and matplotlib.dates, imported on first use"""
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    return plt, mdates
+
+
+def resolve_profile(profile=None):
+    """Render settings dict from a profile name, a settings dict or None (the default profile)"""
+    if profile is None:
+        profile = DEFAULT_PROFILE
+    if isinstance(profile, str):
+        if profile not in RENDER_PROFILES:
+            raise ValueError(f"Unknown render profile: {profile} (choose from {', '.join(RENDER_PROFILES)})")
+        profile = RENDER_PROFILES[profile]
+    return dict(RENDER_PROFILES[DEFAULT_PROFILE], **profile)
+
+
+def _save_figure(fig, path, profile):
+    """Save and close a chart figure with a profile's dpi, format and bounding box"""
+    plt, _ = _pyplot()
+    fig.savefig(path, dpi=profile["dpi"], format=profile["format"],
+                bbox_inches='tight' if profile["tight"] else None)
+    plt.close(fig)
+    return path
+
+
+def _format_time_axis(ax, df):
+    """Date tick labels for a time series axis (tick count stays bounded for any time span)"""
+    plt, mdates = _pyplot()
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d %H:%M'))
+    ax.xaxis.set_major_locator(mdates.AutoDateLocator(minticks=3, maxticks=MAX_TICKS))
+    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
+
+
+def _series(df, values):
+    """Timestamps and float values of a column (or derived Series), without missing values"""
+    import numpy as np
+    
+    y = df[values] if isinstance(values, str) else values
+    y = y.to_numpy(dtype='float64', na_value=np.nan)
+    keep = ~np.isnan(y)
+    return df['timestamp'].to_numpy()[keep], y[keep]
+
+
+def _line(df, values, points):
+    """(x, y) of a line reduced to about `points` vertices with LTTB"""
+    return lttb(*_series(df, values), points)
+
+
+def _area(df, values, points):
+    """(x, upper envelope) for fill_between, so spikes survive the reduction"""
+    x, _, upper = minmax_envelope(*_series(df, values), points)
+    return x, upper
+
+
+def _bars(df, values, points):
+    """(x, per-bucket max, widths) for bar charts, as matplotlib date numbers"""
+    import numpy as np
+    plt, mdates = _pyplot()
+    
+    x, y = _series(df, values)
+    x_buckets, heights, widths = bucket_reduce(x, y, points, how='max')
+    x_numbers = mdates.date2num(x_buckets)
+    if widths is None:
+        widths = np.full(len(x_numbers), np.diff(x_numbers).min() if len(x_numbers) > 1 else 1.0)
+    else:
+        widths = widths.astype('timedelta64[ns]').astype('int64') / 86_400e9
+    return x_numbers, heights, 0.8 * widths
+
+
+def render_dashboard(df, computer_name, path, profile=DEFAULT_PROFILE):
+    """9-panel overview of every metric"""
+    plt, _ = _pyplot()
+    from matplotlib.gridspec import GridSpec
+    
+    plt.style.use('default')
+    fig = plt.figure(figsize=(20, 12))
+    profile = resolve_profile(profile)
+    points = axis_points(20, profile['dpi'], columns=3)
+    fig.suptitle(f'System Performance Dashboard - {computer_name}', fontsize=16, fontweight='bold')
+    
+    gs = GridSpec(3, 3, figure=fig, hspace=0.3, wspace=0.3)
+    
+    # CPU Usage
+    ax1 = fig.add_subplot(gs[0, 0])
+    if 'cpu_percent' in df.columns:
+        ax1.plot(*_line(df, 'cpu_percent', points), color='#ff6b6b', linewidth=2, label='CPU Usage')
+        ax1.fill_between(*_area(df, 'cpu_percent', points), alpha=0.3, color='#ff6b6b')
+        ax1.set_title('CPU Usage (%)', fontweight='bold')
+        ax1.set_ylabel('Percentage')
+        ax1.grid(True, alpha=0.3)
+        ax1.set_ylim(0, 100)
+    
+    # Memory Usage
+    ax2 = fig.add_subplot(gs[0, 1])
+    if 'memory_percent' in df.columns:
+        ax2.plot(*_line(df, 'memory_percent', points), color='#4ecdc4', linewidth=2, label='Memory Usage')
+        ax2.fill_between(*_area(df, 'memory_percent', points), alpha=0.3, color='#4ecdc4')
+        ax2.set_title('Memory Usage (%)', fontweight='bold')
+        ax2.set_ylabel('Percentage')
+        ax2.grid(True, alpha=0.3)
+        ax2.set_ylim(0, 100)
+    
+    # Disk Usage
+    ax3 = fig.add_subplot(gs[0, 2])
+    if 'disk_percent' in df.columns:
+        ax3.plot(*_line(df, 'disk_percent', points), color='#45b7d1', linewidth=2, label='Disk Usage')
+        ax3.fill_between(*_area(df, 'disk_percent', points), alpha=0.3, color='#45b7d1')
+        ax3.set_title('Disk Usage (%)', fontweight='bold')
+        ax3.set_ylabel('Percentage')
+        ax3.grid(True, alpha=0.3)
+        ax3.set_ylim(0, 100)
+    
+    # Security Score
+    ax4 = fig.add_subplot(gs[1, 0])
+    if 'security_score' in df.columns:
+        ax4.plot(*_line(df, 'security_score', points), color='#96ceb4', linewidth=2, marker='o', markersize=4)
+        ax4.fill_between(*_area(df, 'security_score', points), alpha=0.3, color='#96ceb4')
+        ax4.set_title('Security Score', fontweight='bold')
+        ax4.set_ylabel('Score (0-100)')
+        ax4.grid(True, alpha=0.3)
+        ax4.set_ylim(0, 100)
+    
+    # Process Count
+    ax5 = fig.add_subplot(gs[1, 1])
+    if 'process_count' in df.columns:
+        ax5.plot(*_line(df, 'process_count', points), color='#feca57', linewidth=2)
+        ax5.fill_between(*_area(df, 'process_count', points), alpha=0.3, color='#feca57')
+        ax5.set_title('Process Count', fontweight='bold')
+        ax5.set_ylabel('Number of Processes')
+        ax5.grid(True, alpha=0.3)
+    
+    # Network Activity
+    ax6 = fig.add_subplot(gs[1, 2])
+    if 'network_sent_mb' in df.columns and 'network_recv_mb' in df.columns:
+        ax6.plot(*_line(df, 'network_sent_mb', points), color='#ff9ff3', linewidth=2, label='Sent (MB)')
+        ax6.plot(*_line(df, 'network_recv_mb', points), color='#54a0ff', linewidth=2, label='Received (MB)')
+        ax6.set_title('Network Activity', fontweight='bold')
+        ax6.set_ylabel('MB')
+        ax6.legend()
+        ax6.grid(True, alpha=0.3)
+    
+    # Temperature (if available)
+    ax7 = fig.add_subplot(gs[2, 0])
+    if 'temperature' in df.columns and not df['temperature'].isna().all():
+        valid_temp = df.dropna(subset=['temperature'])
+        if len(valid_temp) > 0:
+            ax7.plot(*_line(valid_temp, 'temperature', points), color='#ff6348', linewidth=2)
+            ax7.fill_between(*_area(valid_temp, 'temperature', points), alpha=0.3, color='#ff6348')
+            ax7.set_title('Temperature (°C)', fontweight='bold')
+            ax7.set_ylabel('Celsius')
+            ax7.grid(True, alpha=0.3)
+        else:
+            ax7.text(0.5, 0.5, 'No Temperature Data', ha='center', va='center', transform=ax7.transAxes)
+            ax7.set_title('Temperature (°C)', fontweight='bold')
+    else:
+        ax7.text(0.5, 0.5, 'No Temperature Data', ha='center', va='center', transform=ax7.transAxes)
+        ax7.set_title('Temperature (°C)', fontweight='bold')
+    
+    # Uptime
+    ax8 = fig.add_subplot(gs[2, 1])
+    if 'uptime_hours' in df.columns:
+        uptime_days = df['uptime_hours'] / 24
+        ax8.plot(*_line(df, uptime_days, points), color='#a55eea', linewidth=2)
+        ax8.fill_between(*_area(df, uptime_days, points), alpha=0.3, color='#a55eea')
+        ax8.set_title('System Uptime (Days)', fontweight='bold')
+        ax8.set_ylabel('Days')
+        ax8.grid(True, alpha=0.3)
+    
+    # Security Issues Count
+    ax9 = fig.add_subplot(gs[2, 2])
+    if 'suspicious_activity_count' in df.columns and 'vulnerability_count' in df.columns:
+        ax9.plot(*_line(df, 'suspicious_activity_count', points), color='#ff4757', linewidth=2, marker='o', markersize=4, label='Suspicious Activity')
+        ax9.plot(*_line(df, 'vulnerability_count', points), color='#ff6348', linewidth=2, marker='s', markersize=4, label='Vulnerabilities')
+        ax9.set_title('Security Issues Count', fontweight='bold')
+        ax9.set_ylabel('Count')
+        ax9.legend()
+        ax9.grid(True, alpha=0.3)
+    
+    # Format x-axis for all subplots
+    for ax in [ax1, ax2, ax3, ax4, ax5, ax6, ax7, ax8, ax9]:
+        _format_time_axis(ax, df)
+    
+    plt.tight_layout()
+    return _save_figure(fig, path, profile)
+
+
+def render_cpu_chart(df, computer_name, path, profile=DEFAULT_PROFILE):
+    """Detailed CPU usage chart"""
+    plt, _ = _pyplot()
+    
+    fig = plt.figure(figsize=(12, 6))
+    profile = resolve_profile(profile)
+    points = axis_points(12, profile['dpi'])
+    plt.plot(*_line(df, 'cpu_percent', points), color='#ff6b6b', linewidth=2, marker='o', markersize=3)
+    plt.fill_between(*_area(df, 'cpu_percent', points), alpha=0.3, color='#ff6b6b')
+    plt.title(f'CPU Usage Over Time - {computer_name}', fontsize=14, fontweight='bold')
+    plt.xlabel('Time')
+    plt.ylabel('CPU Usage (%)')
+    plt.grid(True, alpha=0.3)
+    _format_time_axis(plt.gca(), df)
+    plt.xticks(rotation=45)
+    plt.ylim(0, 100)
+    plt.tight_layout()
+    return _save_figure(fig, path, profile)
+
+
+def render_memory_chart(df, computer_name, path, profile=DEFAULT_PROFILE):
+    """Detailed memory chart: percentage and used/total GB"""
+    plt, _ = _pyplot()
+    
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
+    profile = resolve_profile(profile)
+    points = axis_points(12, profile['dpi'])
+    
+    # Memory percentage
+    ax1.plot(*_line(df, 'memory_percent', points), color='#4ecdc4', linewidth=2, marker='o', markersize=3)
+    ax1.fill_between(*_area(df, 'memory_percent', points), alpha=0.3, color='#4ecdc4')
+    ax1.set_title(f'Memory Usage - {computer_name}', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Memory Usage (%)')
+    ax1.grid(True, alpha=0.3)
+    ax1.set_ylim(0, 100)
+    
+    # Memory GB
+    ax2.plot(*_line(df, 'memory_used_gb', points), color='#4ecdc4', linewidth=2, marker='o', markersize=3, label='Used')
+    ax2.plot(*_line(df, 'memory_total_gb', points), color='#95a5a6', linewidth=2, linestyle='--', label='Total')
+    ax2.fill_between(*_area(df, 'memory_used_gb', points), alpha=0.3, color='#4ecdc4')
+    ax2.set_xlabel('Time')
+    ax2.set_ylabel('Memory (GB)')
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+    
+    # Format x-axis
+    for ax in [ax1, ax2]:
+        _format_time_axis(ax, df)
+    
+    plt.tight_layout()
+    return _save_figure(fig, path, profile)
+
+
+def render_security_chart(df, computer_name, path, profile=DEFAULT_PROFILE):
+    """Security analysis: score, protection status, issues and security software"""
+    plt, _ = _pyplot()
+    
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+    profile = resolve_profile(profile)
+    points = axis_points(15, profile['dpi'], columns=2)
+    fig.suptitle(f'Security Analysis - {computer_name}', fontsize=16, fontweight='bold')
+    
+    # Security Score
+    if 'security_score' in df.columns:
+        axes[0,0].plot(*_line(df, 'security_score', points), color='#27ae60', linewidth=3, marker='o', markersize=4)
+        axes[0,0].fill_between(*_area(df, 'security_score', points), alpha=0.3, color='#27ae60')
+        axes[0,0].set_title('Security Score Over Time', fontweight='bold')
+        axes[0,0].set_ylabel('Score (0-100)')
+        axes[0,0].grid(True, alpha=0.3)
+        axes[0,0].set_ylim(0, 100)
+        
+        # Add colored zones
+        axes[0,0].axhspan(0, 60, alpha=0.1, color='red', label='Poor')
+        axes[0,0].axhspan(60, 75, alpha=0.1, color='orange', label='Fair')
+        axes[0,0].axhspan(75, 90, alpha=0.1, color='yellow', label='Good')
+        axes[0,0].axhspan(90, 100, alpha=0.1, color='green', label='Excellent')
+    
+    # Protection Status
+    if 'antivirus_enabled' in df.columns and 'real_time_protection' in df.columns:
+        # Convert boolean to numeric for plotting
+        av_numeric = df['antivirus_enabled'].astype(int)
+        rt_numeric = df['real_time_protection'].astype(int)
+        
+        axes[0,1].plot(*_line(df, av_numeric, points), color='#3498db', linewidth=2, marker='o', markersize=4, label='Antivirus')
+        axes[0,1].plot(*_line(df, rt_numeric, points), color='#e74c3c', linewidth=2, marker='s', markersize=4, label='Real-time Protection')
+        axes[0,1].set_title('Protection Status', fontweight='bold')
+        axes[0,1].set_ylabel('Status (0=Off, 1=On)')
+        axes[0,1].set_ylim(-0.1, 1.1)
+        axes[0,1].legend()
+        axes[0,1].grid(True, alpha=0.3)
+    
+    # Threat Activity
+    if 'suspicious_activity_count' in df.columns and 'vulnerability_count' in df.columns:
+        # One bar per time bucket (the bucket's highest count), not one per sample
+        bar_x, suspicious, widths = _bars(df, 'suspicious_activity_count', points // 4)
+        _, vulnerabilities, _ = _bars(df, 'vulnerability_count', points // 4)
+        axes[1,0].bar(bar_x, suspicious, alpha=0.7, color='#e67e22', width=widths, label='Suspicious Activity')
+        axes[1,0].bar(bar_x, vulnerabilities, alpha=0.7, color='#c0392b', width=widths,
+                     bottom=suspicious, label='Vulnerabilities')
+        axes[1,0].xaxis_date()
+        axes[1,0].set_title('Security Issues Detected', fontweight='bold')
+        axes[1,0].set_ylabel('Count')
+        axes[1,0].legend()
+        axes[1,0].grid(True, alpha=0.3)
+    
+    # Security Software Count
+    if 'security_software_count' in df.columns:
+        axes[1,1].plot(*_line(df, 'security_software_count', points), color='#8e44ad', linewidth=2, marker='o', markersize=4)
+        axes[1,1].fill_between(*_area(df, 'security_software_count', points), alpha=0.3, color='#8e44ad')
+        axes[1,1].set_title('Security Software Running', fontweight='bold')
+        axes[1,1].set_ylabel('Count')
+        axes[1,1].grid(True, alpha=0.3)
+    
+    # Format x-axis for all subplots
+    for ax in axes.flat:
+        _format_time_axis(ax, df)
+    
+    plt.tight_layout()
+    return _save_figure(fig, path, profile)
+
+
+# Chart kind -> (render function, filename prefix, columns it needs, message emoji and label)
+CHART_KINDS = {
+    "dashboard": (render_dashboard, "dashboard", [], "📊 Dashboard"),
+    "cpu": (render_cpu_chart, "cpu_usage", ['cpu_percent'], "📈 CPU chart"),
+    "memory": (render_memory_chart, "memory_usage", ['memory_percent', 'memory_used_gb', 'memory_total_gb'], "🧠 Memory chart"),
+    "security": (render_security_chart, "security_analysis", None, "🛡️  Security chart")
+}
+
+SECURITY_COLUMNS = ['security_score', 'antivirus_enabled', 'real_time_protection',
+                    'suspicious_activity_count', 'vulnerability_count']
+
+
+def chart_kinds_for(df, save_individual=True):
+    """Charts that can be drawn from this frame, in the order they were always created"""
+    kinds = ["dashboard"]
+    if save_individual:
+        kinds.extend(kind for kind in ("cpu", "memory") if all(col in df.columns for col in CHART_KINDS[kind][2]))
+    if any(col in df.columns for col in SECURITY_COLUMNS):
+        kinds.append("security")
+    else:
+        print("⚠️  No security data found for security chart")
+    return kinds
+
+
+def chart_filename(kind, computer_name, timestamp, extension="png"):
+    """File name of one chart of a chart set"""
+    return f"{CHART_KINDS[kind][1]}_{computer_name}_{timestamp}.{extension}"
+
+
+def share_frame(df, directory):
+    """Write the plotted columns to a NumPy file that workers map instead of unpickling"""
+    import numpy as np
+    
+    columns = [col for col in PLOT_COLUMNS if col in df.columns]
+    fields = [('timestamp', '<i8')] + [(col, '<f8') for col in columns]
+    records = np.empty(len(df), dtype=fields)
+    # Naive local datetimes are stored as their int64 nanoseconds and restored unchanged
+    records['timestamp'] = df['timestamp'].to_numpy(dtype='datetime64[ns]').view('int64')
+    for col in columns:
+        records[col] = df[col].to_numpy(dtype='float64', na_value=np.nan)
+    
+    path = os.path.join(directory, f"frame_{len(os.listdir(directory))}.npy")
+    np.save(path, records)
+    return path
+
+
+def load_shared_frame(path):
+    """Map a shared frame read-only and rebuild the plotting DataFrame over it"""
+    import numpy as np
+    import pandas as pd
+    
+    records = np.load(path, mmap_mode='r')
+    data = {'timestamp': pd.to_datetime(records['timestamp'].astype('datetime64[ns]'))}
+    for name in records.dtype.names[1:]:
+        data[name] = records[name]
+    return pd.DataFrame(data)
+
+
+def _init_worker():
+    """Pool initializer: render off-screen with Agg"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def render_job(kind, frame, computer_name, path, profile=DEFAULT_PROFILE):
+    """Render one chart from a DataFrame or a shared frame path; returns (kind, path, seconds)
+    
+    Module-level so it can run in a worker process.
+    """
+    started = time.perf_counter()
+    if isinstance(frame, str):
+        frame = load_shared_frame(frame)
+    CHART_KINDS[kind][0](frame, computer_name, path, profile)
+    return kind, path, time.perf_counter() - started
+
+
+def render_chart_sets(chart_sets, charts_dir, workers=None, profile=DEFAULT_PROFILE, cache=None):
+    """Render several computers' chart sets concurrently
+    
+    `chart_sets` is a list of (computer_name, df, save_individual, timestamp).
+    Returns {computer_name: [chart paths]}. With one worker (or one job) the
+    charts are drawn in this process. With a ChartCache, charts whose data
+    and settings are unchanged are not drawn again; their existing image
+    path is returned instead.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from chart_cache import chart_key
+    
+    results = {computer_name: [] for computer_name, _, _, _ in chart_sets}
+    profile = resolve_profile(profile)
+    settings = dict(profile, version=RENDER_VERSION)
+    keys = {}  # rendered path -> cache key
+    reused = set()  # cache keys of unchanged charts
+    
+    jobs = []
+    for computer_name, df, save_individual, timestamp in chart_sets:
+        for kind in chart_kinds_for(df, save_individual):
+            if cache is not None:
+                key = chart_key(kind, computer_name, df, settings)
+                cached_path = cache.lookup(key)
+                if cached_path is not None:
+                    reused.add(key)
+                    results[computer_name].append(cached_path)
+                    print(f"♻️  {CHART_KINDS[kind][3]} unchanged, reusing: {cached_path}")
+                    continue
+            path = os.path.join(charts_dir, chart_filename(kind, computer_name, timestamp, profile["format"]))
+            if cache is not None:
+                keys[path] = key
+            jobs.append((kind, computer_name, df, path))
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+    
+    started = time.perf_counter()
+    
+    def report(kind, computer_name, path, seconds):
+        results[computer_name].append(path)
+        if path in keys:
+            cache.store(keys[path], path, kind, computer_name)
+        print(f"{CHART_KINDS[kind][3]} saved: {path} ({seconds:.1f}s)")
+    
+    if workers <= 1:
+        for kind, computer_name, df, path in jobs:
+            _, path, seconds = render_job(kind, df, computer_name, path, profile)
+            report(kind, computer_name, path, seconds)
+    else:
+        share_dir = tempfile.mkdtemp(prefix="charts_")
+        try:
+            shared = {}
+            for computer_name, df, _, _ in chart_sets:
+                shared[computer_name] = share_frame(df, share_dir)
+            
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                futures = {
+                    pool.submit(render_job, kind, shared[computer_name], computer_name, path, profile): (kind, computer_name)
+                    for kind, computer_name, _, path in jobs
+                }
+                for future in as_completed(futures):
+                    kind, computer_name = futures[future]
+                    try:
+                        _, path, seconds = future.result()
+                        report(kind, computer_name, path, seconds)
+                    except Exception as e:
+                        print(f"❌ Error rendering {kind} chart for {computer_name}: {e}")
+        finally:
+            shutil.rmtree(share_dir, ignore_errors=True)
+    
+    if cache is not None:
+        # Images returned by this call are never evicted by it
+        cache.commit(keep=reused | set(keys.values()))
+    
+    rendered = sum(len(paths) for paths in results.values()) - len(reused)
+    print(f"⏱️  Rendered {rendered} charts in {time.perf_counter() - started:.1f}s with {max(workers, 1)} worker(s)"
+          + (f", reused {len(reused)} unchanged" if reused else ""))
+    return results
+
+
+def render_chart_set(df, computer_name, charts_dir, timestamp, save_individual=True, workers=None, profile=DEFAULT_PROFILE, cache=None):
+    """Render one computer's dashboard, detail and security charts; returns the chart paths"""
+    return render_chart_sets([(computer_name, df, save_individual, timestamp)], charts_dir, workers, profile, cache)[computer_name]
+
+
+def frame_from_rows(rows):
+    """Plotting frame (local datetimes in time order) of nested status records or flat rows"""
+    import pandas as pd
+    from data_schema import flatten_status
+    from timestamps import epoch_ns_series, to_local_datetime
+    
+    df = pd.DataFrame([flatten_status(row) for row in rows])
+    if not len(df):
+        return df
+    df['timestamp'] = epoch_ns_series(df['timestamp'])
+    df = df.dropna(subset=['timestamp']).sort_values('timestamp').reset_index(drop=True)
+    df['timestamp'] = to_local_datetime(df['timestamp'])
+    return df
+
+
+def render_chart_bytes(kind, df, computer_name, profile="preview"):
+    """Render one chart into memory; returns the encoded image bytes"""
+    buffer = io.BytesIO()
+    CHART_KINDS[kind][0](df, computer_name, buffer, profile)
+    return buffer.getvalue()
+
+
+def render_bytes_job(kind, frame_path, computer_name, profile="preview"):
+    """Render one chart of a shared frame into memory; returns (kind, bytes)
+    
+    Module-level so it can run in a worker process.
+    """
+    return kind, render_chart_bytes(kind, load_shared_frame(frame_path), computer_name, profile)
+
+
+def render_chart_images(df, computer_name, timestamp, save_individual=True, profile="preview",
+                        budget_seconds=DEFAULT_BUDGET_SECONDS, workers=None):
+    """Render a chart set into memory within a time budget; returns [(filename, bytes)]
+    
+    Charts are drawn in worker processes (Agg is selected there, the
+    caller's matplotlib backend is left alone) and the caller waits at most
+    `budget_seconds` in total. When the budget runs out the workers are
+    terminated: charts finished by then are returned, the rest are skipped,
+    so one slow chart cannot hold up the caller.
+    """
+    import multiprocessing
+    
+    profile = resolve_profile(profile)
+    kinds = chart_kinds_for(df, save_individual)
+    if not kinds or (budget_seconds is not None and budget_seconds <= 0):
+        return []
+    
+    started = time.perf_counter()
+    share_dir = tempfile.mkdtemp(prefix="charts_")
+    pool = None
+    done = {}
+    try:
+        frame_path = share_frame(df, share_dir)
+        workers = min(workers or os.cpu_count() or 1, len(kinds))
+        pool = multiprocessing.Pool(workers, initializer=_init_worker)
+        jobs = [(kind, pool.apply_async(render_bytes_job, (kind, frame_path, computer_name, profile))) for kind in kinds]
+        
+        for kind, job in jobs:
+            remaining = None if budget_seconds is None else max(budget_seconds - (time.perf_counter() - started), 0)
+            try:
+                done[kind] = job.get(timeout=remaining)[1]
+            except multiprocessing.TimeoutError:
+                break
+            except Exception as e:
+                print(f"❌ Error rendering {kind} chart for {computer_name}: {e}")
+        
+        # Charts that finished while an earlier one was still drawing
+        for kind, job in jobs:
+            if kind not in done and job.ready() and job.successful():
+                done[kind] = job.get()[1]
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        shutil.rmtree(share_dir, ignore_errors=True)
+    
+    skipped = [kind for kind in kinds if kind not in done]
+    if skipped and budget_seconds is not None and time.perf_counter() - started >= budget_seconds:
+        print(f"⏱️  Chart budget of {budget_seconds:.1f}s spent, skipped: {', '.join(skipped)}")
+    return [(chart_filename(kind, computer_name, timestamp, profile["format"]), done[kind]) for kind in kinds if kind in done]
@@ -7,20 +7,32 @@ import csv
 import os
 import socket
 import subprocess
-import hashlib
-import winreg
+import textwrap
+from collections import deque
 from pathlib import Path
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.gridspec import GridSpec
-import pandas as pd
-import numpy as np
 from typing import List, Dict, Any
+from history_store import SQLiteHistoryStore, DEFAULT_DB_NAME
+from gorilla_store import GorillaSegmentWriter, GorillaSegmentReader, segment_filename
+from zone_maps import frame_mask
+from memmap_store import MemmapHistoryWriter, MemmapHistoryReader, memmap_filename
+from snapshot_store import SnapshotWriter, snapshot_filename
+from data_schema import DEFAULTS, write_csv, flatten_status
+from timestamps import now_ns, to_epoch_ns, to_iso, epoch_ns_series, to_local_datetime
+from history_loader import IncrementalCSVLoader, concat_unique
+from file_catalog import HistoryFileCatalog, history_filename, json_history_filename, GLOBAL_HISTORY_FILE
+from data_manifest import DataManifest
+from retention import load_rollups_as_samples
+from charts import render_chart_set, render_chart_sets, RENDER_PROFILES, DEFAULT_PROFILE
+from chart_cache import ChartCache
+from backfill import Backfill
+
+# Samples kept in memory for display, analysis and dashboards (an hour at one per second)
+DATA_LOG_LIMIT = 3600
 
 class SecurityEnhancedSystemMonitor:
     """System monitor with built-in security scanning capabilities and data visualization"""
     
-    def __init__(self):
+    def __init__(self, data_dir="data", charts_dir="charts"):
         print("🛡️ Security-Enhanced System Monitor Starting...")
         
         # Get computer identification
@@ -28,11 +40,52 @@ class SecurityEnhancedSystemMonitor:
         print(f"🏷️  Computer ID: {self.computer_name}")
         
         # Set up data directory (relative to script location)
-        self.data_dir = "data"
-        self.charts_dir = "charts"
+        self.data_dir = data_dir
+        self.charts_dir = charts_dir
         self.ensure_data_directory()
         
-        self.data_log = []
+        # Recent samples only; every sample is in the history files
+        self.data_log = deque(maxlen=DATA_LOG_LIMIT)
+        self.session_samples = 0
+        self.json_history_started = False
+        # Callables given every processed sample (e.g. the live dashboard), see add_sample_listener
+        self.sample_listeners = []
+        
+        # Exact file-to-computer mapping and parsed history cache for charts
+        self.file_catalog = HistoryFileCatalog(self.data_dir)
+        self.history_loader = IncrementalCSVLoader()
+        self.load_workers = None  # parallel parse workers for uncached files (None = CPU count)
+        self.chart_workers = None  # parallel chart render workers (None = CPU count)
+        self.render_profile = DEFAULT_PROFILE  # dpi / format / bounding box, see charts.RENDER_PROFILES
+        # Unchanged charts are reused instead of drawn again (None disables the cache)
+        self.chart_cache = ChartCache(self.charts_dir)
+        
+        # Manifest of data files (rebuilt once here if missing, then kept current on write)
+        self.manifest = DataManifest(self.data_dir)
+        self.manifest.ensure()
+        
+        # Backfill checkpoints of the enabled stores: which history files each store covers
+        self.store_coverage = {}
+        
+        # Optional indexed history store (re-opened automatically once enabled)
+        self.history_store = None
+        if os.path.exists(os.path.join(self.data_dir, DEFAULT_DB_NAME)):
+            self.enable_sqlite_store()
+        
+        # Optional compressed segment store (re-opened automatically once enabled)
+        self.segment_writer = None
+        if os.path.exists(os.path.join(self.data_dir, segment_filename(self.computer_name))):
+            self.enable_segment_store()
+        
+        # Optional memory-mapped history (re-opened automatically once enabled)
+        self.memmap_writer = None
+        if os.path.exists(os.path.join(self.data_dir, memmap_filename(self.computer_name))):
+            self.enable_memmap_store()
+        
+        # Optional delta-encoded snapshots of the full nested records (re-opened automatically once enabled)
+        self.snapshot_writer = None
+        if os.path.exists(os.path.join(self.data_dir, snapshot_filename(self.computer_name))):
+            self.enable_snapshot_store()
         
         # Security scan cache
         self.last_security_scan = None
@@ -62,6 +115,87 @@ class SecurityEnhancedSystemMonitor:
             self.data_dir = "."
             self.charts_dir = "."
     
+    def backfill_store(self, store_format):
+        """Copy history collected before a store was enabled into it and keep its coverage record
+        
+        Runs before the store's writer is opened. Files already converted are
+        skipped, so re-opening an enabled store only checks file sizes.
+        """
+        computers = None if store_format == "sqlite" else [self.computer_name]
+        coverage = Backfill(self.data_dir, store_format, self.load_workers, computers)
+        try:
+            stats = coverage.run(verbose=False)
+            if stats["failed"]:
+                print(f"⚠️  {stats['failed']} history files could not be backfilled into the {store_format} store")
+        except Exception as e:
+            print(f"⚠️  Error backfilling the {store_format} store: {e}")
+        self.store_coverage[store_format] = coverage
+    
+    def enable_sqlite_store(self, db_path=None):
+        """Enable the SQLite history store for batched writes and indexed reads"""
+        if db_path is None:
+            db_path = os.path.join(self.data_dir, DEFAULT_DB_NAME)
+        if db_path == os.path.join(self.data_dir, DEFAULT_DB_NAME):
+            self.backfill_store("sqlite")
+        
+        try:
+            self.history_store = SQLiteHistoryStore(db_path)
+            print(f"🗄️  SQLite history store: {db_path}")
+        except Exception as e:
+            print(f"❌ Error opening SQLite history store: {e}")
+            self.history_store = None
+            self.store_coverage.pop("sqlite", None)
+        
+        return self.history_store is not None
+    
+    def enable_segment_store(self, segment_path=None):
+        """Enable the compressed segment store for this computer's samples"""
+        if segment_path is None:
+            segment_path = os.path.join(self.data_dir, segment_filename(self.computer_name))
+        if segment_path == os.path.join(self.data_dir, segment_filename(self.computer_name)):
+            self.backfill_store("segments")
+        
+        try:
+            self.segment_writer = GorillaSegmentWriter(segment_path)
+            print(f"🗜️  Compressed segment store: {segment_path}")
+        except Exception as e:
+            print(f"❌ Error opening segment store: {e}")
+            self.segment_writer = None
+            self.store_coverage.pop("segments", None)
+        
+        return self.segment_writer is not None
+    
+    def enable_memmap_store(self, history_path=None):
+        """Enable the memory-mapped binary history for this computer's samples"""
+        if history_path is None:
+            history_path = os.path.join(self.data_dir, memmap_filename(self.computer_name))
+        if history_path == os.path.join(self.data_dir, memmap_filename(self.computer_name)):
+            self.backfill_store("memmap")
+        
+        try:
+            self.memmap_writer = MemmapHistoryWriter(history_path)
+            print(f"🧠 Memory-mapped history: {history_path}")
+        except Exception as e:
+            print(f"❌ Error opening memory-mapped history: {e}")
+            self.memmap_writer = None
+            self.store_coverage.pop("memmap", None)
+        
+        return self.memmap_writer is not None
+    
+    def enable_snapshot_store(self, snapshot_path=None):
+        """Enable delta-encoded snapshots of the full nested status records"""
+        if snapshot_path is None:
+            snapshot_path = os.path.join(self.data_dir, snapshot_filename(self.computer_name))
+        
+        try:
+            self.snapshot_writer = SnapshotWriter(snapshot_path)
+            print(f"🧬 Nested record snapshots: {snapshot_path}")
+        except Exception as e:
+            print(f"❌ Error opening snapshot store: {e}")
+            self.snapshot_writer = None
+        
+        return self.snapshot_writer is not None
+    
     def check_windows_defender_status(self):
         """Check Windows Defender status and last scan info"""
         security_info = {
@@ -365,7 +499,7 @@ class SecurityEnhancedSystemMonitor:
     
     def get_current_status(self):
         """Get current system status with security information"""
-        timestamp = datetime.datetime.now()
+        timestamp = now_ns()
         
         # Get basic system metrics
         cpu_percent = psutil.cpu_percent(interval=1)
@@ -405,7 +539,7 @@ class SecurityEnhancedSystemMonitor:
         
         # Compile all data
         system_data = {
-            "timestamp": timestamp.isoformat(),
+            "timestamp": timestamp,
             "computer_info": {
                 "computer_name": socket.gethostname(),
                 "computer_id": self.computer_name,
@@ -455,7 +589,7 @@ class SecurityEnhancedSystemMonitor:
     
     def display_current_status(self, data):
         """Display current status with security information"""
-        print(f"\n🕐 STATUS AT: {data['timestamp']} - {data['computer_info']['computer_id']}")
+        print(f"\n🕐 STATUS AT: {to_iso(data['timestamp'])} - {data['computer_info']['computer_id']}")
         print("=" * 80)
         
         # System metrics
@@ -510,40 +644,122 @@ class SecurityEnhancedSystemMonitor:
         
         print("=" * 80)
     
-    def load_data_from_files(self, computer_name=None):
-        """Load historical data from CSV files for visualization"""
+    def read_history_store(self, computer_name, start=None, end=None, where=None):
+        """Samples of the first enabled store holding data for a computer; returns (df or None, store format)
+        
+        Timestamps stay epoch nanoseconds. Compressed segments decode only the
+        blocks that overlap the window and can match `where`; the memory-mapped
+        history touches only the pages of the window.
+        """
+        # Prefer the indexed store when it has data for this computer
+        if self.history_store is not None:
+            try:
+                self.history_store.flush()
+                df = self.history_store.range(computer_name, start, end)
+                if len(df) > 0:
+                    if where is not None:
+                        df = df[frame_mask(df, where)].reset_index(drop=True)
+                    print(f"📊 Loaded {len(df)} records from SQLite history store")
+                    return df, "sqlite"
+            except Exception as e:
+                print(f"⚠️  Error reading SQLite history store: {e}")
+        
+        # Then the compressed segments, decoding only blocks that overlap the window
+        segment_path = os.path.join(self.data_dir, segment_filename(computer_name))
+        if os.path.exists(segment_path):
+            try:
+                if self.segment_writer is not None:
+                    self.segment_writer.flush()
+                reader = GorillaSegmentReader(segment_path)
+                if reader.row_count() > 0:
+                    df = reader.read_frame(start, end, where=where)
+                    print(f"📊 Loaded {len(df)} records from {os.path.basename(segment_path)} "
+                          f"({reader.last_scan['blocks_read']}/{reader.last_scan['blocks_total']} blocks decoded)")
+                    return df, "segments"
+            except Exception as e:
+                print(f"⚠️  Error reading segment store: {e}")
+        
+        # Then the memory-mapped history, touching only the pages of the window
+        memmap_path = os.path.join(self.data_dir, memmap_filename(computer_name))
+        if os.path.exists(memmap_path):
+            try:
+                if self.memmap_writer is not None:
+                    self.memmap_writer.flush()
+                reader = MemmapHistoryReader(memmap_path)
+                if len(reader) > 0:
+                    df = reader.read_frame(start, end, categories=False)
+                    if where is not None:
+                        df = df[frame_mask(df, where)].reset_index(drop=True)
+                    print(f"📊 Loaded {len(df)} records from {os.path.basename(memmap_path)}")
+                    return df, "memmap"
+            except Exception as e:
+                print(f"⚠️  Error reading memory-mapped history: {e}")
+        
+        return None, None
+    
+    def load_data_from_files(self, computer_name=None, start=None, end=None, where=None):
+        """Load historical data from CSV files for visualization
+        
+        `where` takes predicates such as "disk_percent>90" (see zone_maps.py);
+        on compressed segments only blocks whose zone maps can match are decoded.
+        """
         if computer_name is None:
             computer_name = self.computer_name
         
-        # Try to find CSV files for this computer
-        csv_files = []
-        for file in os.listdir(self.data_dir):
-            if file.endswith('.csv') and computer_name in file:
-                csv_files.append(os.path.join(self.data_dir, file))
-        
-        if not csv_files:
+        # Stored history first, then every history file the store does not cover
+        store_df, store_format = self.read_history_store(computer_name, start, end, where)
+        
+        # History files that belong to exactly this computer ID and overlap the window
+        csv_files = self.manifest.files_for(computer_name, start, end, file_format="csv")
+        if not csv_files and start is None and end is None:
+            csv_files = self.file_catalog.files_for(computer_name)
+        
+        if store_df is not None:
+            # The enabled store's in-memory record is current; segment and memmap files
+            # found on disk fall back to the saved checkpoint (a SQLite store at a custom path covers nothing)
+            coverage = self.store_coverage.get(store_format)
+            if coverage is None and store_format != "sqlite":
+                coverage = Backfill(self.data_dir, store_format)
+            csv_files = [path for path in csv_files if coverage is None or not coverage.is_covered(path)]
+            if not csv_files:
+                store_df['timestamp'] = to_local_datetime(store_df['timestamp'])
+                print(f"✅ Loaded total of {len(store_df)} records for visualization")
+                return store_df
+        
+        # Downsampled history that has aged out of the raw files (the stores keep raw samples)
+        rollup_samples = load_rollups_as_samples(self.data_dir, computer_name) if store_df is None else []
+        
+        if not csv_files and not rollup_samples:
             print(f"❌ No CSV files found for computer: {computer_name}")
             return None
         
-        # Load and combine data from all CSV files
-        all_data = []
-        for csv_file in csv_files:
-            try:
-                df = pd.read_csv(csv_file)
-                all_data.append(df)
-                print(f"📊 Loaded {len(df)} records from {os.path.basename(csv_file)}")
-            except Exception as e:
-                print(f"⚠️  Error loading {csv_file}: {e}")
+        # Load and combine data from all CSV files (cached, only new rows are parsed;
+        # files not seen before are parsed in parallel)
+        all_data = [] if store_df is None else [store_df]
+        if rollup_samples:
+            import pandas as pd
+            all_data.append(pd.DataFrame(rollup_samples))
+            print(f"📊 Loaded {len(rollup_samples)} rollup records for long-range history")
+        loaded = self.history_loader.load_many(csv_files, workers=self.load_workers)
+        for csv_file, df in loaded.items():
+            if isinstance(df, Exception):
+                print(f"⚠️  Error loading {csv_file}: {df}")
+                continue
+            if 'computer_id' not in df.columns:
+                df = df.assign(computer_id=computer_name)
+            all_data.append(df)
+            print(f"📊 Loaded {len(df)} records from {os.path.basename(csv_file)}")
         
         if not all_data:
             return None
         
-        # Combine all data
-        combined_df = pd.concat(all_data, ignore_index=True)
+        # Combine all data, skipping rows already loaded from another file
+        combined_df = concat_unique(all_data)
         
-        # Convert timestamp to datetime
+        # Timestamps are epoch nanoseconds (legacy ISO rows are converted by the loader)
         try:
-            combined_df['timestamp'] = pd.to_datetime(combined_df['timestamp'])
+            combined_df['timestamp'] = epoch_ns_series(combined_df['timestamp'])
+            combined_df = combined_df.dropna(subset=['timestamp'])
         except Exception as e:
             print(f"⚠️  Error parsing timestamps: {e}")
             return None
@@ -551,15 +767,24 @@ class SecurityEnhancedSystemMonitor:
         # Sort by timestamp
         combined_df = combined_df.sort_values('timestamp')
         
+        # Apply the requested time window
+        if start is not None:
+            combined_df = combined_df[combined_df['timestamp'] >= to_epoch_ns(start)]
+        if end is not None:
+            combined_df = combined_df[combined_df['timestamp'] <= to_epoch_ns(end)]
+        if where is not None:
+            combined_df = combined_df[frame_mask(combined_df, where)]
+        
+        # Datetimes are only needed for plotting
+        combined_df['timestamp'] = to_local_datetime(combined_df['timestamp'])
+        
         print(f"✅ Loaded total of {len(combined_df)} records for visualization")
         return combined_df
     
-    def create_comprehensive_charts(self, computer_name=None, save_individual=True):
+    def create_comprehensive_charts(self, computer_name=None, save_individual=True, start=None, end=None, where=None):
         """Create comprehensive charts showing system changes over time"""
         try:
-            import matplotlib.pyplot as plt
-            import matplotlib.dates as mdates
-            from matplotlib.gridspec import GridSpec
+            import matplotlib
         except ImportError:
             print("❌ Matplotlib not installed. Please install it with: pip install matplotlib pandas")
             return
@@ -568,275 +793,64 @@ class SecurityEnhancedSystemMonitor:
             computer_name = self.computer_name
         
         # Load data
-        df = self.load_data_from_files(computer_name)
+        df = self.load_data_from_files(computer_name, start, end, where)
         if df is None or len(df) < 2:
             print("❌ Insufficient data for visualization. Need at least 2 data points.")
             return
         
         print(f"📈 Creating comprehensive charts for {computer_name}...")
         
-        # Set up the plot style
-        plt.style.use('default')
-        
         # Create timestamp for filenames
         timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # 1. Create Dashboard Overview (all metrics in one chart)
-        fig = plt.figure(figsize=(20, 12))
-        fig.suptitle(f'System Performance Dashboard - {computer_name}', fontsize=16, fontweight='bold')
-        
-        gs = GridSpec(3, 3, figure=fig, hspace=0.3, wspace=0.3)
-        
-        # CPU Usage
-        ax1 = fig.add_subplot(gs[0, 0])
-        if 'cpu_percent' in df.columns:
-            ax1.plot(df['timestamp'], df['cpu_percent'], color='#ff6b6b', linewidth=2, label='CPU Usage')
-            ax1.fill_between(df['timestamp'], df['cpu_percent'], alpha=0.3, color='#ff6b6b')
-            ax1.set_title('CPU Usage (%)', fontweight='bold')
-            ax1.set_ylabel('Percentage')
-            ax1.grid(True, alpha=0.3)
-            ax1.set_ylim(0, 100)
-        
-        # Memory Usage
-        ax2 = fig.add_subplot(gs[0, 1])
-        if 'memory_percent' in df.columns:
-            ax2.plot(df['timestamp'], df['memory_percent'], color='#4ecdc4', linewidth=2, label='Memory Usage')
-            ax2.fill_between(df['timestamp'], df['memory_percent'], alpha=0.3, color='#4ecdc4')
-            ax2.set_title('Memory Usage (%)', fontweight='bold')
-            ax2.set_ylabel('Percentage')
-            ax2.grid(True, alpha=0.3)
-            ax2.set_ylim(0, 100)
-        
-        # Disk Usage
-        ax3 = fig.add_subplot(gs[0, 2])
-        if 'disk_percent' in df.columns:
-            ax3.plot(df['timestamp'], df['disk_percent'], color='#45b7d1', linewidth=2, label='Disk Usage')
-            ax3.fill_between(df['timestamp'], df['disk_percent'], alpha=0.3, color='#45b7d1')
-            ax3.set_title('Disk Usage (%)', fontweight='bold')
-            ax3.set_ylabel('Percentage')
-            ax3.grid(True, alpha=0.3)
-            ax3.set_ylim(0, 100)
-        
-        # Security Score
-        ax4 = fig.add_subplot(gs[1, 0])
-        if 'security_score' in df.columns:
-            ax4.plot(df['timestamp'], df['security_score'], color='#96ceb4', linewidth=2, marker='o', markersize=4)
-            ax4.fill_between(df['timestamp'], df['security_score'], alpha=0.3, color='#96ceb4')
-            ax4.set_title('Security Score', fontweight='bold')
-            ax4.set_ylabel('Score (0-100)')
-            ax4.grid(True, alpha=0.3)
-            ax4.set_ylim(0, 100)
-        
-        # Process Count
-        ax5 = fig.add_subplot(gs[1, 1])
-        if 'process_count' in df.columns:
-            ax5.plot(df['timestamp'], df['process_count'], color='#feca57', linewidth=2)
-            ax5.fill_between(df['timestamp'], df['process_count'], alpha=0.3, color='#feca57')
-            ax5.set_title('Process Count', fontweight='bold')
-            ax5.set_ylabel('Number of Processes')
-            ax5.grid(True, alpha=0.3)
-        
-        # Network Activity
-        ax6 = fig.add_subplot(gs[1, 2])
-        if 'network_sent_mb' in df.columns and 'network_recv_mb' in df.columns:
-            ax6.plot(df['timestamp'], df['network_sent_mb'], color='#ff9ff3', linewidth=2, label='Sent (MB)')
-            ax6.plot(df['timestamp'], df['network_recv_mb'], color='#54a0ff', linewidth=2, label='Received (MB)')
-            ax6.set_title('Network Activity', fontweight='bold')
-            ax6.set_ylabel('MB')
-            ax6.legend()
-            ax6.grid(True, alpha=0.3)
-        
-        # Temperature (if available)
-        ax7 = fig.add_subplot(gs[2, 0])
-        if 'temperature' in df.columns and not df['temperature'].isna().all():
-            valid_temp = df.dropna(subset=['temperature'])
-            if len(valid_temp) > 0:
-                ax7.plot(valid_temp['timestamp'], valid_temp['temperature'], color='#ff6348', linewidth=2)
-                ax7.fill_between(valid_temp['timestamp'], valid_temp['temperature'], alpha=0.3, color='#ff6348')
-                ax7.set_title('Temperature (°C)', fontweight='bold')
-                ax7.set_ylabel('Celsius')
-                ax7.grid(True, alpha=0.3)
-            else:
-                ax7.text(0.5, 0.5, 'No Temperature Data', ha='center', va='center', transform=ax7.transAxes)
-                ax7.set_title('Temperature (°C)', fontweight='bold')
-        else:
-            ax7.text(0.5, 0.5, 'No Temperature Data', ha='center', va='center', transform=ax7.transAxes)
-            ax7.set_title('Temperature (°C)', fontweight='bold')
-        
-        # Uptime
-        ax8 = fig.add_subplot(gs[2, 1])
-        if 'uptime_hours' in df.columns:
-            uptime_days = df['uptime_hours'] / 24
-            ax8.plot(df['timestamp'], uptime_days, color='#a55eea', linewidth=2)
-            ax8.fill_between(df['timestamp'], uptime_days, alpha=0.3, color='#a55eea')
-            ax8.set_title('System Uptime (Days)', fontweight='bold')
-            ax8.set_ylabel('Days')
-            ax8.grid(True, alpha=0.3)
-        
-        # Security Issues Count
-        ax9 = fig.add_subplot(gs[2, 2])
-        if 'suspicious_activity_count' in df.columns and 'vulnerability_count' in df.columns:
-            ax9.plot(df['timestamp'], df['suspicious_activity_count'], color='#ff4757', linewidth=2, marker='o', markersize=4, label='Suspicious Activity')
-            ax9.plot(df['timestamp'], df['vulnerability_count'], color='#ff6348', linewidth=2, marker='s', markersize=4, label='Vulnerabilities')
-            ax9.set_title('Security Issues Count', fontweight='bold')
-            ax9.set_ylabel('Count')
-            ax9.legend()
-            ax9.grid(True, alpha=0.3)
-        
-        # Format x-axis for all subplots
-        for ax in [ax1, ax2, ax3, ax4, ax5, ax6, ax7, ax8, ax9]:
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d %H:%M'))
-            ax.xaxis.set_major_locator(mdates.HourLocator(interval=max(1, len(df)//10)))
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        
-        # Save dashboard
-        dashboard_file = os.path.join(self.charts_dir, f"dashboard_{computer_name}_{timestamp}.png")
-        plt.tight_layout()
-        plt.savefig(dashboard_file, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"📊 Dashboard saved: {dashboard_file}")
-        
-        # 2. Create individual detailed charts if requested
-        if save_individual:
-            self._create_individual_charts(df, computer_name, timestamp)
-        
-        # 3. Create Security-focused chart
-        self._create_security_chart(df, computer_name, timestamp)
+        # Dashboard, detail and security charts are independent jobs rendered in parallel
+        render_chart_set(df, computer_name, self.charts_dir, timestamp, save_individual,
+                         workers=self.chart_workers, profile=self.render_profile, cache=self.chart_cache)
         
         print(f"✅ All charts created successfully for {computer_name}")
         print(f"📁 Charts saved in: {self.charts_dir}")
     
-    def _create_individual_charts(self, df, computer_name, timestamp):
-        """Create individual detailed charts for each metric"""
-        
-        # CPU Usage detailed chart
-        if 'cpu_percent' in df.columns:
-            plt.figure(figsize=(12, 6))
-            plt.plot(df['timestamp'], df['cpu_percent'], color='#ff6b6b', linewidth=2, marker='o', markersize=3)
-            plt.fill_between(df['timestamp'], df['cpu_percent'], alpha=0.3, color='#ff6b6b')
-            plt.title(f'CPU Usage Over Time - {computer_name}', fontsize=14, fontweight='bold')
-            plt.xlabel('Time')
-            plt.ylabel('CPU Usage (%)')
-            plt.grid(True, alpha=0.3)
-            plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%m-%d %H:%M'))
-            plt.gca().xaxis.set_major_locator(mdates.HourLocator(interval=max(1, len(df)//10)))
-            plt.xticks(rotation=45)
-            plt.ylim(0, 100)
-            plt.tight_layout()
-            cpu_file = os.path.join(self.charts_dir, f"cpu_usage_{computer_name}_{timestamp}.png")
-            plt.savefig(cpu_file, dpi=300, bbox_inches='tight')
-            plt.close()
-            print(f"📈 CPU chart saved: {cpu_file}")
-        
-        # Memory Usage detailed chart
-        if 'memory_percent' in df.columns and 'memory_used_gb' in df.columns and 'memory_total_gb' in df.columns:
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
-            
-            # Memory percentage
-            ax1.plot(df['timestamp'], df['memory_percent'], color='#4ecdc4', linewidth=2, marker='o', markersize=3)
-            ax1.fill_between(df['timestamp'], df['memory_percent'], alpha=0.3, color='#4ecdc4')
-            ax1.set_title(f'Memory Usage - {computer_name}', fontsize=14, fontweight='bold')
-            ax1.set_ylabel('Memory Usage (%)')
-            ax1.grid(True, alpha=0.3)
-            ax1.set_ylim(0, 100)
-            
-            # Memory GB
-            ax2.plot(df['timestamp'], df['memory_used_gb'], color='#4ecdc4', linewidth=2, marker='o', markersize=3, label='Used')
-            ax2.plot(df['timestamp'], df['memory_total_gb'], color='#95a5a6', linewidth=2, linestyle='--', label='Total')
-            ax2.fill_between(df['timestamp'], df['memory_used_gb'], alpha=0.3, color='#4ecdc4')
-            ax2.set_xlabel('Time')
-            ax2.set_ylabel('Memory (GB)')
-            ax2.legend()
-            ax2.grid(True, alpha=0.3)
-            
-            # Format x-axis
-            for ax in [ax1, ax2]:
-                ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d %H:%M'))
-                ax.xaxis.set_major_locator(mdates.HourLocator(interval=max(1, len(df)//10)))
-                plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
-            
-            plt.tight_layout()
-            memory_file = os.path.join(self.charts_dir, f"memory_usage_{computer_name}_{timestamp}.png")
-            plt.savefig(memory_file, dpi=300, bbox_inches='tight')
-            plt.close()
-            print(f"🧠 Memory chart saved: {memory_file}")
-    
-    def _create_security_chart(self, df, computer_name, timestamp):
-        """Create a detailed security-focused chart"""
-        security_columns = ['security_score', 'antivirus_enabled', 'real_time_protection', 
-                           'suspicious_activity_count', 'vulnerability_count']
+    def create_fleet_charts(self, computers=None, save_individual=True, start=None, end=None, where=None):
+        """Create the chart set of every known computer, rendering all of them concurrently"""
+        try:
+            import matplotlib
+        except ImportError:
+            print("❌ Matplotlib not installed. Please install it with: pip install matplotlib pandas")
+            return
+        
+        if computers is None:
+            computers = self.manifest.computers()
         
-        # Check if we have security data
-        has_security_data = any(col in df.columns for col in security_columns)
+        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        chart_sets = []
+        for computer_name in computers:
+            df = self.load_data_from_files(computer_name, start, end, where)
+            if df is None or len(df) < 2:
+                print(f"⚠️  Skipping {computer_name}: need at least 2 data points")
+                continue
+            chart_sets.append((computer_name, df, save_individual, timestamp))
         
-        if not has_security_data:
-            print("⚠️  No security data found for security chart")
+        if not chart_sets:
+            print("❌ No computer has enough data for visualization")
             return
         
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-        fig.suptitle(f'Security Analysis - {computer_name}', fontsize=16, fontweight='bold')
-        
-        # Security Score
-        if 'security_score' in df.columns:
-            axes[0,0].plot(df['timestamp'], df['security_score'], color='#27ae60', linewidth=3, marker='o', markersize=4)
-            axes[0,0].fill_between(df['timestamp'], df['security_score'], alpha=0.3, color='#27ae60')
-            axes[0,0].set_title('Security Score Over Time', fontweight='bold')
-            axes[0,0].set_ylabel('Score (0-100)')
-            axes[0,0].grid(True, alpha=0.3)
-            axes[0,0].set_ylim(0, 100)
-            
-            # Add colored zones
-            axes[0,0].axhspan(0, 60, alpha=0.1, color='red', label='Poor')
-            axes[0,0].axhspan(60, 75, alpha=0.1, color='orange', label='Fair')
-            axes[0,0].axhspan(75, 90, alpha=0.1, color='yellow', label='Good')
-            axes[0,0].axhspan(90, 100, alpha=0.1, color='green', label='Excellent')
-        
-        # Protection Status
-        if 'antivirus_enabled' in df.columns and 'real_time_protection' in df.columns:
-            # Convert boolean to numeric for plotting
-            av_numeric = df['antivirus_enabled'].astype(int)
-            rt_numeric = df['real_time_protection'].astype(int)
-            
-            axes[0,1].plot(df['timestamp'], av_numeric, color='#3498db', linewidth=2, marker='o', markersize=4, label='Antivirus')
-            axes[0,1].plot(df['timestamp'], rt_numeric, color='#e74c3c', linewidth=2, marker='s', markersize=4, label='Real-time Protection')
-            axes[0,1].set_title('Protection Status', fontweight='bold')
-            axes[0,1].set_ylabel('Status (0=Off, 1=On)')
-            axes[0,1].set_ylim(-0.1, 1.1)
-            axes[0,1].legend()
-            axes[0,1].grid(True, alpha=0.3)
-        
-        # Threat Activity
-        if 'suspicious_activity_count' in df.columns and 'vulnerability_count' in df.columns:
-            axes[1,0].bar(df['timestamp'], df['suspicious_activity_count'], alpha=0.7, color='#e67e22', 
-                         width=0.8*(df['timestamp'].iloc[1] - df['timestamp'].iloc[0]) if len(df) > 1 else 1, 
-                         label='Suspicious Activity')
-            axes[1,0].bar(df['timestamp'], df['vulnerability_count'], alpha=0.7, color='#c0392b', 
-                         width=0.8*(df['timestamp'].iloc[1] - df['timestamp'].iloc[0]) if len(df) > 1 else 1,
-                         bottom=df['suspicious_activity_count'], label='Vulnerabilities')
-            axes[1,0].set_title('Security Issues Detected', fontweight='bold')
-            axes[1,0].set_ylabel('Count')
-            axes[1,0].legend()
-            axes[1,0].grid(True, alpha=0.3)
-        
-        # Security Software Count
-        if 'security_software_count' in df.columns:
-            axes[1,1].plot(df['timestamp'], df['security_software_count'], color='#8e44ad', linewidth=2, marker='o', markersize=4)
-            axes[1,1].fill_between(df['timestamp'], df['security_software_count'], alpha=0.3, color='#8e44ad')
-            axes[1,1].set_title('Security Software Running', fontweight='bold')
-            axes[1,1].set_ylabel('Count')
-            axes[1,1].grid(True, alpha=0.3)
-        
-        # Format x-axis for all subplots
-        for ax in axes.flat:
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d %H:%M'))
-            ax.xaxis.set_major_locator(mdates.HourLocator(interval=max(1, len(df)//10)))
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        
-        plt.tight_layout()
-        security_file = os.path.join(self.charts_dir, f"security_analysis_{computer_name}_{timestamp}.png")
-        plt.savefig(security_file, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"🛡️  Security chart saved: {security_file}")
+        print(f"📈 Creating charts for {len(chart_sets)} computers...")
+        render_chart_sets(chart_sets, self.charts_dir, workers=self.chart_workers,
+                          profile=self.render_profile, cache=self.chart_cache)
+        print(f"📁 Charts saved in: {self.charts_dir}")
+    
+    def create_fleet_overview(self, metrics=None, computers=None, start=None, end=None):
+        """Render one small-multiples figure per metric with a row per computer (history read once)"""
+        from fleet_overview import render_fleet_overview
+        
+        # Pending batches must be on disk before the stores are read
+        self.flush_stores()
+        return render_fleet_overview(self.data_dir, self.charts_dir, metrics, computers, start, end,
+                                     workers=self.chart_workers)
+    
+    def flatten_sample(self, data):
+        """Flatten a nested status record into the combined CSV row layout"""
+        return flatten_status(data)
     
     def save_continuous_data(self):
         """Save data with security information to files"""
@@ -844,79 +858,112 @@ class SecurityEnhancedSystemMonitor:
             return
         
         # File paths with security data
-        combined_csv = os.path.join(self.data_dir, f"system_security_{self.computer_name}_combined.csv")
-        combined_json = os.path.join(self.data_dir, f"system_security_{self.computer_name}_combined.json")
-        global_csv = os.path.join(self.data_dir, "system_security_all_computers.csv")
+        combined_csv = os.path.join(self.data_dir, history_filename(self.computer_name))
+        combined_json = os.path.join(self.data_dir, json_history_filename(self.computer_name))
+        global_csv = os.path.join(self.data_dir, GLOBAL_HISTORY_FILE)
         
         try:
-            # Check if CSV file exists
-            file_exists = os.path.exists(combined_csv)
+            # Sizes before this sample, so files the stores cover stay covered
+            previous_stats = {path: os.stat(path) if os.path.exists(path) else None for path in (combined_csv, combined_json)}
             
-            with open(combined_csv, 'a', newline='') as f:
-                writer = csv.writer(f)
-                
-                # Headers with security fields
-                if not file_exists:
-                    headers = [
-                        'timestamp', 'computer_name', 'computer_id', 'os_system',
-                        'cpu_percent', 'memory_percent', 'memory_used_gb', 'memory_total_gb',
-                        'disk_percent', 'disk_free_gb', 'disk_total_gb', 'process_count',
-                        'temperature', 'uptime_hours', 'network_sent_mb', 'network_recv_mb',
-                        'security_score', 'antivirus_enabled', 'real_time_protection',
-                        'definition_age_days', 'suspicious_activity_count', 'vulnerability_count',
-                        'security_software_count'
-                    ]
-                    writer.writerow(headers)
-                    print(f"📄 Created new security monitoring file: {combined_csv}")
-                
-                # Write latest data with security info
-                latest_data = self.data_log[-1]
-                security = latest_data.get("security", {})
-                
-                row = [
-                    latest_data['timestamp'],
-                    latest_data['computer_info']['computer_name'],
-                    latest_data['computer_info']['computer_id'],
-                    latest_data['computer_info']['os_system'],
-                    latest_data['cpu']['usage_percent'],
-                    latest_data['memory']['usage_percent'],
-                    latest_data['memory']['used_gb'],
-                    latest_data['memory']['total_gb'],
-                    latest_data['disk']['usage_percent'],
-                    latest_data['disk']['free_gb'],
-                    latest_data['disk']['total_gb'],
-                    latest_data['system']['process_count'],
-                    latest_data['system']['temperature_celsius'] or 0,
-                    latest_data['system']['uptime_hours'],
-                    latest_data['network']['bytes_sent'] / (1024**2),
-                    latest_data['network']['bytes_received'] / (1024**2),
-                    security.get('security_score', 0),
-                    security.get('antivirus_status', {}).get('antivirus_enabled', False),
-                    security.get('antivirus_status', {}).get('real_time_protection', False),
-                    security.get('antivirus_status', {}).get('definition_age_days', 0),
-                    len(security.get('suspicious_activity', [])),
-                    len(security.get('vulnerabilities', [])),
-                    len(security.get('security_software', []))
-                ]
-                writer.writerow(row)
+            # Flatten latest data with security info
+            row_data = self.flatten_sample(self.data_log[-1])
+            
+            # Columns and order come from the schema registry (version in the sidecar)
+            if write_csv(combined_csv, [row_data]):
+                print(f"📄 Created new security monitoring file: {combined_csv}")
             
             # Save to global file
-            global_file_exists = os.path.exists(global_csv)
-            with open(global_csv, 'a', newline='') as f:
-                writer = csv.writer(f)
-                if not global_file_exists:
-                    writer.writerow(headers)
-                writer.writerow(row)
+            write_csv(global_csv, [row_data])
+            
+            # Keep the manifest current for listing and range pruning
+            self.manifest.record_samples(self.computer_name, os.path.basename(combined_csv), [row_data['timestamp']], save=False)
+            self.manifest.record_samples(None, GLOBAL_HISTORY_FILE, [row_data['timestamp']])
+            
+            # Queue for the indexed store (written in batches)
+            if self.history_store is not None:
+                self.history_store.add_sample(row_data)
+            if self.segment_writer is not None:
+                self.segment_writer.add_sample(row_data)
+            if self.memmap_writer is not None:
+                self.memmap_writer.add_sample(row_data)
+            if self.snapshot_writer is not None:
+                self.snapshot_writer.add_record(self.data_log[-1])
             
-            # Save complete JSON
-            with open(combined_json, 'w') as f:
-                json.dump(self.data_log, f, indent=2)
+            # Add the sample to the session's JSON history
+            self.append_json_history(combined_json, self.data_log[-1])
             
-            print(f"💾 Updated security files: {len(self.data_log)} records from {self.computer_name}")
+            # The sample went to the files and the stores alike
+            for coverage in self.store_coverage.values():
+                for path, stat in previous_stats.items():
+                    coverage.extend_coverage(path, stat)
+            
+            print(f"💾 Updated security files: {self.session_samples} records from {self.computer_name}")
             
         except Exception as e:
             print(f"❌ Error saving security data: {e}")
     
+    def append_json_history(self, path, record):
+        """Append a record to the session's JSON history without re-serialising the earlier ones
+        
+        The first save of a session starts the file from the in-memory log;
+        later records are written in place before the closing bracket, in the
+        same indented layout json.dump produces.
+        """
+        if self.json_history_started and os.path.exists(path):
+            with open(path, 'rb+') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() >= 2:
+                    f.seek(-2, os.SEEK_END)
+                    if f.read(2) == b"\n]":
+                        f.seek(-2, os.SEEK_END)
+                        item = textwrap.indent(json.dumps(record, indent=2), "  ")
+                        f.write(f",\n{item}\n]".encode('utf-8'))
+                        return
+        
+        # New session, or a file this writer does not recognise: start it over
+        with open(path, 'w') as f:
+            json.dump(list(self.data_log), f, indent=2)
+        self.json_history_started = True
+    
+    def process_sample(self, current_data, display=True):
+        """Run one status record through the collection pipeline: session log, display and storage"""
+        self.data_log.append(current_data)
+        self.session_samples += 1
+        
+        # Display current status
+        if display:
+            self.display_current_status(current_data)
+        
+        # Save data
+        self.save_continuous_data()
+        
+        for listener in list(self.sample_listeners):
+            try:
+                listener(current_data)
+            except Exception as e:
+                print(f"⚠️  Sample listener failed: {e}")
+    
+    def add_sample_listener(self, listener):
+        """Call `listener(record)` with every sample run through process_sample (from the collecting thread)"""
+        self.sample_listeners.append(listener)
+    
+    def remove_sample_listener(self, listener):
+        """Stop sending samples to a listener"""
+        if listener in self.sample_listeners:
+            self.sample_listeners.remove(listener)
+    
+    def flush_stores(self):
+        """Write any partially filled batches to the enabled stores"""
+        if self.history_store is not None:
+            self.history_store.flush()
+        if self.segment_writer is not None:
+            self.segment_writer.flush()
+        if self.memmap_writer is not None:
+            self.memmap_writer.flush()
+        for coverage in self.store_coverage.values():
+            coverage.save()
+    
     def collect_data_continuously(self, duration_minutes=5, interval_seconds=30):
         """Collect data with security monitoring"""
         print(f"\n🛡️ SECURITY-ENHANCED DATA COLLECTION for {duration_minutes} minutes")
@@ -931,15 +978,9 @@ class SecurityEnhancedSystemMonitor:
         
         try:
             while time.time() < end_time:
-                # Collect current data with security scan
+                # Collect current data with security scan, then display and save it
                 current_data = self.get_current_status()
-                self.data_log.append(current_data)
-                
-                # Display current status
-                self.display_current_status(current_data)
-                
-                # Save data
-                self.save_continuous_data()
+                self.process_sample(current_data)
                 
                 # Wait for next interval
                 print(f"💤 Waiting {interval_seconds} seconds until next reading...")
@@ -948,7 +989,10 @@ class SecurityEnhancedSystemMonitor:
         except KeyboardInterrupt:
             print("\n⏹️  Data collection stopped by user")
         
-        print(f"\n✅ Security-enhanced collection complete! Gathered {len(self.data_log)} samples")
+        # Write any partially filled batch
+        self.flush_stores()
+        
+        print(f"\n✅ Security-enhanced collection complete! Gathered {self.session_samples} samples")
     
     def run_security_scan_only(self):
         """Run a comprehensive security scan and display results"""
@@ -1048,7 +1092,12 @@ def main():
             interval = input("Interval in seconds (default 60): ").strip()
             interval = int(interval) if interval.isdigit() else 60
             
-            monitor.collect_data_continuously(duration, interval)
+            view = input("View: 1 = scrolling status, 2 = full-screen terminal dashboard (default 1): ").strip()
+            if view == '2':
+                from terminal_dashboard import run_terminal_dashboard
+                run_terminal_dashboard(monitor, interval, duration)
+            else:
+                monitor.collect_data_continuously(duration, interval)
         
         elif choice == '3':
             monitor.run_security_scan_only()
@@ -1100,8 +1149,12 @@ def main():
             print("1. Create charts for current computer")
             print("2. Create charts for a specific computer")
             print("3. List available computers")
+            print("4. Create charts for all computers (fleet)")
+            print("5. Live dashboard (updates as samples arrive)")
+            print("6. Fleet overview (one figure per metric, one row per computer)")
+            print(f"7. Change render profile (current: {monitor.render_profile})")
             
-            chart_choice = input("Enter choice (1-3): ").strip()
+            chart_choice = input("Enter choice (1-7): ").strip()
             
             if chart_choice == '1':
                 monitor.create_comprehensive_charts()
@@ -1114,25 +1167,43 @@ def main():
                     print("❌ Invalid computer name")
             
             elif chart_choice == '3':
-                # List available computers from CSV files
+                # List available computers from the data manifest
                 try:
-                    csv_files = [f for f in os.listdir(monitor.data_dir) if f.endswith('.csv')]
-                    computers = set()
-                    for csv_file in csv_files:
-                        # Extract computer name from filename
-                        parts = csv_file.replace('.csv', '').split('_')
-                        for i, part in enumerate(parts):
-                            if part == 'security' and i + 1 < len(parts):
-                                computers.add(parts[i + 1])
+                    computers = monitor.manifest.computers()
                     
                     if computers:
                         print(f"\n📋 Available computers:")
-                        for computer in sorted(computers):
-                            print(f"   🖥️  {computer}")
+                        for computer in computers:
+                            summary = monitor.manifest.computer_summary(computer)
+                            print(f"   🖥️  {computer} ({summary['rows']} records)")
                     else:
                         print("❌ No computer data files found")
                 except Exception as e:
                     print(f"❌ Error listing computers: {e}")
+            
+            elif chart_choice == '4':
+                monitor.create_fleet_charts()
+            
+            elif chart_choice == '5':
+                from live_dashboard import run_live_dashboard
+                
+                interval = input("Sample interval in seconds (default 1): ").strip()
+                interval = float(interval) if interval.replace('.', '', 1).isdigit() and float(interval) > 0 else 1.0
+                run_live_dashboard(monitor, interval)
+            
+            elif chart_choice == '6':
+                monitor.create_fleet_overview()
+            
+            elif chart_choice == '7':
+                for name, settings in RENDER_PROFILES.items():
+                    print(f"   {name}: {settings['format'].upper()}, {settings['dpi']} dpi"
+                          f"{', tight bounding box' if settings['tight'] else ''}")
+                profile = input(f"Profile (default {DEFAULT_PROFILE}): ").strip().lower() or DEFAULT_PROFILE
+                if profile in RENDER_PROFILES:
+                    monitor.render_profile = profile
+                    print(f"✅ Charts will be rendered with the {profile} profile")
+                else:
+                    print("❌ Unknown render profile")
         
         elif choice == '6':
             # Save timestamped files
@@ -1148,7 +1219,7 @@ def main():
                 try:
                     # Save JSON
                     with open(json_filename, 'w') as f:
-                        json.dump(monitor.data_log, f, indent=2)
+                        json.dump(list(monitor.data_log), f, indent=2)
                     print(f"💾 Saved detailed security data to {json_filename}")
                     
                     # Save CSV summary
@@ -1167,14 +1238,14 @@ def main():
                         for data in monitor.data_log:
                             security = data.get("security", {})
                             row = [
-                                data['timestamp'],
+                                to_iso(data['timestamp']),
                                 data['computer_info']['computer_name'],
                                 data['cpu']['usage_percent'],
                                 data['memory']['usage_percent'],
                                 data['disk']['usage_percent'],
-                                security.get('security_score', 0),
-                                security.get('antivirus_status', {}).get('antivirus_enabled', False),
-                                security.get('antivirus_status', {}).get('real_time_protection', False),
+                                security.get('security_score', DEFAULTS['security_score']),
+                                security.get('antivirus_status', {}).get('antivirus_enabled', DEFAULTS['antivirus_enabled']),
+                                security.get('antivirus_status', {}).get('real_time_protection', DEFAULTS['real_time_protection']),
                                 len(security.get('suspicious_activity', [])),
                                 len(security.get('vulnerabilities', []))
                             ]
@@ -1224,7 +1295,7 @@ def main():
                     if chart_files:
                         print(f"\n   📊 Chart Files:")
                         for file in sorted(chart_files):
-                            if file.endswith(('.png', '.jpg', '.jpeg')):
+                            if file.endswith(('.png', '.jpg', '.jpeg', '.svg', '.pdf', '.html')):
                                 file_path = os.path.join(monitor.charts_dir, file)
                                 size = os.path.getsize(file_path)
                                 modified = datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
@@ -1246,9 +1317,13 @@ def main():
             print("1. Change security scan interval")
             print("2. Force security scan cache refresh")
             print("3. View detected security software")
-            print("4. Back to main menu")
+            print("4. Enable SQLite history store")
+            print("5. Enable compressed segment store")
+            print("6. Enable memory-mapped history")
+            print("7. Enable nested record snapshots")
+            print("8. Back to main menu")
             
-            sub_choice = input("\nEnter choice (1-4): ").strip()
+            sub_choice = input("\nEnter choice (1-8): ").strip()
             
             if sub_choice == '1':
                 try:
@@ -1272,9 +1347,41 @@ def main():
                     print("❌ No recognized security software detected")
             
             elif sub_choice == '4':
+                if monitor.history_store is not None:
+                    print(f"✅ SQLite history store already enabled: {monitor.history_store.db_path}")
+                elif monitor.enable_sqlite_store():
+                    print("✅ New samples will also be written to the SQLite history store")
+            
+            elif sub_choice == '5':
+                if monitor.segment_writer is not None:
+                    print(f"✅ Compressed segment store already enabled: {monitor.segment_writer.path}")
+                elif monitor.enable_segment_store():
+                    print("✅ New samples will also be written to compressed segments")
+            
+            elif sub_choice == '6':
+                if monitor.memmap_writer is not None:
+                    print(f"✅ Memory-mapped history already enabled: {monitor.memmap_writer.path}")
+                elif monitor.enable_memmap_store():
+                    print("✅ New samples will also be written to the memory-mapped history")
+            
+            elif sub_choice == '7':
+                if monitor.snapshot_writer is not None:
+                    print(f"✅ Nested record snapshots already enabled: {monitor.snapshot_writer.path}")
+                elif monitor.enable_snapshot_store():
+                    print("✅ Full nested records will also be kept as delta snapshots")
+            
+            elif sub_choice == '8':
                 continue
         
         elif choice == '9':
+            if monitor.history_store is not None:
+                monitor.history_store.close()
+            if monitor.segment_writer is not None:
+                monitor.segment_writer.close()
+            if monitor.memmap_writer is not None:
+                monitor.memmap_writer.close()
+            if monitor.snapshot_writer is not None:
+                monitor.snapshot_writer.close()
             print("👋 Goodbye! Stay secure!")
             break
         
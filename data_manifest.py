@@ -0,0 +1,224 @@
+# data_manifest.py
+"""
+Manifest of the history files in a data directory.
+
+Writers record every file they append to together with its computer ID, row
+count and min/max timestamps (epoch nanoseconds). Fleet listing, time-range
+pruning and "latest file" lookups read this small JSON file instead of
+scanning and parsing the data directory.
+
+Rebuild a missing or stale manifest with:
+    python data_manifest.py rebuild [data_dir]
+"""
+
+import os
+import sys
+import csv
+import json
+from timestamps import now_ns, to_epoch_ns, to_iso
+from file_catalog import computer_id_from_filename, parse_rollup_filename, GLOBAL_HISTORY_FILE
+from data_schema import skip_preamble
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+class DataManifest:
+    """Per-directory record of history files, their computers, row counts and time ranges"""
+    
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, MANIFEST_NAME)
+        self.data = None
+    
+    def _empty(self):
+        """Blank manifest structure"""
+        return {"version": MANIFEST_VERSION, "updated": None, "files": {}, "computers": {}}
+    
+    def load(self):
+        """Load the manifest from disk; returns False when it is missing or unreadable"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                return False
+            self.data = data
+            return True
+        except (OSError, ValueError):
+            return False
+    
+    def ensure(self):
+        """Load the manifest, rebuilding it from the data directory if needed"""
+        if self.data is not None or self.load():
+            return self.data
+        print(f"🔧 Manifest missing in {self.data_dir}, rebuilding...")
+        self.rebuild()
+        return self.data
+    
+    def save(self):
+        """Atomically write the manifest to disk"""
+        if self.data is None:
+            return
+        self.data["updated"] = now_ns()
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(temp_path, self.path)
+    
+    def record_samples(self, computer_id, filename, timestamps, file_format="csv", replace=False, save=True):
+        """Record rows written to a file (replace=True when the file was rewritten)"""
+        self.ensure()
+        timestamps = [ts for ts in timestamps if ts is not None]
+        
+        entry = self.data["files"].get(filename)
+        if entry is None or replace:
+            entry = {"computer_id": computer_id, "format": file_format, "rows": 0, "min_ts": None, "max_ts": None}
+            self.data["files"][filename] = entry
+        
+        if timestamps:
+            entry["rows"] += len(timestamps)
+            low, high = min(timestamps), max(timestamps)
+            entry["min_ts"] = low if entry["min_ts"] is None else min(entry["min_ts"], low)
+            entry["max_ts"] = high if entry["max_ts"] is None else max(entry["max_ts"], high)
+        
+        if computer_id is not None:
+            self._refresh_computer(computer_id)
+        if save:
+            self.save()
+    
+    def remove_file(self, filename, save=True):
+        """Forget a file that was deleted or replaced"""
+        self.ensure()
+        entry = self.data["files"].pop(filename, None)
+        if entry is not None and entry.get("computer_id") is not None:
+            self._refresh_computer(entry["computer_id"])
+        if save:
+            self.save()
+    
+    def _refresh_computer(self, computer_id):
+        """Recompute a computer's summary from its file entries"""
+        files = {name: entry for name, entry in self.data["files"].items() if entry.get("computer_id") == computer_id}
+        if not files:
+            self.data["computers"].pop(computer_id, None)
+            return
+        
+        min_values = [entry["min_ts"] for entry in files.values() if entry["min_ts"] is not None]
+        max_values = [entry["max_ts"] for entry in files.values() if entry["max_ts"] is not None]
+        self.data["computers"][computer_id] = {
+            "files": sorted(files.keys()),
+            "rows": sum(entry["rows"] for entry in files.values()),
+            "min_ts": min(min_values) if min_values else None,
+            "max_ts": max(max_values) if max_values else None
+        }
+    
+    def computers(self):
+        """Sorted list of known computer IDs"""
+        self.ensure()
+        return sorted(self.data["computers"].keys())
+    
+    def computer_summary(self, computer_id):
+        """Row count, time range and files for one computer (or None)"""
+        self.ensure()
+        return self.data["computers"].get(computer_id)
+    
+    def files_for(self, computer_id, start=None, end=None, file_format=None):
+        """Paths of a computer's files whose time range overlaps [start, end]"""
+        self.ensure()
+        start_ns = to_epoch_ns(start) if start is not None else None
+        end_ns = to_epoch_ns(end) if end is not None else None
+        
+        paths = []
+        for filename, entry in self.data["files"].items():
+            if entry.get("computer_id") != computer_id:
+                continue
+            if file_format is not None and entry.get("format") != file_format:
+                continue
+            if start_ns is not None and entry["max_ts"] is not None and entry["max_ts"] < start_ns:
+                continue
+            if end_ns is not None and entry["min_ts"] is not None and entry["min_ts"] > end_ns:
+                continue
+            paths.append(os.path.join(self.data_dir, filename))
+        return sorted(paths)
+    
+    def latest_file(self, file_format="csv"):
+        """Path of the file holding the most recent samples (fleet-wide file included)"""
+        self.ensure()
+        # Ties (a per-computer file and the fleet file written together) go to the larger file
+        candidates = [
+            (entry["max_ts"], entry["rows"], filename) for filename, entry in self.data["files"].items()
+            if entry.get("format") == file_format and entry["max_ts"] is not None
+        ]
+        if not candidates:
+            return None
+        return os.path.join(self.data_dir, max(candidates)[2])
+    
+    def rebuild(self):
+        """Recreate the manifest by scanning every history CSV in the data directory"""
+        retention = (self.data or {}).get("retention")
+        self.data = self._empty()
+        if retention:
+            self.data["retention"] = retention
+        
+        try:
+            filenames = sorted(os.listdir(self.data_dir))
+        except FileNotFoundError:
+            filenames = []
+        
+        for filename in filenames:
+            rollup = parse_rollup_filename(filename)
+            if rollup is not None:
+                tier, computer_id = rollup
+                timestamps = self._scan_csv_timestamps(os.path.join(self.data_dir, filename), 'bucket_start')
+                self.record_samples(computer_id, filename, timestamps, file_format=f"rollup_{tier}", save=False)
+                continue
+            
+            if filename == GLOBAL_HISTORY_FILE:
+                computer_id = None
+            else:
+                computer_id = computer_id_from_filename(filename)
+                if computer_id is None:
+                    continue
+            
+            timestamps = self._scan_csv_timestamps(os.path.join(self.data_dir, filename))
+            self.record_samples(computer_id, filename, timestamps, save=False)
+        
+        self.save()
+        return self.data
+    
+    def _scan_csv_timestamps(self, path, column='timestamp'):
+        """Read the timestamp column of a CSV (epoch-ns or legacy ISO)"""
+        timestamps = []
+        try:
+            with open(path, 'r', newline='', encoding='utf-8', errors='replace') as f:
+                for row in csv.DictReader(skip_preamble(f)):
+                    try:
+                        timestamps.append(to_epoch_ns(row.get(column)))
+                    except (TypeError, ValueError):
+                        continue
+        except OSError as e:
+            print(f"⚠️  Could not scan {path}: {e}")
+        return timestamps
+
+
+def main():
+    """Command line entry point: rebuild or list a data directory's manifest"""
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else "data"
+    manifest = DataManifest(data_dir)
+    
+    if command == "rebuild":
+        manifest.rebuild()
+        print(f"✅ Rebuilt {manifest.path}: {len(manifest.data['files'])} files, "
+              f"{len(manifest.data['computers'])} computers")
+    elif command == "list":
+        for computer_id in manifest.computers():
+            summary = manifest.computer_summary(computer_id)
+            first = to_iso(summary["min_ts"]) if summary["min_ts"] is not None else "-"
+            last = to_iso(summary["max_ts"]) if summary["max_ts"] is not None else "-"
+            print(f"🖥️  {computer_id}: {summary['rows']} rows, {first} → {last}")
+    else:
+        print("Usage: python data_manifest.py [rebuild|list] [data_dir]")
+
+
+if __name__ == "__main__":
+    main()
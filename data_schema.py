@@ -0,0 +1,276 @@
+# data_schema.py
+"""
+Versioned schema registry for monitoring samples.
+
+One place defines every sample column's name, dtype, unit and default. Both
+monitors write through it, so the combined CSV files share one column layout
+(including the portable monitor's internet_connected), and every history file
+records the schema version it was written with:
+  CSV      - a "<file>.schema.json" sidecar, so the CSV itself stays plain
+             (pd.read_csv, Excel and exports read it as-is)
+  SQLite   - PRAGMA user_version
+  segments - "schema_version" in the segment / memmap headers
+
+Readers parse with the exact dtypes below (bool, float32, int16, category)
+instead of letting pandas infer them, and fill missing values and columns
+with each column's own default rather than a blanket fillna(0). CSVs without
+a sidecar are legacy (version 0) and are read the same way; a leading
+"#schema_version=N" line left by earlier writers is skipped.
+"""
+
+import io
+import os
+import csv
+import json
+
+SCHEMA_VERSION = 1
+SCHEMA_MARKER = "#schema_version="
+SCHEMA_SIDECAR_SUFFIX = ".schema.json"
+
+# name, pandas dtype, unit, default (used for missing values), SQLite type
+SCHEMA_COLUMNS = [
+    ('timestamp', 'int64', 'ns since epoch', None, 'INTEGER'),
+    ('computer_name', 'category', None, '', 'TEXT'),
+    ('computer_id', 'category', None, '', 'TEXT'),
+    ('os_system', 'category', None, '', 'TEXT'),
+    ('cpu_percent', 'float32', '%', 0.0, 'REAL'),
+    ('memory_percent', 'float32', '%', 0.0, 'REAL'),
+    ('memory_used_gb', 'float32', 'GiB', 0.0, 'REAL'),
+    ('memory_total_gb', 'float32', 'GiB', 0.0, 'REAL'),
+    ('disk_percent', 'float32', '%', 0.0, 'REAL'),
+    ('disk_free_gb', 'float32', 'GiB', 0.0, 'REAL'),
+    ('disk_total_gb', 'float32', 'GiB', 0.0, 'REAL'),
+    ('process_count', 'int32', 'processes', 0, 'INTEGER'),
+    ('temperature', 'float32', '°C', 0.0, 'REAL'),
+    ('uptime_hours', 'float32', 'h', 0.0, 'REAL'),
+    ('network_sent_mb', 'float32', 'MiB', 0.0, 'REAL'),
+    ('network_recv_mb', 'float32', 'MiB', 0.0, 'REAL'),
+    # A missing scan is never recorded (or filled) as protected
+    ('security_score', 'int16', 'points (0-100)', 0, 'INTEGER'),
+    ('antivirus_enabled', 'bool', None, False, 'INTEGER'),
+    ('real_time_protection', 'bool', None, False, 'INTEGER'),
+    ('definition_age_days', 'int16', 'days', 0, 'INTEGER'),
+    ('suspicious_activity_count', 'int16', 'processes', 0, 'INTEGER'),
+    ('vulnerability_count', 'int16', 'findings', 0, 'INTEGER'),
+    ('security_software_count', 'int16', 'products', 0, 'INTEGER'),
+    ('internet_connected', 'bool', None, False, 'INTEGER')
+]
+
+COLUMN_NAMES = [column[0] for column in SCHEMA_COLUMNS]
+DTYPES = {column[0]: column[1] for column in SCHEMA_COLUMNS}
+UNITS = {column[0]: column[2] for column in SCHEMA_COLUMNS}
+DEFAULTS = {column[0]: column[3] for column in SCHEMA_COLUMNS}
+SQL_TYPES = [(column[0], column[4]) for column in SCHEMA_COLUMNS]
+BOOLEAN_COLUMNS = [name for name, dtype in DTYPES.items() if dtype == 'bool']
+TEXT_COLUMNS = [name for name, dtype in DTYPES.items() if dtype == 'category']
+
+
+def flatten_status(data):
+    """Flatten a nested colector.py status record into a schema row (flat records pass through)
+    
+    Values missing from the record take the registry defaults, so a row
+    flattened here matches one read back from a file with the same gap.
+    """
+    if 'computer_info' not in data:
+        return dict(data)
+    
+    security = data.get("security", {})
+    
+    return {
+        'timestamp': data['timestamp'],
+        'computer_name': data['computer_info']['computer_name'],
+        'computer_id': data['computer_info']['computer_id'],
+        'os_system': data['computer_info']['os_system'],
+        'cpu_percent': data['cpu']['usage_percent'],
+        'memory_percent': data['memory']['usage_percent'],
+        'memory_used_gb': data['memory']['used_gb'],
+        'memory_total_gb': data['memory']['total_gb'],
+        'disk_percent': data['disk']['usage_percent'],
+        'disk_free_gb': data['disk']['free_gb'],
+        'disk_total_gb': data['disk']['total_gb'],
+        'process_count': data['system']['process_count'],
+        'temperature': data['system']['temperature_celsius'] or DEFAULTS['temperature'],
+        'uptime_hours': data['system']['uptime_hours'],
+        'network_sent_mb': data['network']['bytes_sent'] / (1024**2),
+        'network_recv_mb': data['network']['bytes_received'] / (1024**2),
+        'security_score': security.get('security_score', DEFAULTS['security_score']),
+        'antivirus_enabled': security.get('antivirus_status', {}).get('antivirus_enabled', DEFAULTS['antivirus_enabled']),
+        'real_time_protection': security.get('antivirus_status', {}).get('real_time_protection', DEFAULTS['real_time_protection']),
+        'definition_age_days': security.get('antivirus_status', {}).get('definition_age_days', DEFAULTS['definition_age_days']),
+        'suspicious_activity_count': len(security.get('suspicious_activity', [])),
+        'vulnerability_count': len(security.get('vulnerabilities', [])),
+        'security_software_count': len(security.get('security_software', []))
+    }
+
+
+def schema_sidecar_path(path):
+    """Path of the sidecar holding a history CSV's schema version"""
+    return path + SCHEMA_SIDECAR_SUFFIX
+
+
+def write_schema_sidecar(path, fieldnames):
+    """Record the current schema version and a CSV's columns next to it"""
+    with open(schema_sidecar_path(path), 'w', encoding='utf-8') as f:
+        json.dump({"schema_version": SCHEMA_VERSION, "columns": list(fieldnames)}, f, indent=2)
+
+
+def csv_schema_version(path):
+    """Schema version of a history CSV: its sidecar, a legacy version line, or 0"""
+    try:
+        with open(schema_sidecar_path(path), 'r', encoding='utf-8') as f:
+            return int(json.load(f).get("schema_version", 0))
+    except (OSError, ValueError, TypeError, AttributeError):
+        pass
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return parse_version_line(f.readline()) or 0
+    except OSError:
+        return 0
+
+
+def parse_version_line(line):
+    """Schema version from a legacy "#schema_version=N" line, or None"""
+    if isinstance(line, bytes):
+        line = line.decode('utf-8', errors='replace')
+    line = line.strip()
+    if line.startswith(SCHEMA_MARKER):
+        try:
+            return int(line[len(SCHEMA_MARKER):])
+        except ValueError:
+            return None
+    return None
+
+
+def split_preamble(data):
+    """Byte offset where the CSV header starts (past a legacy version line) and that line's version (0 if none)"""
+    first_line_end = data.find(b'\n') + 1
+    if first_line_end and data.startswith(SCHEMA_MARKER.encode('utf-8')):
+        return first_line_end, parse_version_line(data[:first_line_end]) or 0
+    return 0, 0
+
+
+def skip_preamble(lines):
+    """Iterate over CSV text lines without a legacy schema version line"""
+    for line in lines:
+        if line.startswith('#'):
+            continue
+        yield line
+
+
+def read_csv_header(path):
+    """Column names and schema version of an existing history CSV"""
+    with open(path, 'r', newline='', encoding='utf-8', errors='replace') as f:
+        first = f.readline()
+        header_line = f.readline() if parse_version_line(first) is not None else first
+    fieldnames = next(csv.reader([header_line]), []) if header_line.strip() else []
+    return fieldnames, csv_schema_version(path)
+
+
+def conform_row(row, fieldnames=None):
+    """Order a sample dict by the schema (or an existing file's header); absent values stay empty"""
+    if fieldnames is None:
+        fieldnames = COLUMN_NAMES + [name for name in row if name not in DTYPES]
+    return {name: row.get(name) for name in fieldnames}
+
+
+def write_csv(path, rows, append=True, fieldnames=None):
+    """Write sample rows with the versioned schema; returns True when a new file was started
+    
+    Appending to an existing file keeps that file's header, so legacy files
+    never get misaligned rows. Rewrites and new files use the current schema,
+    and their version goes into the sidecar rather than the CSV.
+    """
+    creating = not append or not os.path.exists(path) or os.path.getsize(path) == 0
+    if creating:
+        if fieldnames is None:
+            extra = [name for row in rows for name in row if name not in DTYPES]
+            fieldnames = COLUMN_NAMES + list(dict.fromkeys(extra))
+        mode = 'w'
+    else:
+        fieldnames, _ = read_csv_header(path)
+        mode = 'a'
+    
+    with open(path, mode, newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+        if creating:
+            writer.writeheader()
+        writer.writerows(conform_row(row, fieldnames) for row in rows)
+    if creating:
+        write_schema_sidecar(path, fieldnames)
+    return creating
+
+
+def parse_dtypes(columns, categories=True):
+    """read_csv dtypes for the known columns (timestamps may be legacy ISO text, so are left out)"""
+    dtypes = {}
+    for name in columns:
+        dtype = DTYPES.get(name)
+        if dtype is None or name == 'timestamp':
+            continue
+        if dtype == 'category' and not categories:
+            dtype = 'str'
+        dtypes[name] = dtype
+    return dtypes
+
+
+def parse_csv_bytes(data, names=None, categories=True):
+    """Parse CSV bytes with exact schema dtypes, coercing only when a column has gaps or bad values"""
+    import pandas as pd
+    
+    columns = names
+    if columns is None:
+        header_end = data.find(b'\n') + 1
+        columns = next(csv.reader([data[:header_end].decode('utf-8', errors='replace')]), [])
+    
+    options = {'header': None, 'names': names} if names is not None else {}
+    try:
+        return pd.read_csv(io.BytesIO(data), dtype=parse_dtypes(columns, categories), **options)
+    except (ValueError, TypeError):
+        # Empty cells in integer/boolean columns: parse loosely, then apply defaults
+        frame = pd.read_csv(io.BytesIO(data), **options)
+        return apply_schema(frame, add_missing=False, categories=categories)
+
+
+def read_history_csv(path, categories=True):
+    """Read a history CSV (versioned or legacy) with exact dtypes"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    start, _ = split_preamble(data)
+    return parse_csv_bytes(data[start:], categories=categories)
+
+
+def _coerce_bool(series):
+    """Map True/False text, 0/1 and real booleans onto a nullable boolean column"""
+    import pandas as pd
+    
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    text = series.astype('string').str.strip().str.lower()
+    mapped = text.map({'true': True, 'false': False, '1': True, '0': False, '1.0': True, '0.0': False})
+    return mapped.astype('boolean')
+
+
+def apply_schema(df, add_missing=True, categories=True):
+    """Add missing columns, fill gaps with per-column defaults and cast to the schema dtypes"""
+    import pandas as pd
+    
+    for name, dtype, _, default, _ in SCHEMA_COLUMNS:
+        if name not in df.columns:
+            if add_missing and default is not None:
+                print(f"⚠️  Adding missing column: {name}")
+                df[name] = default
+            continue
+        if name == 'timestamp':
+            continue
+        
+        if dtype == 'bool':
+            df[name] = _coerce_bool(df[name]).fillna(default).astype(bool)
+        elif dtype == 'category':
+            values = df[name].astype('string').fillna(default)
+            df[name] = values.astype('category') if categories else values.astype(str)
+        else:
+            numeric = pd.to_numeric(df[name], errors='coerce').fillna(default)
+            if dtype.startswith('int'):
+                numeric = numeric.round()
+            df[name] = numeric.astype(dtype)
+    return df
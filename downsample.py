@@ -0,0 +1,131 @@
+# downsample.py
+"""
+Reduce long time series to about the number of points a chart can show.
+
+A line chart a few thousand pixels wide cannot distinguish more vertices
+than it has pixel columns, yet months of history pass millions of rows to
+plot(), fill_between() and bar(). Before drawing, each series is reduced to
+roughly the axis width in pixels:
+
+  lttb_indices      - Largest-Triangle-Three-Buckets: keeps the points that
+                      carry the visual shape of a line (peaks and dips)
+  minmax_envelope   - per-bucket min/max, so filled areas keep every spike
+  bucket_reduce     - per-bucket aggregate (e.g. max) for bar charts
+
+Short series are returned unchanged.
+"""
+
+
+def axis_points(figure_width_inches, dpi, columns=1):
+    """Target number of points for one axis: its approximate width in pixels"""
+    return max(2, int(figure_width_inches * dpi / columns))
+
+
+def _bucket_edges(length, buckets):
+    """Start offsets of `buckets` nearly equal buckets over `length` rows, plus the end"""
+    import numpy as np
+    
+    return np.linspace(0, length, buckets + 1).astype('int64')
+
+
+def _as_float(values):
+    """Numeric view of timestamps or values for the triangle arithmetic"""
+    import numpy as np
+    
+    values = np.asarray(values)
+    if values.dtype.kind == 'M':
+        values = values.astype('datetime64[ns]').view('int64')
+    return values.astype('float64')
+
+
+def lttb_indices(x, y, threshold):
+    """Indices of the `threshold` points chosen by Largest-Triangle-Three-Buckets
+    
+    The first and last points are always kept. The rows in between are split
+    into threshold - 2 buckets; from each bucket the point forming the largest
+    triangle with the previously selected point and the mean of the next
+    bucket is kept. Work inside a bucket is vectorised; the loop runs once per
+    output point.
+    """
+    import numpy as np
+    
+    length = len(y)
+    if threshold >= length or threshold < 3:
+        return np.arange(length)
+    
+    xs = _as_float(x)
+    ys = _as_float(y)
+    
+    # Bucket boundaries over the interior rows 1 .. length - 2
+    edges = 1 + _bucket_edges(length - 2, threshold - 2)
+    sums_x = np.add.reduceat(xs[1:length - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(ys[1:length - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    mean_x = np.append(sums_x / counts, xs[-1])
+    mean_y = np.append(sums_y / counts, ys[-1])
+    
+    selected = np.empty(threshold, dtype='int64')
+    selected[0] = 0
+    selected[-1] = length - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        ax, ay = xs[previous], ys[previous]
+        cx, cy = mean_x[bucket + 1], mean_y[bucket + 1]
+        # Twice the triangle area for every candidate in the bucket at once
+        areas = np.abs((ax - cx) * (ys[start:stop] - ay) - (ax - xs[start:stop]) * (cy - ay))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def lttb(x, y, threshold):
+    """(x, y) reduced to `threshold` points with LTTB"""
+    import numpy as np
+    
+    x = np.asarray(x)
+    y = np.asarray(y)
+    indices = lttb_indices(x, y, threshold)
+    return x[indices], y[indices]
+
+
+def minmax_envelope(x, y, buckets):
+    """(x, lower, upper) with one min/max pair per bucket, for filled areas"""
+    import numpy as np
+    
+    x = np.asarray(x)
+    y = np.asarray(y, dtype='float64')
+    if buckets >= len(y):
+        return x, y, y
+    
+    starts = _bucket_edges(len(y), buckets)[:-1]
+    lower = np.minimum.reduceat(y, starts)
+    upper = np.maximum.reduceat(y, starts)
+    return x[starts], lower, upper
+
+
+def bucket_reduce(x, y, buckets, how='max'):
+    """(bucket start x, aggregated y, bucket widths) for bar charts"""
+    import numpy as np
+    
+    x = np.asarray(x)
+    y = np.asarray(y, dtype='float64')
+    if buckets >= len(y):
+        return x, y, None
+    
+    edges = _bucket_edges(len(y), buckets)
+    starts = edges[:-1]
+    if how == 'max':
+        values = np.maximum.reduceat(y, starts)
+    elif how == 'mean':
+        values = np.add.reduceat(y, starts) / np.diff(edges)
+    else:
+        raise ValueError(f"Unsupported bucket aggregate: {how}")
+    
+    # Bars span their bucket: up to the next bucket's first timestamp (the last
+    # bucket ends at the last sample, so it borrows its neighbour's width)
+    bucket_x = x[starts]
+    widths = np.append(bucket_x[1:], x[-1]) - bucket_x
+    if len(widths) > 1:
+        widths[-1] = widths[-2]
+    return bucket_x, values, widths
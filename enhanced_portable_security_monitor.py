@@ -4,7 +4,6 @@ import platform
 import datetime
 import time
 import json
-import csv
 import os
 import socket
 import subprocess
@@ -21,7 +20,12 @@ from pathlib import Path
 import zipfile
 import shutil
 import sys
+import importlib.util
 from typing import List, Dict, Any
+from timestamps import now_ns, to_iso
+from data_manifest import DataManifest
+from retention import RetentionEngine
+from data_schema import write_csv
 
 class EnhancedPortableSecurityMonitor:
     """Enhanced Portable Security Monitor with Comprehensive Security Scanning and Auto Data Sync"""
@@ -48,6 +52,8 @@ class EnhancedPortableSecurityMonitor:
         self.config_dir = os.path.join(self.app_dir, "config")
         self.logs_dir = os.path.join(self.app_dir, "logs")
         self.ensure_directories()
+        self.manifest = DataManifest(self.data_dir)
+        self.manifest.ensure()
         
         # Load configuration
         self.config = self.load_config()
@@ -119,7 +125,12 @@ class EnhancedPortableSecurityMonitor:
             "collection_settings": {
                 "interval_seconds": 60,
                 "include_charts": False,
+                "chart_budget_seconds": 20,
                 "max_file_size_mb": 10
+            },
+            "retention_settings": {
+                "raw_days": 7,
+                "rollup_5m_days": 90
             }
         }
         
@@ -496,7 +507,7 @@ class EnhancedPortableSecurityMonitor:
     
     def get_current_status(self):
         """Get current system status with comprehensive security information"""
-        timestamp = datetime.datetime.now()
+        timestamp = now_ns()
         
         try:
             # Basic system metrics
@@ -547,7 +558,7 @@ class EnhancedPortableSecurityMonitor:
             
             # Compile all data with the same structure as colector.py
             system_data = {
-                "timestamp": timestamp.isoformat(),
+                "timestamp": timestamp,
                 "computer_name": socket.gethostname(),
                 "computer_id": self.computer_name,
                 "os_system": platform.system(),
@@ -587,11 +598,16 @@ class EnhancedPortableSecurityMonitor:
         # CSV file with the desired format
         csv_filename = os.path.join(self.data_dir, f"system_security_{self.computer_name}_combined.csv")
         try:
-            with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
-                if self.data_log:
-                    writer = csv.DictWriter(f, fieldnames=self.data_log[0].keys())
-                    writer.writeheader()
-                    writer.writerows(self.data_log)
+            # Columns and order come from the schema registry (version in the sidecar)
+            write_csv(csv_filename, self.data_log, append=False)
+            
+            # The file is rewritten with the whole session, so replace its manifest entry
+            self.manifest.record_samples(
+                self.computer_name,
+                os.path.basename(csv_filename),
+                [data['timestamp'] for data in self.data_log],
+                replace=True
+            )
             
             self.log_message(f"Data saved to {csv_filename}")
             return csv_filename
@@ -626,6 +642,10 @@ class EnhancedPortableSecurityMonitor:
                                 arcname = f"logs/{file}"
                                 zipf.write(file_path, arcname)
                 
+                # Add charts of this session, rendered in memory
+                if self.config['collection_settings'].get('include_charts') and self.data_log:
+                    self.add_charts_to_package(zipf, timestamp)
+                
                 # Add system info
                 system_info = {
                     "computer_id": self.computer_name,
@@ -636,12 +656,7 @@ class EnhancedPortableSecurityMonitor:
                     "package_created": timestamp,
                     "data_points": len(self.data_log)
                 }
-                
-                info_path = os.path.join(self.data_dir, "system_info.json")
-                with open(info_path, 'w') as f:
-                    json.dump(system_info, f, indent=2)
-                zipf.write(info_path, "system_info.json")
-                os.remove(info_path)  # Clean up temp file
+                zipf.writestr("system_info.json", json.dumps(system_info, indent=2))
             
             # Check file size
             file_size_mb = os.path.getsize(package_path) / (1024**2)
@@ -659,6 +674,43 @@ class EnhancedPortableSecurityMonitor:
             self.log_message(f"Error creating data package: {e}", "ERROR")
             return None
     
+    def add_charts_to_package(self, zipf, timestamp):
+        """Write the session's charts straight into an open package, within the chart time budget
+        
+        The HTML/SVG dashboard needs only the standard library. PNG previews are
+        added when matplotlib and pandas are available (the portable build
+        excludes them) and only while the budget lasts, so a sync never stalls
+        on plotting. Nothing is written to disk.
+        """
+        started = time.perf_counter()
+        budget_seconds = self.config['collection_settings'].get('chart_budget_seconds', 20)
+        
+        from svg_report import render_html_report
+        zipf.writestr(f"charts/dashboard_{self.computer_name}_{timestamp}.html",
+                      render_html_report(self.data_log, self.computer_name))
+        
+        # Check for the plotting stack up front: charts imports matplotlib lazily,
+        # inside render_chart_images, so a failed import would surface mid-render
+        missing = [name for name in ('matplotlib', 'pandas', 'numpy') if importlib.util.find_spec(name) is None]
+        if missing:
+            self.log_message(f"Chart images skipped ({', '.join(missing)} not available), HTML dashboard only")
+            return
+        
+        try:
+            from charts import frame_from_rows, render_chart_images
+            df = frame_from_rows(self.data_log)
+            if len(df) < 2:
+                return
+            remaining = budget_seconds - (time.perf_counter() - started)
+            images = render_chart_images(df, self.computer_name, timestamp, budget_seconds=remaining)
+        except ImportError as e:
+            self.log_message(f"Chart images skipped ({e}), HTML dashboard only", "WARNING")
+            return
+        for filename, data in images:
+            # PNG data is already compressed
+            zipf.writestr(f"charts/{filename}", data, compress_type=zipfile.ZIP_STORED)
+        self.log_message(f"Added {len(images)} chart images to package in {time.perf_counter() - started:.1f}s")
+    
     def send_data_via_email(self, file_path):
         """Send data package via email"""
         try:
@@ -797,18 +849,34 @@ This is an automated message from the Enhanced Portable Security Monitor.
         return success
     
     def cleanup_old_files(self):
-        """Clean up old data files to save space"""
+        """Clean up old logs and packages, and roll aged samples into retention tiers"""
         try:
             cutoff_date = datetime.datetime.now() - datetime.timedelta(days=7)
             
-            for directory in [self.data_dir, self.logs_dir]:
+            # Logs and leftover sync packages are removed by age; history files never are
+            for directory, extensions in [(self.logs_dir, ('.log',)), (self.data_dir, ('.zip',))]:
                 for file in os.listdir(directory):
                     file_path = os.path.join(directory, file)
-                    if os.path.isfile(file_path):
+                    if os.path.isfile(file_path) and file.endswith(extensions):
                         file_time = datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
                         if file_time < cutoff_date:
                             os.remove(file_path)
                             self.log_message(f"Cleaned up old file: {file}")
+            
+            # Aged raw samples become 5-minute, then hourly rollups
+            retention = self.config.get('retention_settings', {})
+            engine = RetentionEngine(
+                self.data_dir,
+                raw_days=retention.get('raw_days', 7),
+                rollup_5m_days=retention.get('rollup_5m_days', 90),
+                manifest=self.manifest
+            )
+            summary = engine.apply()
+            if summary['raw_rows_rolled'] or summary['rollup_rows_rolled']:
+                self.log_message(f"Retention: {summary['raw_rows_rolled']} raw rows rolled to 5m, "
+                                 f"{summary['rollup_rows_rolled']} 5m rollups rolled to 1h")
+            if summary['unreadable_rows_kept']:
+                self.log_message(f"Retention kept {summary['unreadable_rows_kept']} rows with unreadable timestamps", "WARNING")
                             
         except Exception as e:
             self.log_message(f"Error during cleanup: {e}", "WARNING")
@@ -868,7 +936,7 @@ This is an automated message from the Enhanced Portable Security Monitor.
                     self.data_log.append(data)
                     
                     # Display status with enhanced info
-                    print(f"📊 {data['timestamp']}: CPU {data['cpu_percent']:.1f}%, "
+                    print(f"📊 {to_iso(data['timestamp'])}: CPU {data['cpu_percent']:.1f}%, "
                           f"Memory {data['memory_percent']:.1f}%, "
                           f"Security {data['security_score']}/100, "
                           f"Temp {data['temperature']}°C, "
@@ -954,7 +1022,7 @@ def main():
         if choice == '1':
             data = monitor.get_current_status()
             if data:
-                print(f"\n📊 ENHANCED SYSTEM STATUS - {data['timestamp']}")
+                print(f"\n📊 ENHANCED SYSTEM STATUS - {to_iso(data['timestamp'])}")
                 print(f"🖥️  CPU: {data['cpu_percent']:.1f}%")
                 print(f"🧠 Memory: {data['memory_percent']:.1f}% ({data['memory_used_gb']:.1f}GB used)")
                 print(f"💾 Disk: {data['disk_percent']:.1f}% ({data['disk_free_gb']:.1f}GB free)")
@@ -989,7 +1057,8 @@ def main():
             print("1. Run setup wizard")
             print("2. Toggle auto-sync")
             print("3. View current config")
-            print("4. Back")
+            print("4. Toggle charts in sync package")
+            print("5. Back")
             
             sub_choice = input("Choice: ").strip()
             if sub_choice == '1':
@@ -1005,6 +1074,12 @@ def main():
                 print(f"Auto-sync: {monitor.config['auto_sync_enabled']}")
                 print(f"Sync Interval: {monitor.config['sync_interval_minutes']} minutes")
                 print(f"Collection Interval: {monitor.config['collection_settings']['interval_seconds']} seconds")
+                print(f"Charts in package: {monitor.config['collection_settings'].get('include_charts', False)}")
+            elif sub_choice == '4':
+                current = monitor.config['collection_settings'].get('include_charts', False)
+                monitor.config['collection_settings']['include_charts'] = not current
+                monitor.save_config()
+                print(f"Charts in sync package: {'Enabled' if not current else 'Disabled'}")
         
         elif choice == '6':
             print(f"\n📁 Data Files in {monitor.data_dir}:")
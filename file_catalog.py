@@ -0,0 +1,96 @@
+# file_catalog.py
+"""
+Exact mapping between history files in the data directory and computer IDs.
+
+History files are named system_security_<computer_id>_combined.csv by both
+monitors. Matching on the parsed ID (rather than a substring of the filename)
+keeps "KxcPc" from also picking up system_security_KxcPc_Windows_combined.csv,
+and keeps the fleet-wide system_security_all_computers.csv and the option-6
+security_data_* exports (copies of rows already in the combined files) out of
+per-computer loads.
+"""
+
+import os
+import re
+
+HISTORY_FILE_PATTERN = re.compile(r'^system_security_(?P<computer_id>.+)_combined\.csv$')
+JSON_HISTORY_FILE_PATTERN = re.compile(r'^system_security_(?P<computer_id>.+)_combined\.json$')
+GLOBAL_HISTORY_FILE = "system_security_all_computers.csv"
+ROLLUP_FILE_PATTERN = re.compile(r'^rollup_(?P<tier>5m|1h)_(?P<computer_id>.+)\.csv$')
+
+
+def computer_id_from_filename(filename):
+    """Return the computer ID for a per-computer history file, or None"""
+    if filename == GLOBAL_HISTORY_FILE:
+        return None
+    match = HISTORY_FILE_PATTERN.match(filename)
+    if match:
+        return match.group('computer_id')
+    return None
+
+
+def history_filename(computer_id):
+    """Name of the per-computer combined history CSV"""
+    return f"system_security_{computer_id}_combined.csv"
+
+
+def json_history_filename(computer_id):
+    """Name of the per-computer full JSON dump written by colector.py"""
+    return f"system_security_{computer_id}_combined.json"
+
+
+def computer_id_from_json_filename(filename):
+    """Return the computer ID for a per-computer JSON dump, or None"""
+    match = JSON_HISTORY_FILE_PATTERN.match(filename)
+    if match:
+        return match.group('computer_id')
+    return None
+
+
+def rollup_filename(computer_id, tier):
+    """Name of a computer's rollup CSV for a retention tier ('5m' or '1h')"""
+    return f"rollup_{tier}_{computer_id}.csv"
+
+
+def parse_rollup_filename(filename):
+    """Return (tier, computer_id) for a rollup file, or None"""
+    match = ROLLUP_FILE_PATTERN.match(filename)
+    if match:
+        return match.group('tier'), match.group('computer_id')
+    return None
+
+
+class HistoryFileCatalog:
+    """Catalog of per-computer history files in a data directory"""
+    
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+    
+    def scan(self):
+        """Map every computer ID to the history files that belong to it"""
+        catalog = {}
+        try:
+            with os.scandir(self.data_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    computer_id = computer_id_from_filename(entry.name)
+                    if computer_id is not None:
+                        catalog.setdefault(computer_id, []).append(entry.path)
+        except FileNotFoundError:
+            return {}
+        
+        for paths in catalog.values():
+            paths.sort()
+        return catalog
+    
+    def files_for(self, computer_id):
+        """History files that belong to exactly this computer ID"""
+        path = os.path.join(self.data_dir, history_filename(computer_id))
+        if os.path.isfile(path):
+            return [path]
+        return []
+    
+    def computers(self):
+        """Sorted list of computer IDs with history files"""
+        return sorted(self.scan().keys())
@@ -0,0 +1,234 @@
+# fleet_overview.py
+"""
+Fleet overview: one small-multiples figure per metric, one row per computer.
+
+Comparing machines used to mean rendering a full chart set per computer and
+flipping between separate PNGs. Here every host's history is read once (from
+the SQLite store, segments, memmap files or CSV files, see
+history_loader.history_frames), all hosts are aligned on one common time
+grid and each metric is drawn as a single figure with a row per host and
+shared x and y axes, so the rows compare directly.
+
+Alignment is vectorised: each sample gets a flat (host, time bucket) index
+and np.bincount sums and counts every bucket of every host in one pass per
+metric. Buckets without samples stay empty (NaN), so offline periods show as
+gaps. The grid has about as many buckets as the figure has pixel columns.
+The metric figures are independent and are rendered in a process pool.
+
+Usage:
+    python fleet_overview.py [data_dir_or_file] [charts_dir] [metric,metric,...]
+"""
+
+import os
+import sys
+import time
+import datetime
+from charts import _init_worker
+from downsample import axis_points
+
+FLEET_DPI = 150
+FLEET_FIGURE_WIDTH = 14
+ROW_HEIGHT_INCHES = 0.55
+
+# Metric column -> (title, fixed y limits or None, color)
+FLEET_METRICS = {
+    'cpu_percent': ('CPU Usage (%)', (0, 100), '#ff6b6b'),
+    'memory_percent': ('Memory Usage (%)', (0, 100), '#4ecdc4'),
+    'disk_percent': ('Disk Usage (%)', (0, 100), '#45b7d1'),
+    'security_score': ('Security Score', (0, 100), '#96ceb4'),
+    'process_count': ('Process Count', None, '#feca57'),
+    'network_recv_mb': ('Network Received (MB)', None, '#54a0ff'),
+    'suspicious_activity_count': ('Suspicious Activity', None, '#ff4757')
+}
+
+
+def load_fleet_history(source="data", computers=None, metrics=None, start=None, end=None):
+    """Every host's history in one frame (computer_id, epoch-ns timestamp and the metric columns)"""
+    import pandas as pd
+    from history_loader import history_frames, merge_by_timestamp
+    from timestamps import epoch_ns_series
+    
+    columns = list(metrics or FLEET_METRICS)
+    frames = []
+    for df in history_frames(source, None, start, end):
+        if not len(df) or 'computer_id' not in df.columns:
+            continue
+        df = df[['computer_id', 'timestamp'] + [col for col in columns if col in df.columns]].copy()
+        df['timestamp'] = epoch_ns_series(df['timestamp'])
+        frames.append(df.dropna(subset=['timestamp']))
+    if not frames:
+        return pd.DataFrame(columns=['computer_id', 'timestamp'] + columns)
+    
+    fleet = merge_by_timestamp(frames)
+    fleet['timestamp'] = fleet['timestamp'].astype('int64')
+    fleet['computer_id'] = fleet['computer_id'].astype(str)
+    if computers is not None:
+        fleet = fleet[fleet['computer_id'].isin(computers)]
+    return fleet
+
+
+def align_to_grid(fleet, metrics, buckets):
+    """Per-host bucket means of each metric on a common time grid
+    
+    Returns {"hosts": [...], "times": bucket centres (epoch ns),
+    "values": {metric: hosts x buckets array}, "counts": hosts x buckets}.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    timestamps = fleet['timestamp'].to_numpy(dtype='int64')
+    codes, hosts = pd.factorize(fleet['computer_id'], sort=True)
+    host_count = len(hosts)
+    t0, t1 = int(timestamps.min()), int(timestamps.max())
+    span = max(t1 - t0, 1)
+    
+    # Float arithmetic: (ns offset * buckets) overflows int64 for spans over a few months
+    bucket = np.minimum(((timestamps - t0) / span * buckets).astype('int64'), buckets - 1)
+    flat = codes.astype('int64') * buckets + bucket
+    size = host_count * buckets
+    
+    values = {}
+    for metric in metrics:
+        if metric not in fleet.columns:
+            continue
+        column = fleet[metric].to_numpy(dtype='float64', na_value=np.nan)
+        valid = ~np.isnan(column)
+        sums = np.bincount(flat[valid], weights=column[valid], minlength=size)
+        counts = np.bincount(flat[valid], minlength=size)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values[metric] = (sums / counts).reshape(host_count, buckets)
+    
+    return {
+        "hosts": [str(host) for host in hosts],
+        "times": t0 + ((np.arange(buckets) + 0.5) * span / buckets).astype('int64'),
+        "values": values,
+        "counts": np.bincount(flat, minlength=size).reshape(host_count, buckets)
+    }
+
+
+def render_metric_overview(metric, hosts, times, values, path, dpi=FLEET_DPI):
+    """Small multiples of one metric: a row per host, shared axes; returns (metric, path, seconds)
+    
+    Module-level so it can run in a worker process; takes plain arrays.
+    """
+    import numpy as np
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    from timestamps import to_local_datetime
+    
+    started = time.perf_counter()
+    title, ylim, color = FLEET_METRICS.get(metric, (metric, None, '#45b7d1'))
+    x = to_local_datetime(pd.Series(times)).to_numpy()
+    
+    rows = len(hosts)
+    height = max(3.0, ROW_HEIGHT_INCHES * rows + 1.5)
+    fig, axes = plt.subplots(rows, 1, figsize=(FLEET_FIGURE_WIDTH, height), squeeze=False)
+    fig.suptitle(f'Fleet Overview - {title} ({rows} computers)', fontsize=14, fontweight='bold', y=1 - 0.25 / height)
+    
+    if ylim is None:
+        finite = values[np.isfinite(values)]
+        ylim = (0, float(finite.max()) * 1.05 if len(finite) and finite.max() > 0 else 1)
+    
+    # Every row gets the same fixed limits instead of sharex/sharey: with dozens of rows,
+    # matplotlib's shared-axis bookkeeping makes each limit change touch every sibling
+    for position, (ax, host, row) in enumerate(zip(axes[:, 0], hosts, values)):
+        ax.fill_between(x, row, ylim[0], color=color, alpha=0.3, linewidth=0)
+        ax.plot(x, row, color=color, linewidth=1)
+        ax.set_xlim(x[0], x[-1])
+        ax.set_ylim(*ylim)
+        ax.set_yticks(ylim)
+        ax.set_ylabel(host, rotation=0, ha='right', va='center', fontsize=8)
+        ax.tick_params(axis='y', labelsize=6)
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator(minticks=3, maxticks=10))
+        ax.grid(True, alpha=0.3)
+        if position < rows - 1:
+            ax.tick_params(axis='x', labelbottom=False)
+    
+    last_ax = axes[-1, 0]
+    last_ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d %H:%M'))
+    plt.setp(last_ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
+    
+    # Margins in inches (title above, rotated date labels below) whatever the number of rows
+    fig.subplots_adjust(left=0.15, right=0.98, top=1 - 0.7 / height, bottom=0.9 / height, hspace=0.3)
+    fig.savefig(path, dpi=dpi)
+    plt.close(fig)
+    return metric, path, time.perf_counter() - started
+
+
+def overview_filename(metric, timestamp):
+    """File name of one metric's fleet overview"""
+    return f"fleet_{metric}_{timestamp}.png"
+
+
+def render_fleet_overview(source="data", charts_dir="charts", metrics=None, computers=None,
+                          start=None, end=None, dpi=FLEET_DPI, workers=None, timestamp=None):
+    """Read every host once and render one small-multiples figure per metric; returns the paths"""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    metrics = list(metrics or FLEET_METRICS)
+    started = time.perf_counter()
+    
+    fleet = load_fleet_history(source, computers, metrics, start, end)
+    if not len(fleet):
+        print(f"❌ No history found in {source}")
+        return []
+    
+    grid = align_to_grid(fleet, metrics, axis_points(FLEET_FIGURE_WIDTH, dpi))
+    loaded = time.perf_counter()
+    print(f"📊 Aligned {len(fleet):,} samples from {len(grid['hosts'])} computers on a "
+          f"{len(grid['times'])}-bucket grid in {loaded - started:.2f}s")
+    
+    if not os.path.exists(charts_dir):
+        os.makedirs(charts_dir)
+    if timestamp is None:
+        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    jobs = [
+        (metric, grid["hosts"], grid["times"], grid["values"][metric], os.path.join(charts_dir, overview_filename(metric, timestamp)), dpi)
+        for metric in metrics if metric in grid["values"]
+    ]
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+    
+    paths = []
+    if workers <= 1:
+        for job in jobs:
+            metric, path, seconds = render_metric_overview(*job)
+            paths.append(path)
+            print(f"🖥️  Fleet {metric} overview saved: {path} ({seconds:.1f}s)")
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = {pool.submit(render_metric_overview, *job): job[0] for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    metric, path, seconds = future.result()
+                    paths.append(path)
+                    print(f"🖥️  Fleet {metric} overview saved: {path} ({seconds:.1f}s)")
+                except Exception as e:
+                    print(f"❌ Error rendering fleet {futures[future]} overview: {e}")
+    
+    print(f"⏱️  Fleet overview: {len(paths)} figures for {len(grid['hosts'])} computers in "
+          f"{time.perf_counter() - started:.1f}s")
+    return paths
+
+
+def main():
+    """Command line entry point: render the fleet overview of a data directory"""
+    import matplotlib
+    matplotlib.use('Agg')
+    
+    source = sys.argv[1] if len(sys.argv) > 1 else "data"
+    charts_dir = sys.argv[2] if len(sys.argv) > 2 else "charts"
+    metrics = sys.argv[3].split(',') if len(sys.argv) > 3 else None
+    
+    unknown = [metric for metric in metrics or [] if metric not in FLEET_METRICS]
+    if unknown:
+        print(f"❌ Unknown metric(s): {', '.join(unknown)}. Choose from: {', '.join(FLEET_METRICS)}")
+        return
+    render_fleet_overview(source, charts_dir, metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,680 @@
+# gorilla_store.py
+"""
+Compressed time-series segments for monitoring history (Gorilla-style encoding).
+
+A segment file holds one computer's samples as a sequence of blocks. Inside a
+block every column is encoded on its own:
+  timestamp - delta-of-delta, bit-packed into variable-width buckets
+  numbers   - XOR against the previous value, storing only the meaningful bits
+  text      - run-length encoded (computer name/ID and OS barely ever change)
+
+Slowly changing floats such as memory_total_gb collapse to a single bit per
+sample, instead of an 18-digit decimal string per CSV row. Each block starts
+with a fixed header (row count, payload length, min/max timestamp) followed
+by a zone map (min/max/count of every numeric column), so the block index is
+built by hopping from header to header and time-range or threshold reads only
+decode the blocks that can hold a matching row.
+
+The delta-of-delta buckets are sized for nanosecond timestamps with
+millisecond-level sampling jitter rather than the second-resolution buckets
+of the original paper.
+
+Convert the existing CSV history, or query every host's segments, with:
+    python gorilla_store.py convert [data_dir]
+    python gorilla_store.py query "disk_percent>90" [data_dir]
+"""
+
+import os
+import re
+import sys
+import json
+import struct
+import threading
+from history_store import SAMPLE_COLUMNS, BOOLEAN_COLUMNS
+from timestamps import to_epoch_ns, to_iso
+from data_schema import SCHEMA_VERSION, read_history_csv
+from zone_maps import ZONE_ENTRY, normalise_predicates, compute_zone, block_may_match, row_mask
+
+SEGMENT_MAGIC = b"GTS1"
+BLOCK_MAGIC = b"BLK1"
+SEGMENT_VERSION = 2
+# Version 1 blocks have no zone map
+SUPPORTED_VERSIONS = (1, 2)
+
+# File header: magic, version, length of the JSON column spec that follows
+# (the spec also records the data_schema version the columns come from)
+FILE_HEADER = struct.Struct('<4sHI')
+# Block header: magic, row count, payload bytes, min timestamp, max timestamp
+# (from version 2 the payload starts with one ZONE_ENTRY per float column)
+BLOCK_HEADER = struct.Struct('<4sIIqq')
+COLUMN_LENGTH = struct.Struct('<I')
+
+DEFAULT_BLOCK_ROWS = 512
+
+# Delta-of-delta buckets: (prefix bits, prefix length, value width)
+TIMESTAMP_BUCKETS = [
+    (0b10, 2, 16),
+    (0b110, 3, 28),
+    (0b1110, 4, 40),
+    (0b1111, 4, 64)
+]
+
+MASK_64 = (1 << 64) - 1
+
+SEGMENT_FILE_PATTERN = re.compile(r'^system_security_(?P<computer_id>.+)_combined\.gts$')
+
+
+def segment_filename(computer_id):
+    """Name of a computer's compressed history segment file"""
+    return f"system_security_{computer_id}_combined.gts"
+
+
+def zone_columns(columns):
+    """Columns that carry a zone map entry, in block order"""
+    return [name for name, kind in columns if kind == 'float']
+
+
+def column_kinds():
+    """Encoding used for each sample column: 'timestamp', 'float' or 'text'"""
+    kinds = []
+    for name, sql_type in SAMPLE_COLUMNS:
+        if name == 'timestamp':
+            kinds.append((name, 'timestamp'))
+        elif sql_type == 'TEXT':
+            kinds.append((name, 'text'))
+        else:
+            kinds.append((name, 'float'))
+    return kinds
+
+
+class BitWriter:
+    """Append-only big-endian bit buffer"""
+    
+    def __init__(self):
+        self.out = bytearray()
+        self.acc = 0
+        self.nbits = 0
+    
+    def write(self, value, width):
+        """Write the low `width` bits of a non-negative integer"""
+        self.acc = (self.acc << width) | value
+        self.nbits += width
+        while self.nbits >= 8:
+            self.nbits -= 8
+            self.out.append((self.acc >> self.nbits) & 0xFF)
+        self.acc &= (1 << self.nbits) - 1
+    
+    def getvalue(self):
+        """Bytes written so far, padding the last byte with zero bits"""
+        if self.nbits:
+            return bytes(self.out) + bytes([(self.acc << (8 - self.nbits)) & 0xFF])
+        return bytes(self.out)
+
+
+class BitReader:
+    """Sequential reader over a big-endian bit buffer"""
+    
+    def __init__(self, data):
+        # Padding lets every read take a fixed 9-byte window
+        self.data = bytes(data) + b'\x00' * 9
+        self.pos = 0
+    
+    def read(self, width):
+        """Read `width` (at most 64) bits as a non-negative integer"""
+        if width == 0:
+            return 0
+        byte = self.pos >> 3
+        shift = self.pos & 7
+        window = int.from_bytes(self.data[byte:byte + 9], 'big')
+        self.pos += width
+        return (window >> (72 - shift - width)) & ((1 << width) - 1)
+    
+    def read_bit(self):
+        """Read a single bit"""
+        bit = (self.data[self.pos >> 3] >> (7 - (self.pos & 7))) & 1
+        self.pos += 1
+        return bit
+
+
+def _to_signed(value, width):
+    """Interpret an unsigned `width`-bit integer as two's complement"""
+    if value >= 1 << (width - 1):
+        return value - (1 << width)
+    return value
+
+
+def encode_timestamps(values):
+    """Delta-of-delta encode a list of integer epoch-ns timestamps"""
+    writer = BitWriter()
+    if not values:
+        return writer.getvalue()
+    
+    writer.write(values[0] & MASK_64, 64)
+    if len(values) == 1:
+        return writer.getvalue()
+    
+    previous_delta = values[1] - values[0]
+    writer.write(previous_delta & MASK_64, 64)
+    
+    for index in range(2, len(values)):
+        delta = values[index] - values[index - 1]
+        dod = delta - previous_delta
+        previous_delta = delta
+        if dod == 0:
+            writer.write(0, 1)
+            continue
+        for prefix, prefix_bits, width in TIMESTAMP_BUCKETS:
+            limit = 1 << (width - 1)
+            if -limit <= dod < limit or width == 64:
+                writer.write(prefix, prefix_bits)
+                writer.write(dod & ((1 << width) - 1), width)
+                break
+    return writer.getvalue()
+
+
+def decode_timestamps(data, count, out, offset=0):
+    """Decode `count` timestamps straight into `out[offset:offset + count]`
+    
+    Values are stored through a memoryview of the output array as they are
+    decoded (no intermediate list). Each step reads one 64-bit window: a run
+    of unchanged deltas (one zero bit each) is measured from it and written
+    in one go (a numpy progression for long runs), otherwise its prefix gives
+    the width of the delta-of-delta that follows.
+    """
+    import numpy as np
+    
+    if count == 0:
+        return
+    reader = BitReader(data)
+    view = memoryview(out[offset:offset + count])
+    current = _to_signed(reader.read(64), 64)
+    view[0] = current
+    if count == 1:
+        return
+    delta = _to_signed(reader.read(64), 64)
+    current += delta
+    view[1] = current
+    
+    data = reader.data
+    pos = reader.pos
+    index = 2
+    while index < count:
+        byte = pos >> 3
+        window = (int.from_bytes(data[byte:byte + 9], 'big') >> (8 - (pos & 7))) & MASK_64
+        if not window >> 63:
+            run = min(64 - window.bit_length(), count - index)
+            pos += run
+            if run > 16:
+                out[offset + index:offset + index + run] = current + delta * np.arange(1, run + 1, dtype='int64')
+                current += delta * run
+                index += run
+            else:
+                for index in range(index, index + run):
+                    current += delta
+                    view[index] = current
+                index += 1
+            continue
+        
+        if not (window >> 62) & 1:
+            width, control = 16, 2
+        elif not (window >> 61) & 1:
+            width, control = 28, 3
+        elif not (window >> 60) & 1:
+            width, control = 40, 4
+        else:
+            width, control = 64, 4
+        if width < 64:
+            dod = (window >> (64 - control - width)) & ((1 << width) - 1)
+        else:
+            byte = (pos + control) >> 3
+            dod = (int.from_bytes(data[byte:byte + 9], 'big') >> (8 - ((pos + control) & 7))) & MASK_64
+        pos += control + width
+        if dod >> (width - 1):
+            dod -= 1 << width
+        delta += dod
+        current += delta
+        view[index] = current
+        index += 1
+
+
+def encode_floats(values):
+    """XOR-encode a list of floats (NaN marks a missing value)"""
+    import numpy as np
+    
+    writer = BitWriter()
+    if not values:
+        return writer.getvalue()
+    
+    bits = np.asarray(values, dtype='float64').view('uint64').tolist()
+    previous = bits[0]
+    writer.write(previous, 64)
+    previous_lead = None
+    previous_trail = 0
+    
+    for value in bits[1:]:
+        xor = value ^ previous
+        previous = value
+        if xor == 0:
+            writer.write(0, 1)
+            continue
+        
+        lead = min(64 - xor.bit_length(), 31)
+        trail = (xor & -xor).bit_length() - 1
+        if previous_lead is not None and lead >= previous_lead and trail >= previous_trail:
+            # Meaningful bits fit in the previous window
+            writer.write(0b10, 2)
+            writer.write(xor >> previous_trail, 64 - previous_lead - previous_trail)
+        else:
+            significant = 64 - lead - trail
+            writer.write(0b11, 2)
+            writer.write(lead, 5)
+            writer.write(significant & 63, 6)
+            writer.write(xor >> trail, significant)
+            previous_lead, previous_trail = lead, trail
+    return writer.getvalue()
+
+
+def decode_floats(data, count, out, offset=0):
+    """Decode `count` XOR-encoded floats straight into the uint64 view `out[offset:offset + count]`
+    
+    Values are stored through a memoryview of the output array as they are
+    decoded (no intermediate list). Each step reads one 64-bit window: a run
+    of repeated values (one zero bit each) is measured from it and filled
+    in one go (a slice assignment for long runs), otherwise it holds the
+    control bits (and a new leading-zero/length window) of the XOR that
+    follows.
+    """
+    if count == 0:
+        return
+    reader = BitReader(data)
+    view = memoryview(out[offset:offset + count])
+    current = reader.read(64)
+    view[0] = current
+    trail = significant = 0
+    
+    data = reader.data
+    pos = reader.pos
+    index = 1
+    while index < count:
+        byte = pos >> 3
+        window = (int.from_bytes(data[byte:byte + 9], 'big') >> (8 - (pos & 7))) & MASK_64
+        if not window >> 63:
+            run = min(64 - window.bit_length(), count - index)
+            if run > 16:
+                out[offset + index:offset + index + run] = current
+            else:
+                for position in range(index, index + run):
+                    view[position] = current
+            pos += run
+            index += run
+            continue
+        
+        if (window >> 62) & 1:
+            # '11': new window of 5 bits leading zeros and 6 bits length
+            significant = ((window >> 51) & 63) or 64
+            trail = 64 - ((window >> 57) & 31) - significant
+            control = 13
+        else:
+            # '10': same window as the previous value
+            control = 2
+        if control + significant <= 64:
+            xor = (window >> (64 - control - significant)) & ((1 << significant) - 1)
+        else:
+            byte = (pos + control) >> 3
+            xor = (int.from_bytes(data[byte:byte + 9], 'big') >> (72 - ((pos + control) & 7) - significant)) & ((1 << significant) - 1)
+        pos += control + significant
+        current ^= xor << trail
+        view[index] = current
+        index += 1
+
+
+def encode_text(values):
+    """Run-length encode a list of strings (None allowed) as JSON"""
+    runs = []
+    for value in values:
+        if runs and runs[-1][0] == value:
+            runs[-1][1] += 1
+        else:
+            runs.append([value, 1])
+    return json.dumps(runs, separators=(',', ':')).encode('utf-8')
+
+
+def decode_text(data, count, out, offset=0):
+    """Expand run-length encoded strings into `out[offset:offset + count]`"""
+    position = offset
+    for value, run in json.loads(data.decode('utf-8')):
+        out[position:position + run] = [value] * run
+        position += run
+
+
+def _float_cell(value):
+    """Convert a sample value to a float for XOR encoding (missing -> NaN)"""
+    if value is None or value == '':
+        return float('nan')
+    if isinstance(value, str):
+        if value in ('True', 'true'):
+            return 1.0
+        if value in ('False', 'false'):
+            return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def encode_block(columns, rows, version=SEGMENT_VERSION):
+    """Encode a list of sample dicts into one block (header + zone map + payload)"""
+    import numpy as np
+    
+    timestamps = [to_epoch_ns(row.get('timestamp')) for row in rows]
+    zone_map = bytearray()
+    payload = bytearray()
+    
+    for name, kind in columns:
+        if kind == 'timestamp':
+            encoded = encode_timestamps(timestamps)
+        elif kind == 'text':
+            encoded = encode_text([None if row.get(name) is None else str(row.get(name)) for row in rows])
+        else:
+            values = [_float_cell(row.get(name)) for row in rows]
+            encoded = encode_floats(values)
+            zone_map += ZONE_ENTRY.pack(*compute_zone(np.asarray(values, dtype='float64')))
+        payload += COLUMN_LENGTH.pack(len(encoded))
+        payload += encoded
+    
+    if version >= 2:
+        payload = zone_map + payload
+    header = BLOCK_HEADER.pack(BLOCK_MAGIC, len(rows), len(payload), min(timestamps), max(timestamps))
+    return header + bytes(payload)
+
+
+def read_columns_spec(f):
+    """Read and validate a segment file header; returns (columns, data offset, version, schema version)"""
+    header = f.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size:
+        raise ValueError("Segment file header is incomplete")
+    magic, version, spec_length = FILE_HEADER.unpack(header)
+    if magic != SEGMENT_MAGIC or version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Not a supported history segment file (version {version})")
+    spec = json.loads(f.read(spec_length).decode('utf-8'))
+    if isinstance(spec, list):
+        spec = {"schema_version": 0, "columns": spec}  # written before the schema registry
+    columns = [tuple(column) for column in spec["columns"]]
+    return columns, FILE_HEADER.size + spec_length, version, spec["schema_version"]
+
+
+def scan_block_index(f, data_offset, file_size, columns, version):
+    """Walk the block headers; returns [(offset, rows, payload_length, min_ts, max_ts, zones)]"""
+    zone_names = zone_columns(columns) if version >= 2 else []
+    zone_size = ZONE_ENTRY.size * len(zone_names)
+    
+    index = []
+    offset = data_offset
+    while offset + BLOCK_HEADER.size + zone_size <= file_size:
+        f.seek(offset)
+        head = f.read(BLOCK_HEADER.size + zone_size)
+        magic, rows, payload_length, min_ts, max_ts = BLOCK_HEADER.unpack_from(head)
+        end = offset + BLOCK_HEADER.size + payload_length
+        if magic != BLOCK_MAGIC or end > file_size:
+            break  # partially written trailing block
+        
+        zones = None
+        if zone_names:
+            zones = {
+                name: ZONE_ENTRY.unpack_from(head, BLOCK_HEADER.size + position * ZONE_ENTRY.size)
+                for position, name in enumerate(zone_names)
+            }
+        index.append((offset, rows, payload_length, min_ts, max_ts, zones))
+        offset = end
+    return index
+
+
+class GorillaSegmentWriter:
+    """Buffers samples and appends them to a segment file one compressed block at a time"""
+    
+    def __init__(self, path, block_rows=DEFAULT_BLOCK_ROWS):
+        self.path = path
+        self.block_rows = block_rows
+        self.pending_rows = []
+        self.lock = threading.Lock()
+        self.columns = column_kinds()
+        self.version = SEGMENT_VERSION
+        
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            self._open_existing()
+        else:
+            segment_dir = os.path.dirname(self.path)
+            if segment_dir and not os.path.exists(segment_dir):
+                os.makedirs(segment_dir)
+            spec = json.dumps({"schema_version": SCHEMA_VERSION, "columns": self.columns}).encode('utf-8')
+            with open(self.path, 'wb') as f:
+                f.write(FILE_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION, len(spec)))
+                f.write(spec)
+    
+    def _open_existing(self):
+        """Adopt an existing file's columns and version and drop any partially written block"""
+        with open(self.path, 'r+b') as f:
+            self.columns, data_offset, self.version, _ = read_columns_spec(f)
+            file_size = os.fstat(f.fileno()).st_size
+            index = scan_block_index(f, data_offset, file_size, self.columns, self.version)
+            end = index[-1][0] + BLOCK_HEADER.size + index[-1][2] if index else data_offset
+            if end < file_size:
+                print(f"⚠️  Dropping {file_size - end} bytes of incomplete block data from {self.path}")
+                f.truncate(end)
+    
+    def add_sample(self, row):
+        """Queue a flattened sample; a block is written once enough rows are queued"""
+        with self.lock:
+            self.pending_rows.append(row)
+            if len(self.pending_rows) < self.block_rows:
+                return
+        self.flush()
+    
+    def insert_samples(self, rows):
+        """Append many samples, writing full blocks as they fill up"""
+        for row in rows:
+            self.add_sample(row)
+        self.flush()
+    
+    def flush(self):
+        """Write queued samples as a (possibly short) block"""
+        with self.lock:
+            if not self.pending_rows:
+                return
+            rows = sorted(self.pending_rows, key=lambda row: to_epoch_ns(row.get('timestamp')))
+            self.pending_rows = []
+            block = encode_block(self.columns, rows, self.version)
+            with open(self.path, 'ab') as f:
+                f.write(block)
+    
+    def close(self):
+        """Flush pending samples"""
+        self.flush()
+
+
+class GorillaSegmentReader:
+    """Block index, zone-map pruning and streaming NumPy decoder for a segment file"""
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.columns, data_offset, self.version, self.schema_version = read_columns_spec(f)
+            self.index = scan_block_index(f, data_offset, os.fstat(f.fileno()).st_size, self.columns, self.version)
+        self.zone_size = ZONE_ENTRY.size * len(zone_columns(self.columns)) if self.version >= 2 else 0
+        self.last_scan = {"blocks_read": 0, "blocks_total": len(self.index)}
+    
+    def row_count(self):
+        """Total samples across complete blocks"""
+        return sum(entry[1] for entry in self.index)
+    
+    def blocks_for(self, start=None, end=None):
+        """Index entries of blocks whose time range overlaps [start, end]"""
+        start_ns = to_epoch_ns(start) if start is not None else None
+        end_ns = to_epoch_ns(end) if end is not None else None
+        return [
+            entry for entry in self.index
+            if (start_ns is None or entry[4] >= start_ns) and (end_ns is None or entry[3] <= end_ns)
+        ]
+    
+    def read_arrays(self, start=None, end=None, columns=None, where=None):
+        """Decode the blocks that can match straight into one preallocated array per column"""
+        import numpy as np
+        
+        predicates = normalise_predicates(where)
+        needed = None if columns is None else set(columns) | {column for column, _, _ in predicates}
+        wanted = [(name, kind) for name, kind in self.columns if needed is None or name in needed or name == 'timestamp']
+        
+        # Skip blocks whose time range or zone map rules out every row
+        blocks = [
+            entry for entry in self.blocks_for(start, end)
+            if block_may_match(entry[3], entry[4], entry[5], predicates)
+        ]
+        self.last_scan = {"blocks_read": len(blocks), "blocks_total": len(self.index)}
+        total = sum(entry[1] for entry in blocks)
+        
+        arrays = {}
+        for name, kind in wanted:
+            if kind == 'timestamp':
+                arrays[name] = np.empty(total, dtype='int64')
+            elif kind == 'text':
+                arrays[name] = np.empty(total, dtype=object)
+            else:
+                arrays[name] = np.empty(total, dtype='uint64')
+        
+        position = 0
+        with open(self.path, 'rb') as f:
+            for offset, rows, payload_length, _, _, _ in blocks:
+                f.seek(offset + BLOCK_HEADER.size)
+                payload = f.read(payload_length)
+                cursor = self.zone_size
+                for name, kind in self.columns:
+                    (length,) = COLUMN_LENGTH.unpack_from(payload, cursor)
+                    cursor += COLUMN_LENGTH.size
+                    if name in arrays:
+                        data = payload[cursor:cursor + length]
+                        if kind == 'timestamp':
+                            decode_timestamps(data, rows, arrays[name], position)
+                        elif kind == 'text':
+                            decode_text(data, rows, arrays[name], position)
+                        else:
+                            decode_floats(data, rows, arrays[name], position)
+                    cursor += length
+                position += rows
+        
+        for name, kind in wanted:
+            if kind == 'float':
+                arrays[name] = arrays[name].view('float64')
+        
+        # Blocks are only bounded by their summaries, so filter the decoded rows
+        if blocks and (start is not None or end is not None or predicates):
+            keep = row_mask(arrays, predicates, total)
+            if start is not None:
+                keep &= arrays['timestamp'] >= to_epoch_ns(start)
+            if end is not None:
+                keep &= arrays['timestamp'] <= to_epoch_ns(end)
+            if not keep.all():
+                arrays = {name: values[keep] for name, values in arrays.items()}
+        
+        if columns is not None:
+            arrays = {name: values for name, values in arrays.items() if name in columns or name == 'timestamp'}
+        return arrays
+    
+    def read_frame(self, start=None, end=None, columns=None, where=None):
+        """Samples as a DataFrame shaped like the combined CSV (epoch-ns timestamps)"""
+        import pandas as pd
+        
+        arrays = self.read_arrays(start, end, columns, where)
+        frame = pd.DataFrame({name: arrays[name] for name, _ in self.columns if name in arrays})
+        
+        # Restore integer and boolean columns that were widened to floats
+        sql_types = dict(SAMPLE_COLUMNS)
+        for name in frame.columns:
+            if name in BOOLEAN_COLUMNS:
+                frame[name] = frame[name].fillna(0).astype(bool)
+            elif sql_types.get(name) == 'INTEGER' and name != 'timestamp' and not frame[name].isna().any():
+                frame[name] = frame[name].astype('int64')
+        return frame.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def read_segment_frame(path, start=None, end=None, columns=None, where=None):
+    """Convenience wrapper: load a segment file (optionally filtered) as a DataFrame"""
+    return GorillaSegmentReader(path).read_frame(start, end, columns, where)
+
+
+def query_segments(data_dir, where=None, computers=None, start=None, end=None, columns=None):
+    """Matching rows from every computer's segment file, reading only blocks that can match"""
+    import pandas as pd
+    
+    frames = []
+    blocks_read = blocks_total = 0
+    for filename in sorted(os.listdir(data_dir)):
+        match = SEGMENT_FILE_PATTERN.match(filename)
+        if not match or (computers is not None and match.group('computer_id') not in computers):
+            continue
+        reader = GorillaSegmentReader(os.path.join(data_dir, filename))
+        frame = reader.read_frame(start, end, columns, where)
+        blocks_read += reader.last_scan["blocks_read"]
+        blocks_total += reader.last_scan["blocks_total"]
+        if len(frame) > 0:
+            if 'computer_id' not in frame.columns:
+                frame['computer_id'] = match.group('computer_id')
+            frames.append(frame)
+    
+    print(f"🔎 Decoded {blocks_read} of {blocks_total} blocks")
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True).sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def convert_csv(csv_path, segment_path, block_rows=DEFAULT_BLOCK_ROWS):
+    """Write every row of a combined history CSV into a new segment file"""
+    from timestamps import epoch_ns_series
+    
+    df = read_history_csv(csv_path, categories=False)
+    df['timestamp'] = epoch_ns_series(df['timestamp'])
+    df = df.dropna(subset=['timestamp']).sort_values('timestamp', kind='stable')
+    df['timestamp'] = df['timestamp'].astype('int64')
+    df = df.astype(object).where(df.notna(), None)
+    
+    if os.path.exists(segment_path):
+        os.remove(segment_path)
+    writer = GorillaSegmentWriter(segment_path, block_rows)
+    writer.insert_samples(df.to_dict('records'))
+    return len(df)
+
+
+def main():
+    """Command line entry point: convert CSV history to segments, or query segments"""
+    from file_catalog import HistoryFileCatalog
+    
+    command = sys.argv[1] if len(sys.argv) > 1 else "convert"
+    
+    if command == "query" and len(sys.argv) > 2:
+        data_dir = sys.argv[3] if len(sys.argv) > 3 else "data"
+        matches = query_segments(data_dir, sys.argv[2])
+        if len(matches) == 0:
+            print(f"✅ No samples match {sys.argv[2]}")
+            return
+        for computer_id, rows in matches.groupby('computer_id'):
+            print(f"🖥️  {computer_id}: {len(rows)} samples, "
+                  f"{to_iso(int(rows['timestamp'].iloc[0]))} → {to_iso(int(rows['timestamp'].iloc[-1]))}")
+        return
+    
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else "data"
+    if command != "convert":
+        print("Usage: python gorilla_store.py convert [data_dir]")
+        print("       python gorilla_store.py query <predicate> [data_dir]")
+        return
+    
+    for computer_id, paths in HistoryFileCatalog(data_dir).scan().items():
+        for csv_path in paths:
+            segment_path = os.path.join(data_dir, segment_filename(computer_id))
+            rows = convert_csv(csv_path, segment_path)
+            csv_size = os.path.getsize(csv_path)
+            segment_size = os.path.getsize(segment_path)
+            ratio = csv_size / segment_size if segment_size else 0
+            print(f"✅ {computer_id}: {rows} rows, {csv_size:,} → {segment_size:,} bytes ({ratio:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
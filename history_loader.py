@@ -0,0 +1,368 @@
+# history_loader.py
+"""
+Tail-aware incremental loader for the append-only history CSV files.
+
+Each file's parsed frame is cached together with the byte offset of the last
+complete line that was parsed, the file size and mtime. On the next load only
+the bytes appended since then are parsed and added to the cached frame, so
+refreshing charts for a long-running host costs work proportional to the new
+rows. Truncation or a rewrite of the already-parsed region (the portable
+monitor rewrites its CSV on every save) is detected and triggers a full reload.
+
+Many uncached files (a large fleet archive) can be parsed in parallel with
+load_many(), which spreads the first full parse over a process or thread pool
+and seeds the cache with the results. history_frames() walks stored history of
+any format (SQLite, segments, memmap or CSV) one file or computer at a time.
+"""
+
+import os
+import time
+from timestamps import to_epoch_ns, epoch_ns_series
+from data_schema import split_preamble, parse_csv_bytes, read_history_csv
+
+# Bytes just before the parsed offset that must be unchanged for a tail read
+FINGERPRINT_BYTES = 64
+
+
+def normalise_chunk(df):
+    """Convert a freshly parsed chunk's timestamps to epoch nanoseconds"""
+    if 'timestamp' in df.columns and len(df) > 0:
+        df['timestamp'] = epoch_ns_series(df['timestamp'])
+        df = df.dropna(subset=['timestamp'])
+    return df
+
+
+def parse_whole_file(path, transform=normalise_chunk):
+    """Parse every complete line of a CSV and return a fresh cache entry
+    
+    Module-level so it can run in a worker process.
+    """
+    import pandas as pd
+    
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    # Only parse complete lines; a partially written row is picked up next time.
+    # A legacy schema version line (if any) is treated as part of the header.
+    start, _ = split_preamble(data)
+    end = data.rfind(b'\n') + 1
+    header_end = data.find(b'\n', start) + 1
+    
+    if header_end == 0 or end <= start:
+        frame = pd.DataFrame()
+        columns = []
+        end = 0
+        header_bytes = b''
+    else:
+        frame = parse_csv_bytes(data[start:end], categories=False)
+        columns = list(frame.columns)
+        header_bytes = data[:header_end]
+        if transform is not None:
+            frame = transform(frame)
+    
+    return {
+        'offset': end,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'columns': columns,
+        'header_bytes': header_bytes,
+        'fingerprint': data[max(0, end - FINGERPRINT_BYTES):end],
+        'frame': frame
+    }
+
+
+class IncrementalCSVLoader:
+    """Per-file cache of parsed history that only parses newly appended bytes"""
+    
+    def __init__(self, transform=normalise_chunk):
+        self.transform = transform
+        self.files = {}
+    
+    def load(self, path):
+        """Return the parsed frame for a CSV file, parsing only what changed"""
+        stat = os.stat(path)
+        state = self.files.get(path)
+        
+        if state is not None and stat.st_size == state['size'] and stat.st_mtime_ns == state['mtime_ns']:
+            return state['frame']
+        
+        if state is None or self._was_rewritten(path, state, stat):
+            return self._full_load(path, stat)
+        
+        return self._append_tail(path, state, stat)
+    
+    def load_many(self, paths, workers=None, executor="process", progress=True):
+        """Load several files, parsing uncached ones in parallel; returns {path: frame or exception}
+        
+        `executor` is "process" (default, sidesteps the GIL) or "thread" (cheaper
+        start-up; useful when the CSV parser releases the GIL). `workers`
+        defaults to the CPU count; 1 parses serially in this process.
+        """
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+        
+        results = {}
+        uncached = [path for path in paths if path not in self.files]
+        
+        # Cached files only need a cheap tail read
+        for path in paths:
+            if path in self.files:
+                try:
+                    results[path] = self.load(path)
+                except Exception as e:
+                    results[path] = e
+        
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(uncached))
+        
+        started = time.perf_counter()
+        if workers <= 1:
+            for done, path in enumerate(uncached, 1):
+                try:
+                    results[path] = self._full_load(path, os.stat(path))
+                except Exception as e:
+                    results[path] = e
+                self._report_progress(done, len(uncached), started, progress)
+        else:
+            pool_class = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+            with pool_class(max_workers=workers) as pool:
+                futures = {pool.submit(parse_whole_file, path, self.transform): path for path in uncached}
+                for done, future in enumerate(as_completed(futures), 1):
+                    path = futures[future]
+                    try:
+                        state = future.result()
+                        self.files[path] = state
+                        results[path] = state['frame']
+                    except Exception as e:
+                        results[path] = e
+                    self._report_progress(done, len(uncached), started, progress)
+        
+        return {path: results[path] for path in paths}
+    
+    def _report_progress(self, done, total, started, progress):
+        """Print parse progress roughly every 10% (and at the end)"""
+        if not progress or total < 10:
+            return
+        step = max(1, total // 10)
+        if done % step == 0 or done == total:
+            elapsed = time.perf_counter() - started
+            print(f"📥 Parsed {done}/{total} files ({done * 100 // total}%, {done / elapsed:.0f} files/s)")
+    
+    def forget(self, path=None):
+        """Drop the cache for one file (or all files)"""
+        if path is None:
+            self.files = {}
+        else:
+            self.files.pop(path, None)
+    
+    def _was_rewritten(self, path, state, stat):
+        """Detect truncation or changes to bytes that were already parsed"""
+        if stat.st_size < state['offset']:
+            return True
+        
+        with open(path, 'rb') as f:
+            header = f.read(len(state['header_bytes']))
+            if header != state['header_bytes']:
+                return True
+            
+            fingerprint_start = max(0, state['offset'] - FINGERPRINT_BYTES)
+            f.seek(fingerprint_start)
+            if f.read(state['offset'] - fingerprint_start) != state['fingerprint']:
+                return True
+        
+        return False
+    
+    def _full_load(self, path, stat):
+        """Parse the whole file and reset its cache entry"""
+        self.files[path] = parse_whole_file(path, self.transform)
+        return self.files[path]['frame']
+    
+    def _append_tail(self, path, state, stat):
+        """Parse only the complete lines appended after the cached offset"""
+        import pandas as pd
+        
+        if not state['columns']:
+            return self._full_load(path, stat)
+        
+        with open(path, 'rb') as f:
+            f.seek(state['offset'])
+            tail = f.read()
+        
+        end = tail.rfind(b'\n') + 1
+        if end > 0:
+            chunk = parse_csv_bytes(tail[:end], names=state['columns'], categories=False)
+            if self.transform is not None:
+                chunk = self.transform(chunk)
+            if len(chunk) > 0:
+                state['frame'] = pd.concat([state['frame'], chunk], ignore_index=True)
+            
+            parsed_bytes = state['fingerprint'] + tail[:end]
+            state['offset'] += end
+            state['fingerprint'] = parsed_bytes[-FINGERPRINT_BYTES:]
+        
+        state['size'] = stat.st_size
+        state['mtime_ns'] = stat.st_mtime_ns
+        return state['frame']
+
+
+def concat_unique(frames, keys=('computer_id', 'timestamp')):
+    """Concatenate frames, dropping rows whose (computer_id, timestamp) was already seen
+    
+    Each row's key columns are hashed to a uint64 and all hashes are checked
+    for duplicates in one pass, so overlapping files do not double-count and
+    merging hundreds of files stays linear in the row count.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    frames = [frame for frame in frames if len(frame) > 0]
+    if not frames:
+        return pd.DataFrame()
+    
+    hashes = []
+    for frame in frames:
+        key_columns = [key for key in keys if key in frame.columns]
+        if key_columns:
+            hashes.append(pd.util.hash_pandas_object(frame[key_columns], index=False).to_numpy())
+        else:
+            hashes.append(None)
+    
+    keyed = [frame_hashes for frame_hashes in hashes if frame_hashes is not None]
+    duplicated = pd.Series(np.concatenate(keyed)).duplicated().to_numpy() if keyed else None
+    
+    unique_frames = []
+    position = 0
+    for frame, frame_hashes in zip(frames, hashes):
+        if frame_hashes is None:
+            unique_frames.append(frame)
+            continue
+        keep = ~duplicated[position:position + len(frame)]
+        position += len(frame)
+        if keep.all():
+            unique_frames.append(frame)
+        elif keep.any():
+            unique_frames.append(frame[keep])
+    
+    return pd.concat(unique_frames, ignore_index=True)
+
+
+def merge_by_timestamp(frames, keys=('computer_id', 'timestamp')):
+    """Deduplicate frames with concat_unique and order the result by timestamp"""
+    merged = concat_unique(frames, keys)
+    if 'timestamp' in merged.columns:
+        merged = merged.sort_values('timestamp', kind='stable').reset_index(drop=True)
+    return merged
+
+
+def _read_file_frame(path, computer=None, start=None, end=None, where=None):
+    """One history file (segment, memmap or CSV) within [start, end], optionally one computer's rows"""
+    from gorilla_store import read_segment_frame
+    from memmap_store import read_memmap_frame
+    from zone_maps import frame_mask
+    
+    if path.endswith('.gts'):
+        # Zone maps skip the blocks that cannot match
+        df = read_segment_frame(path, start, end, where=where)
+    elif path.endswith('.hist'):
+        df = read_memmap_frame(path, start, end, categories=False)
+    else:
+        df = read_history_csv(path, categories=False)
+        if len(df) and (start is not None or end is not None):
+            timestamps = epoch_ns_series(df['timestamp'])
+            keep = timestamps.notna()
+            if start is not None:
+                keep &= timestamps >= to_epoch_ns(start)
+            if end is not None:
+                keep &= timestamps <= to_epoch_ns(end)
+            df = df[keep]
+    if computer is not None and 'computer_id' in df.columns:
+        df = df[df['computer_id'] == computer]
+    if where is not None and len(df) and not path.endswith('.gts'):
+        df = df[frame_mask(df, where)]
+    return df
+
+
+def _without_stored_rows(df, store):
+    """Rows of a CSV frame (epoch-ns timestamps) that the SQLite store does not hold yet"""
+    import pandas as pd
+    
+    keep = pd.Series(True, index=df.index)
+    for computer_id, group in df.groupby('computer_id', sort=False):
+        timestamps = group['timestamp']
+        stored = store.range(computer_id, int(timestamps.min()), int(timestamps.max()), columns=['timestamp'])
+        keep[group.index] = ~timestamps.isin(stored['timestamp'])
+    return df[keep]
+
+
+def history_frames(source="data", computer=None, start=None, end=None, where=None):
+    """Yield stored history one file (or computer) at a time, preferring the fastest store present
+    
+    A computer's store (SQLite, else segments, else memmap) is merged with
+    every CSV file the store does not cover (see backfill.uncovered_files),
+    so history collected before a store was enabled is never hidden.
+    Computers without a store are yielded one CSV file at a time. Files are
+    grouped by the computer in their name, but rows keep the computer_id
+    recorded in them and are only filtered by it when `computer` is given.
+    `where` takes zone_maps predicates such as "disk_percent>90".
+    """
+    from history_store import SQLiteHistoryStore, DEFAULT_DB_NAME
+    from gorilla_store import segment_filename
+    from memmap_store import memmap_filename
+    from file_catalog import HistoryFileCatalog
+    from backfill import uncovered_files
+    from zone_maps import frame_mask
+    
+    if os.path.isfile(source):
+        yield _read_file_frame(source, computer, start, end, where)
+        return
+    
+    catalog = HistoryFileCatalog(source).scan()
+    db_path = os.path.join(source, DEFAULT_DB_NAME)
+    store = SQLiteHistoryStore(db_path, read_only=True) if os.path.exists(db_path) else None
+    try:
+        if computer is not None:
+            computers = [computer]
+        else:
+            computers = sorted(set(catalog) | set(store.computers() if store is not None else []))
+        
+        for computer_id in computers:
+            csv_paths = catalog.get(computer_id, [])
+            frames = []
+            store_format = None
+            if store is not None:
+                # The SQLite store holds every computer, keyed by the computer_id in the rows
+                store_format = "sqlite"
+                df = store.range(computer_id, start, end)
+                if len(df):
+                    frames.append(df[frame_mask(df, where)] if where is not None else df)
+            else:
+                for store_format, store_path in (("segments", segment_filename(computer_id)), ("memmap", memmap_filename(computer_id))):
+                    if os.path.exists(os.path.join(source, store_path)):
+                        frames.append(_read_file_frame(os.path.join(source, store_path), computer, start, end, where))
+                        break
+                else:
+                    store_format = None
+            
+            if store_format is None:
+                for path in csv_paths:
+                    yield _read_file_frame(path, computer, start, end, where)
+                continue
+            
+            for path in uncovered_files(source, store_format, csv_paths):
+                df = _read_file_frame(path, computer, start, end, where)
+                if len(df):
+                    df = df.copy()
+                    df['timestamp'] = epoch_ns_series(df['timestamp'])
+                    df = df.dropna(subset=['timestamp'])
+                    if store_format == "sqlite" and len(df) and 'computer_id' in df.columns:
+                        # The store may already hold these rows under the computer_id recorded in them
+                        df = _without_stored_rows(df, store)
+                    frames.append(df)
+            frames = [frame for frame in frames if len(frame)]
+            if not frames:
+                continue
+            yield frames[0] if len(frames) == 1 else merge_by_timestamp(frames)
+    finally:
+        if store is not None:
+            store.close()
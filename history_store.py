@@ -0,0 +1,199 @@
+# history_store.py
+"""
+Embedded SQLite time-series store for security monitoring samples.
+
+Samples are kept in a single `samples` table indexed on (computer_id, timestamp)
+so per-host time window queries no longer need to scan every CSV file. The
+database runs in WAL mode, which lets the chart renderer and the trainer read
+while the collector is writing. Writes go through one connection guarded by a
+lock; every thread that queries gets its own read connection, so readers never
+share a connection with the writer or with each other. The schema version the database was last
+written with is kept in PRAGMA user_version.
+
+Callers that only query (loaders, export, replay, training) open the store
+with read_only=True: no writer connection, no schema changes, and read
+connections opened in SQLite's read-only mode.
+"""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from timestamps import to_epoch_ns
+from data_schema import SQL_TYPES, BOOLEAN_COLUMNS, SCHEMA_VERSION, apply_schema
+
+# Column name -> SQLite storage type, in the same order as the combined CSV files
+# (timestamps are stored natively as integer epoch nanoseconds)
+SAMPLE_COLUMNS = SQL_TYPES
+
+COLUMN_NAMES = [name for name, _ in SAMPLE_COLUMNS]
+
+DEFAULT_DB_NAME = "history.db"
+
+
+class SQLiteHistoryStore:
+    """SQLite-backed history of monitoring samples with batched inserts and range queries"""
+    
+    def __init__(self, db_path, batch_size=20, read_only=False):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.read_only = read_only
+        self.pending_rows = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.readers = []
+        self.stored_columns = None
+        
+        if read_only:
+            if not os.path.exists(db_path):
+                raise FileNotFoundError(f"History store not found: {db_path}")
+            self.conn = None
+            return
+        
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+        
+        # Writer connection, used only while holding self.lock
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+    
+    def _reader(self):
+        """This thread's read connection, opened on first use"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            # Only this thread queries it; close() may run elsewhere
+            if self.read_only:
+                uri = Path(os.path.abspath(self.db_path)).as_uri() + "?mode=ro"
+                conn = sqlite3.connect(uri, uri=True, timeout=30, check_same_thread=False)
+            else:
+                conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self.local.conn = conn
+            with self.lock:
+                self.readers.append(conn)
+        return conn
+    
+    def _create_schema(self):
+        """Create the samples table and its (computer_id, timestamp) index, adding newer columns"""
+        column_sql = ", ".join(f"{name} {sql_type}" for name, sql_type in SAMPLE_COLUMNS)
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS samples ({column_sql})")
+            self.conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_samples_computer_time "
+                "ON samples (computer_id, timestamp)"
+            )
+            
+            # Databases written with an older schema version get the new columns
+            existing = {row[1] for row in self.conn.execute("PRAGMA table_info(samples)")}
+            for name, sql_type in SAMPLE_COLUMNS:
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE samples ADD COLUMN {name} {sql_type}")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def schema_version(self):
+        """Schema version recorded in the database"""
+        return self._reader().execute("PRAGMA user_version").fetchone()[0]
+    
+    def _row_values(self, row):
+        """Convert a sample dict into a tuple ordered like the samples table"""
+        values = []
+        for name in COLUMN_NAMES:
+            value = row.get(name)
+            if name == 'timestamp':
+                value = to_epoch_ns(value)
+            elif name in BOOLEAN_COLUMNS and value is not None:
+                value = int(str(value).lower() in ('true', '1')) if isinstance(value, str) else int(bool(value))
+            values.append(value)
+        return tuple(values)
+    
+    def add_sample(self, row):
+        """Queue a flat sample row, writing the batch once it is full"""
+        with self.lock:
+            self.pending_rows.append(row)
+            should_flush = len(self.pending_rows) >= self.batch_size
+        
+        if should_flush:
+            self.flush()
+    
+    def flush(self):
+        """Write any queued samples to the database"""
+        with self.lock:
+            rows = self.pending_rows
+            self.pending_rows = []
+        
+        if rows:
+            return self.insert_samples(rows)
+        return 0
+    
+    def insert_samples(self, rows):
+        """Insert many flat sample rows in one transaction, ignoring duplicates"""
+        if self.read_only:
+            raise sqlite3.OperationalError(f"History store opened read-only: {self.db_path}")
+        placeholders = ", ".join("?" for _ in COLUMN_NAMES)
+        sql = f"INSERT OR IGNORE INTO samples ({', '.join(COLUMN_NAMES)}) VALUES ({placeholders})"
+        
+        with self.lock, self.conn:
+            cursor = self.conn.executemany(sql, [self._row_values(row) for row in rows])
+        return cursor.rowcount
+    
+    def computers(self):
+        """List every computer ID stored in the database"""
+        cursor = self._reader().execute("SELECT DISTINCT computer_id FROM samples ORDER BY computer_id")
+        return [row[0] for row in cursor.fetchall()]
+    
+    def range(self, computer=None, start=None, end=None, columns=None):
+        """Return samples for a computer (or all computers) within [start, end] as a DataFrame"""
+        import pandas as pd
+        
+        if columns is None:
+            columns = COLUMN_NAMES
+        else:
+            unknown = [col for col in columns if col not in COLUMN_NAMES]
+            if unknown:
+                raise ValueError(f"Unknown columns requested: {', '.join(unknown)}")
+            # Always return the keys needed to order and identify rows
+            columns = [col for col in ('computer_id', 'timestamp') if col not in columns] + list(columns)
+        
+        conditions = []
+        params = []
+        if computer is not None:
+            conditions.append("computer_id = ?")
+            params.append(computer)
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(self._format_bound(start))
+        if end is not None:
+            conditions.append("timestamp <= ?")
+            params.append(self._format_bound(end))
+        
+        # A database written with an older schema (read-only, so not migrated) lacks newer columns
+        if self.stored_columns is None:
+            self.stored_columns = {row[1] for row in self._reader().execute("PRAGMA table_info(samples)")}
+        selected = [col if col in self.stored_columns else f"NULL AS {col}" for col in columns]
+        sql = f"SELECT {', '.join(selected)} FROM samples"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY computer_id, timestamp"
+        
+        df = pd.read_sql_query(sql, self._reader(), params=params)
+        return apply_schema(df, add_missing=False, categories=False)
+    
+    def _format_bound(self, value):
+        """Normalise a datetime, ISO string or epoch-ns bound to the stored timestamp format"""
+        return to_epoch_ns(value)
+    
+    def close(self):
+        """Flush pending samples and close every connection"""
+        try:
+            self.flush()
+        finally:
+            with self.lock:
+                for conn in self.readers:
+                    conn.close()
+                self.readers = []
+                # Drop every thread's cached reader, so a later query opens a new one
+                self.local = threading.local()
+                if self.conn is not None:
+                    self.conn.close()
@@ -0,0 +1,377 @@
+# live_dashboard.py
+"""
+Live-updating system dashboard fed by the in-process collector.
+
+create_comprehensive_charts rebuilds a 9-axis GridSpec figure and reloads
+every CSV file on each call, which is far too slow to watch a host during an
+incident. Here the figure is built once. Samples arrive from the monitor's
+collection pipeline (process_sample) through a thread-safe queue into
+fixed-size ring buffers; each refresh appends only the new points, hands the
+buffer views to the existing lines with set_data and blits the changed
+lines over a cached background. The axes are only redrawn in full when a
+new point leaves the current limits; the x axis keeps some headroom so that
+happens rarely. Drawing is bounded by the window size, not by how long the
+dashboard has been running.
+
+Sampling runs in a background thread (the GUI must stay in the main thread).
+A stored history can be replayed into the dashboard instead of live data.
+
+Usage:
+    python live_dashboard.py [live] [interval_seconds] [window_points]
+    python live_dashboard.py replay <source> [speed|max] [window_points]
+"""
+
+import sys
+import time
+import queue
+import datetime
+import threading
+from data_schema import flatten_status
+from timestamps import to_epoch_ns
+
+DEFAULT_WINDOW_POINTS = 3600
+DEFAULT_INTERVAL_SECONDS = 1.0
+DEFAULT_POLL_SECONDS = 0.25
+# Part of the window added to the right of the x axis so new points rarely force a full redraw
+X_HEADROOM = 0.1
+MIN_X_HEADROOM_SECONDS = 60
+
+NON_INTERACTIVE_BACKENDS = ('agg', 'pdf', 'ps', 'svg', 'pgf', 'cairo', 'template')
+
+# (title, y label, fixed y limits or None, [(column, color, legend label, scale)])
+LIVE_PANELS = [
+    ('CPU Usage (%)', 'Percentage', (0, 100), [('cpu_percent', '#ff6b6b', None, 1)]),
+    ('Memory Usage (%)', 'Percentage', (0, 100), [('memory_percent', '#4ecdc4', None, 1)]),
+    ('Disk Usage (%)', 'Percentage', (0, 100), [('disk_percent', '#45b7d1', None, 1)]),
+    ('Security Score', 'Score (0-100)', (0, 100), [('security_score', '#96ceb4', None, 1)]),
+    ('Process Count', 'Number of Processes', None, [('process_count', '#feca57', None, 1)]),
+    ('Network Activity', 'MB', None, [('network_sent_mb', '#ff9ff3', 'Sent (MB)', 1),
+                                      ('network_recv_mb', '#54a0ff', 'Received (MB)', 1)]),
+    ('Temperature (°C)', 'Celsius', None, [('temperature', '#ff6348', None, 1)]),
+    ('System Uptime (Days)', 'Days', None, [('uptime_hours', '#a55eea', None, 1 / 24)]),
+    ('Security Issues Count', 'Count', None, [('suspicious_activity_count', '#ff4757', 'Suspicious Activity', 1),
+                                              ('vulnerability_count', '#ff6348', 'Vulnerabilities', 1)])
+]
+
+
+def is_interactive_backend():
+    """True when matplotlib can open a window"""
+    import matplotlib
+    return matplotlib.get_backend().lower() not in NON_INTERACTIVE_BACKENDS
+
+
+def sample_x(timestamp):
+    """Matplotlib date number (local time, like the saved charts) of an epoch-ns timestamp"""
+    import matplotlib.dates as mdates
+    
+    return mdates.date2num(datetime.datetime.fromtimestamp(to_epoch_ns(timestamp) / 1e9))
+
+
+class SampleWindow:
+    """Ring buffers holding the last `window_points` values of each plotted series
+    
+    Appends are amortised O(1): the arrays have twice the window's capacity,
+    and the live part is moved back to the front only when the end is reached.
+    Readers get views, not copies.
+    """
+    
+    def __init__(self, series_count, window_points=DEFAULT_WINDOW_POINTS):
+        import numpy as np
+        
+        self.window_points = window_points
+        self.capacity = 2 * window_points
+        self.x = np.empty(self.capacity)
+        self.values = np.full((series_count, self.capacity), np.nan)
+        self.start = 0
+        self.end = 0
+    
+    def __len__(self):
+        return self.end - self.start
+    
+    def append(self, x, values):
+        """Add one sample: its x and one value per series (None for missing)"""
+        if self.end == self.capacity:
+            live = self.end - self.start
+            self.x[:live] = self.x[self.start:self.end]
+            self.values[:, :live] = self.values[:, self.start:self.end]
+            self.start, self.end = 0, live
+        
+        self.x[self.end] = x
+        self.values[:, self.end] = [float('nan') if value is None else value for value in values]
+        self.end += 1
+        if self.end - self.start > self.window_points:
+            self.start = self.end - self.window_points
+    
+    def x_view(self):
+        return self.x[self.start:self.end]
+    
+    def series_view(self, index):
+        return self.values[index, self.start:self.end]
+
+
+class LiveDashboard:
+    """Dashboard figure built once and updated in place as samples arrive"""
+    
+    def __init__(self, computer_name="", window_points=DEFAULT_WINDOW_POINTS):
+        self.computer_name = computer_name
+        self.series = [series for _, _, _, panel_series in LIVE_PANELS for series in panel_series]
+        self.window = SampleWindow(len(self.series), window_points)
+        self.samples = queue.Queue()
+        
+        self.fig = None
+        self.axes = []
+        self.lines = []
+        self.background = None
+        self.status_text = None
+        
+        self.full_redraws = 0
+        self.blits = 0
+        self.last_update_seconds = 0.0
+    
+    def push(self, record):
+        """Queue a nested status record or flat row; safe to call from any thread"""
+        self.samples.put(flatten_status(record))
+    
+    def subscribe(self, monitor):
+        """Receive every sample the monitor processes, starting with the recent ones that fit the window"""
+        recent = list(monitor.data_log)[-self.window.window_points:]
+        for record in recent:
+            self.push(record)
+        monitor.add_sample_listener(self.push)
+    
+    def unsubscribe(self, monitor):
+        monitor.remove_sample_listener(self.push)
+    
+    def build(self):
+        """Create the figure, axes and (animated) lines once"""
+        import matplotlib.pyplot as plt
+        import matplotlib.dates as mdates
+        from matplotlib.gridspec import GridSpec
+        
+        self.fig = plt.figure(figsize=(20, 12))
+        self.fig.suptitle(f'Live System Dashboard - {self.computer_name}', fontsize=16, fontweight='bold')
+        gs = GridSpec(3, 3, figure=self.fig, hspace=0.4, wspace=0.3)
+        
+        for position, (title, ylabel, ylim, panel_series) in enumerate(LIVE_PANELS):
+            ax = self.fig.add_subplot(gs[position // 3, position % 3])
+            ax.set_title(title, fontweight='bold')
+            ax.set_ylabel(ylabel)
+            ax.grid(True, alpha=0.3)
+            ax.set_ylim(*(ylim or (0, 1)))
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
+            ax.xaxis.set_major_locator(mdates.AutoDateLocator(minticks=3, maxticks=6))
+            for _, color, label, _ in panel_series:
+                # Animated lines are left out of full draws and blitted on top of the background
+                line, = ax.plot([], [], color=color, linewidth=2, label=label, animated=True)
+                self.lines.append((ax, line, ylim))
+            if any(label for _, _, label, _ in panel_series):
+                ax.legend(loc='upper left')
+            self.axes.append((ax, ylim))
+        
+        self.status_text = self.fig.text(0.01, 0.01, 'Waiting for samples...', fontsize=10, animated=True)
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+        return self.fig
+    
+    def _on_draw(self, event):
+        """After a full draw (first show, resize, new limits) cache the background and blit the lines"""
+        canvas = self.fig.canvas
+        if getattr(canvas, 'supports_blit', False):
+            self.background = canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+    
+    def _draw_animated(self):
+        for ax, line, _ in self.lines:
+            ax.draw_artist(line)
+        self.fig.draw_artist(self.status_text)
+    
+    def _limits_exceeded(self, new_rows):
+        """True when one of the newest points falls outside the current axis limits"""
+        import numpy as np
+        
+        x = self.window.x_view()
+        if x[-1] > self.axes[0][0].get_xlim()[1]:
+            return True
+        
+        for index, (ax, _, ylim) in enumerate(self.lines):
+            if ylim is not None:
+                continue
+            values = self.window.series_view(index)[-new_rows:]
+            values = values[~np.isnan(values)]
+            low, high = ax.get_ylim()
+            if len(values) and (values.min() < low or values.max() > high):
+                return True
+        return False
+    
+    def _relimit(self):
+        """Fit the axes to the window (with headroom on the right of the time axis)"""
+        import numpy as np
+        
+        x = self.window.x_view()
+        span = x[-1] - x[0] if len(x) > 1 else 0
+        headroom = max(span * X_HEADROOM, MIN_X_HEADROOM_SECONDS / 86400)
+        
+        panel_values = {}
+        for index, (ax, _, ylim) in enumerate(self.lines):
+            if ylim is None:
+                values = self.window.series_view(index)
+                panel_values.setdefault(ax, []).append(values[~np.isnan(values)])
+        
+        for ax, _ in self.axes:
+            ax.set_xlim(x[0], x[-1] + headroom)
+            values = np.concatenate(panel_values.get(ax, [np.empty(0)]))
+            if len(values):
+                low, high = values.min(), values.max()
+                margin = max((high - low) * 0.1, abs(high) * 0.05, 1e-3)
+                ax.set_ylim(low - margin, high + margin)
+    
+    def refresh(self):
+        """Append queued samples and redraw; returns the number of new samples"""
+        started = time.perf_counter()
+        new_rows = 0
+        last_timestamp = None
+        while True:
+            try:
+                row = self.samples.get_nowait()
+            except queue.Empty:
+                break
+            if row.get('timestamp') is None:
+                continue
+            self.window.append(sample_x(row['timestamp']), [
+                None if row.get(column) is None else float(row[column]) * scale
+                for column, _, _, scale in self.series
+            ])
+            new_rows += 1
+            last_timestamp = row['timestamp']
+        
+        if not new_rows or self.fig is None:
+            return new_rows
+        
+        x = self.window.x_view()
+        for index, (_, line, _) in enumerate(self.lines):
+            line.set_data(x, self.window.series_view(index))
+        self.status_text.set_text(
+            f"Last sample {datetime.datetime.fromtimestamp(to_epoch_ns(last_timestamp) / 1e9):%Y-%m-%d %H:%M:%S} | {len(self.window)} points in window | "
+            f"last update {self.last_update_seconds * 1000:.1f} ms"
+        )
+        
+        canvas = self.fig.canvas
+        if self.background is None or self._limits_exceeded(min(new_rows, len(x))):
+            # New limits invalidate the cached background: full draw (which re-caches it via _on_draw)
+            self._relimit()
+            canvas.draw()
+            self.full_redraws += 1
+        else:
+            canvas.restore_region(self.background)
+            self._draw_animated()
+            canvas.blit(self.fig.bbox)
+            self.blits += 1
+        canvas.flush_events()
+        
+        self.last_update_seconds = time.perf_counter() - started
+        return new_rows
+    
+    def run(self, poll_seconds=DEFAULT_POLL_SECONDS):
+        """Show the window and refresh it until it is closed"""
+        import matplotlib.pyplot as plt
+        
+        if self.fig is None:
+            self.build()
+        plt.show(block=False)
+        self.fig.canvas.draw()
+        
+        try:
+            while plt.fignum_exists(self.fig.number):
+                self.refresh()
+                # Process GUI events without redrawing the (stale) figure, unlike plt.pause
+                self.fig.canvas.start_event_loop(poll_seconds)
+        except KeyboardInterrupt:
+            print("\n⏹️  Live dashboard stopped by user")
+        finally:
+            plt.close(self.fig)
+
+
+class LiveCollector(threading.Thread):
+    """Background thread that samples the system and runs each sample through the monitor's pipeline"""
+    
+    def __init__(self, monitor, interval_seconds=DEFAULT_INTERVAL_SECONDS):
+        super().__init__(daemon=True)
+        self.monitor = monitor
+        self.interval_seconds = interval_seconds
+        self.stopped = threading.Event()
+    
+    def run(self):
+        while not self.stopped.is_set():
+            started = time.perf_counter()
+            try:
+                self.monitor.process_sample(self.monitor.get_current_status(), display=False)
+            except Exception as e:
+                print(f"⚠️  Live sample failed: {e}")
+            self.stopped.wait(max(0.0, self.interval_seconds - (time.perf_counter() - started)))
+    
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_live_dashboard(monitor, interval_seconds=DEFAULT_INTERVAL_SECONDS, window_points=DEFAULT_WINDOW_POINTS):
+    """Collect samples in the background and show them on a live dashboard until the window closes"""
+    if not is_interactive_backend():
+        print("❌ The live dashboard needs an interactive matplotlib backend (e.g. TkAgg or QtAgg)")
+        return None
+    
+    dashboard = LiveDashboard(monitor.computer_name, window_points)
+    dashboard.subscribe(monitor)
+    collector = LiveCollector(monitor, interval_seconds)
+    
+    print(f"📺 Live dashboard for {monitor.computer_name}: sampling every {interval_seconds:g}s, "
+          f"showing the last {window_points} samples. Close the window to stop.")
+    collector.start()
+    try:
+        dashboard.run()
+    finally:
+        collector.stop()
+        dashboard.unsubscribe(monitor)
+        monitor.flush_stores()
+    
+    print(f"✅ Live dashboard closed: {dashboard.blits} blitted updates, {dashboard.full_redraws} full redraws")
+    return dashboard
+
+
+def replay_live_dashboard(source, speed="max", window_points=DEFAULT_WINDOW_POINTS):
+    """Replay stored history into the live dashboard (through a scratch monitor, see replay.py)"""
+    from replay import replay
+    
+    if not is_interactive_backend():
+        print("❌ The live dashboard needs an interactive matplotlib backend (e.g. TkAgg or QtAgg)")
+        return None
+    
+    dashboard = LiveDashboard(source, window_points)
+    worker = threading.Thread(target=replay, kwargs={"source": source, "speed": speed, "listeners": [dashboard.push]}, daemon=True)
+    worker.start()
+    dashboard.run()
+    return dashboard
+
+
+def main():
+    """Command line entry point: live dashboard of this computer, or of a replayed history"""
+    args = sys.argv[1:]
+    command = args.pop(0) if args and args[0] in ('live', 'replay') else 'live'
+    
+    if command == 'replay':
+        if not args:
+            print("Usage: python live_dashboard.py replay <source> [speed|max] [window_points]")
+            return
+        speed = args[1] if len(args) > 1 else "max"
+        window_points = int(args[2]) if len(args) > 2 else DEFAULT_WINDOW_POINTS
+        replay_live_dashboard(args[0], speed, window_points)
+        return
+    
+    from colector import SecurityEnhancedSystemMonitor
+    
+    interval_seconds = float(args[0]) if len(args) > 0 else DEFAULT_INTERVAL_SECONDS
+    window_points = int(args[1]) if len(args) > 1 else DEFAULT_WINDOW_POINTS
+    run_live_dashboard(SecurityEnhancedSystemMonitor(), interval_seconds, window_points)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+# memmap_store.py
+"""
+Fixed-width binary history files that are read through numpy.memmap.
+
+Each file holds one computer's samples as packed little-endian records after
+a fixed-size JSON header. Readers map the file read-only, so column access is
+a strided view into the page cache rather than a private heap copy: a chart
+renderer and a trainer reading the same history share the same physical
+pages. Time windows are located with a binary search on the timestamp column,
+so only the pages of the requested slice are touched.
+
+Text columns (computer name/ID, OS) are stored as uint16 codes into
+dictionaries kept in the header; the header is padded to HEADER_SIZE so new
+dictionary entries are written in place without moving the records.
+
+Convert the existing CSV history with:
+    python memmap_store.py convert [data_dir]
+"""
+
+import os
+import sys
+import json
+import threading
+from history_store import SAMPLE_COLUMNS, BOOLEAN_COLUMNS
+from timestamps import to_epoch_ns
+from data_schema import SCHEMA_VERSION, read_history_csv
+
+MEMMAP_MAGIC = b"MMH1"
+MEMMAP_VERSION = 1
+HEADER_SIZE = 4096
+
+
+def memmap_filename(computer_id):
+    """Name of a computer's memory-mappable history file"""
+    return f"system_security_{computer_id}_combined.hist"
+
+
+def record_fields():
+    """Record layout as (name, numpy dtype) pairs, in SAMPLE_COLUMNS order"""
+    fields = []
+    for name, sql_type in SAMPLE_COLUMNS:
+        if name == 'timestamp':
+            fields.append((name, '<i8'))
+        elif sql_type == 'TEXT':
+            fields.append((name, '<u2'))
+        elif name in BOOLEAN_COLUMNS:
+            fields.append((name, '|b1'))
+        else:
+            fields.append((name, '<f8'))
+    return fields
+
+
+def _read_header(f):
+    """Read and validate the JSON header at the start of a history file"""
+    raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE or raw[:len(MEMMAP_MAGIC)] != MEMMAP_MAGIC:
+        raise ValueError("Not a memory-mapped history file")
+    header = json.loads(raw[len(MEMMAP_MAGIC):].rstrip(b' \x00').decode('utf-8'))
+    if header.get("version") != MEMMAP_VERSION:
+        raise ValueError(f"Unsupported history file version: {header.get('version')}")
+    return header
+
+
+def _write_header(f, header):
+    """Write the header in place, padded to HEADER_SIZE"""
+    raw = MEMMAP_MAGIC + json.dumps(header).encode('utf-8')
+    if len(raw) > HEADER_SIZE:
+        raise ValueError("History file header is full (too many distinct text values)")
+    f.seek(0)
+    f.write(raw + b' ' * (HEADER_SIZE - len(raw)))
+
+
+class MemmapHistoryWriter:
+    """Appends samples as fixed-width records to a memory-mappable history file"""
+    
+    def __init__(self, path, batch_size=20):
+        import numpy as np
+        
+        self.path = path
+        self.batch_size = batch_size
+        self.pending_rows = []
+        self.lock = threading.Lock()
+        
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            with open(path, 'r+b') as f:
+                self.header = _read_header(f)
+                self.dtype = np.dtype([tuple(field) for field in self.header["fields"]])
+                self._drop_partial_record(f)
+        else:
+            history_dir = os.path.dirname(path)
+            if history_dir and not os.path.exists(history_dir):
+                os.makedirs(history_dir)
+            self.header = {
+                "version": MEMMAP_VERSION,
+                "schema_version": SCHEMA_VERSION,
+                "fields": record_fields(),
+                "dictionaries": {},
+                "sorted": True,
+                "last_timestamp": None
+            }
+            self.dtype = np.dtype([tuple(field) for field in self.header["fields"]])
+            with open(path, 'wb') as f:
+                _write_header(f, self.header)
+    
+    def _drop_partial_record(self, f):
+        """Truncate a record left half-written by an interrupted append"""
+        size = os.fstat(f.fileno()).st_size
+        extra = (size - HEADER_SIZE) % self.dtype.itemsize
+        if extra:
+            print(f"⚠️  Dropping {extra} bytes of incomplete record data from {self.path}")
+            f.truncate(size - extra)
+    
+    def _code(self, name, value):
+        """Dictionary code for a text value, adding it to the header if new"""
+        values = self.header["dictionaries"].setdefault(name, [])
+        text = None if value is None else str(value)
+        if text not in values:
+            values.append(text)
+        return values.index(text)
+    
+    def _record(self, row):
+        """Convert a flattened sample into a record tuple"""
+        values = []
+        for name, _ in self.header["fields"]:
+            value = row.get(name)
+            if name == 'timestamp':
+                values.append(to_epoch_ns(value))
+            elif self.dtype[name].kind == 'u':
+                values.append(self._code(name, value))
+            elif self.dtype[name].kind == 'b':
+                values.append(value in (True, 1, 'True', 'true'))
+            elif value is None or value == '':
+                values.append(float('nan'))
+            else:
+                values.append(float(value))
+        return tuple(values)
+    
+    def add_sample(self, row):
+        """Queue a flattened sample; records are appended in batches"""
+        with self.lock:
+            self.pending_rows.append(row)
+            if len(self.pending_rows) < self.batch_size:
+                return
+        self.flush()
+    
+    def insert_samples(self, rows):
+        """Append many samples at once"""
+        with self.lock:
+            self.pending_rows.extend(rows)
+        self.flush()
+    
+    def flush(self):
+        """Append queued samples as records (and update the header if needed)"""
+        import numpy as np
+        
+        with self.lock:
+            if not self.pending_rows:
+                return
+            records = np.array([self._record(row) for row in self.pending_rows], dtype=self.dtype)
+            records.sort(order='timestamp', kind='stable')
+            self.pending_rows = []
+            
+            # Binary searches need ascending timestamps; remember if that stops holding
+            first, last = int(records['timestamp'][0]), int(records['timestamp'][-1])
+            if self.header["last_timestamp"] is not None and first < self.header["last_timestamp"] and self.header["sorted"]:
+                self.header["sorted"] = False
+            self.header["last_timestamp"] = max(last, self.header["last_timestamp"] or last)
+            
+            with open(self.path, 'r+b') as f:
+                f.seek(0, os.SEEK_END)
+                f.write(records.tobytes())
+                _write_header(f, self.header)
+    
+    def close(self):
+        """Flush pending samples"""
+        self.flush()
+
+
+class MemmapHistoryReader:
+    """Read-only memory map of a history file with zero-copy column views"""
+    
+    def __init__(self, path):
+        import numpy as np
+        
+        self.path = path
+        with open(path, 'rb') as f:
+            self.header = _read_header(f)
+        self.dtype = np.dtype([tuple(field) for field in self.header["fields"]])
+        
+        rows = (os.path.getsize(path) - HEADER_SIZE) // self.dtype.itemsize
+        if rows > 0:
+            self.records = np.memmap(path, dtype=self.dtype, mode='r', offset=HEADER_SIZE, shape=(rows,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def time_slice(self, start=None, end=None):
+        """Records within [start, end] as a view (binary search when timestamps are sorted)"""
+        import numpy as np
+        
+        if start is None and end is None:
+            return self.records
+        
+        timestamps = self.records['timestamp']
+        if self.header.get("sorted", True):
+            low = 0 if start is None else int(np.searchsorted(timestamps, to_epoch_ns(start), side='left'))
+            high = len(timestamps) if end is None else int(np.searchsorted(timestamps, to_epoch_ns(end), side='right'))
+            return self.records[low:high]
+        
+        keep = np.ones(len(timestamps), dtype=bool)
+        if start is not None:
+            keep &= timestamps >= to_epoch_ns(start)
+        if end is not None:
+            keep &= timestamps <= to_epoch_ns(end)
+        return self.records[keep]
+    
+    def column(self, name, start=None, end=None):
+        """One column of the window as a strided view into the mapped file"""
+        return self.time_slice(start, end)[name]
+    
+    def _dictionary(self, name, codes):
+        """Text values of a column, re-reading the header if `codes` use newer entries"""
+        values = self.header["dictionaries"].get(name, [])
+        if len(codes) and int(codes.max()) >= len(values):
+            # A writer added values after this reader opened the file
+            with open(self.path, 'rb') as f:
+                self.header = _read_header(f)
+            values = self.header["dictionaries"].get(name, [])
+        return values
+    
+    def decode_text(self, name, codes):
+        """Map dictionary codes back to strings"""
+        import numpy as np
+        
+        values = self._dictionary(name, codes)
+        return np.asarray(values, dtype=object)[codes] if len(codes) else np.empty(0, dtype=object)
+    
+    def numeric_views(self, start=None, end=None, columns=None):
+        """{name: view} of the window's timestamp, numeric and boolean columns, without copying"""
+        window = self.time_slice(start, end)
+        return {name: window[name] for name, _ in self.header["fields"]
+                if self.dtype[name].kind != 'u' and (columns is None or name in columns or name == 'timestamp')}
+    
+    def text_column(self, name, codes, categories=True):
+        """Text column from its dictionary codes: a Categorical over the codes, or decoded strings"""
+        import numpy as np
+        import pandas as pd
+        
+        if not categories:
+            return self.decode_text(name, codes)
+        values = self._dictionary(name, codes)
+        # Missing text (None) becomes code -1; the other codes shift down past it
+        lookup = np.arange(len(values), dtype='int32')
+        if None in values:
+            missing = values.index(None)
+            lookup[missing] = -1
+            lookup[missing + 1:] -= 1
+        return pd.Categorical.from_codes(lookup[codes], categories=[value for value in values if value is not None])
+    
+    def read_frame(self, start=None, end=None, columns=None, categories=True):
+        """Window of samples as a DataFrame shaped like the combined CSV (epoch-ns timestamps)
+        
+        Timestamp, numeric and boolean columns are views into the mapped file
+        (INTEGER columns stay float64 rather than being copied to int64). Text
+        columns are built from their dictionary codes, as Categoricals unless
+        `categories` is False, so the strings are not materialised per row.
+        """
+        import pandas as pd
+        
+        window = self.time_slice(start, end)
+        frame = pd.DataFrame(self.numeric_views(start, end, columns), copy=False)
+        for position, (name, _) in enumerate(self.header["fields"]):
+            if self.dtype[name].kind == 'u' and (columns is None or name in columns):
+                frame.insert(min(position, len(frame.columns)), name, self.text_column(name, window[name], categories))
+        if not self.header.get("sorted", True):
+            frame = frame.sort_values('timestamp', kind='stable').reset_index(drop=True)
+        return frame
+
+
+def read_memmap_frame(path, start=None, end=None, columns=None, categories=True):
+    """Convenience wrapper: load a memory-mapped history file (optionally a window) as a DataFrame"""
+    return MemmapHistoryReader(path).read_frame(start, end, columns, categories)
+
+
+def convert_csv(csv_path, history_path):
+    """Write every row of a combined history CSV into a new memory-mapped history file"""
+    from timestamps import epoch_ns_series
+    
+    df = read_history_csv(csv_path, categories=False)
+    df['timestamp'] = epoch_ns_series(df['timestamp'])
+    df = df.dropna(subset=['timestamp']).sort_values('timestamp', kind='stable')
+    df['timestamp'] = df['timestamp'].astype('int64')
+    df = df.astype(object).where(df.notna(), None)
+    
+    if os.path.exists(history_path):
+        os.remove(history_path)
+    writer = MemmapHistoryWriter(history_path)
+    writer.insert_samples(df.to_dict('records'))
+    return len(df)
+
+
+def main():
+    """Command line entry point: convert a data directory's CSV history to memmap files"""
+    from file_catalog import HistoryFileCatalog
+    
+    command = sys.argv[1] if len(sys.argv) > 1 else "convert"
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else "data"
+    
+    if command != "convert":
+        print("Usage: python memmap_store.py convert [data_dir]")
+        return
+    
+    for computer_id, paths in HistoryFileCatalog(data_dir).scan().items():
+        for csv_path in paths:
+            history_path = os.path.join(data_dir, memmap_filename(computer_id))
+            rows = convert_csv(csv_path, history_path)
+            print(f"✅ {computer_id}: {rows} rows → {os.path.basename(history_path)} "
+                  f"({os.path.getsize(history_path):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
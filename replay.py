@@ -0,0 +1,298 @@
+# replay.py
+"""
+Replays stored history through the live collection pipeline.
+
+Records from the bundled combined CSV files, any history store (SQLite,
+segments, memmap), a colector.py JSON dump or a snapshot file are fed, in
+timestamp order, through the same SecurityEnhancedSystemMonitor.process_sample
+path that collect_data_continuously uses - session log, status display, CSV
+and JSON files and any enabled stores. The gaps between the original
+timestamps are kept, divided by a speed multiplier; "max" replays as fast as
+the pipeline can go. Samples keep their original timestamps, so a replay of
+the same source is deterministic and can benchmark any downstream stage.
+
+The pipeline writes into its own data directory (replay_data by default), so
+the real history is never touched. Flat rows are expanded back into nested
+records; fields the flat layout never kept (swap, CPU frequency, scan
+details) are left empty.
+
+Usage:
+    python replay.py [source] [speed|max] [computer_id] [output_dir]
+                     [--display] [--sqlite] [--segments] [--memmap] [--snapshots]
+"""
+
+import os
+import sys
+import json
+import time
+from timestamps import to_epoch_ns, to_iso
+from data_schema import DEFAULTS
+
+DEFAULT_OUTPUT_DIR = "replay_data"
+
+# Command line flag -> monitor.enable_<name>_store
+STORE_FLAGS = {"sqlite": "sqlite", "segments": "segment", "memmap": "memmap", "snapshots": "snapshot"}
+
+
+def parse_speed(value):
+    """Speed multiplier from a number or "max" (None = as fast as possible)"""
+    if value is None or str(value).lower() in ('max', 'inf', '0'):
+        return None
+    speed = float(value)
+    if speed <= 0:
+        return None
+    return speed
+
+
+def unflatten_sample(row):
+    """Expand a flat schema row into the nested record layout of get_current_status"""
+    def value(name, default=None):
+        item = row.get(name)
+        return default if item is None else item
+    
+    def count_list(name):
+        return [{} for _ in range(int(value(name, 0)))]
+    
+    total_gb = value('disk_total_gb', 0.0)
+    free_gb = value('disk_free_gb', 0.0)
+    
+    return {
+        "timestamp": to_epoch_ns(row['timestamp']),
+        "computer_info": {
+            "computer_name": value('computer_name', ''),
+            "computer_id": value('computer_id', ''),
+            "os_system": value('os_system', '')
+        },
+        "cpu": {"usage_percent": value('cpu_percent', 0.0)},
+        "memory": {
+            "total_gb": value('memory_total_gb', 0.0),
+            "used_gb": value('memory_used_gb', 0.0),
+            "usage_percent": value('memory_percent', 0.0)
+        },
+        "disk": {
+            "total_gb": total_gb,
+            "used_gb": total_gb - free_gb,
+            "free_gb": free_gb,
+            "usage_percent": value('disk_percent', 0.0)
+        },
+        "network": {
+            "bytes_sent": value('network_sent_mb', 0.0) * (1024**2),
+            "bytes_received": value('network_recv_mb', 0.0) * (1024**2)
+        },
+        "system": {
+            "process_count": value('process_count', 0),
+            "temperature_celsius": value('temperature'),
+            "battery": None,
+            "uptime_hours": value('uptime_hours', 0.0)
+        },
+        "security": {
+            "security_score": value('security_score', DEFAULTS['security_score']),
+            "antivirus_status": {
+                "antivirus_enabled": bool(value('antivirus_enabled', DEFAULTS['antivirus_enabled'])),
+                "real_time_protection": bool(value('real_time_protection', DEFAULTS['real_time_protection'])),
+                "definition_age_days": value('definition_age_days', 0),
+                "last_scan_date": None,
+                "last_scan_type": None
+            },
+            "security_software": count_list('security_software_count'),
+            "suspicious_activity": count_list('suspicious_activity_count'),
+            "vulnerabilities": count_list('vulnerability_count')
+        }
+    }
+
+
+class ReplaySource:
+    """Nested status records from stored history, in timestamp order"""
+    
+    def __init__(self, source="data", computer=None, start=None, end=None):
+        self.source = source
+        self.computer = computer
+        self.start = start
+        self.end = end
+    
+    def _nested_records(self):
+        """Records from a JSON dump or snapshot file"""
+        from snapshot_store import SnapshotReader
+        
+        if self.source.endswith('.jsonl'):
+            records = list(SnapshotReader(self.source).records(self.start, self.end))
+        else:
+            with open(self.source, 'r', encoding='utf-8') as f:
+                records = [record for record in json.load(f) if isinstance(record, dict) and "computer_info" in record]
+        
+        for record in records:
+            record["timestamp"] = to_epoch_ns(record["timestamp"])
+        start = None if self.start is None else to_epoch_ns(self.start)
+        end = None if self.end is None else to_epoch_ns(self.end)
+        return [
+            record for record in records
+            if (start is None or record["timestamp"] >= start) and (end is None or record["timestamp"] <= end)
+            and (self.computer is None or record["computer_info"]["computer_id"] == self.computer)
+        ]
+    
+    def _flat_records(self):
+        """Records from CSV files or a history store, expanded to the nested layout"""
+        from history_loader import history_frames, merge_by_timestamp
+        from timestamps import epoch_ns_series
+        
+        frames = []
+        for df in history_frames(self.source, self.computer, self.start, self.end):
+            if len(df):
+                df = df.copy()
+                df['timestamp'] = epoch_ns_series(df['timestamp'])
+                frames.append(df.dropna(subset=['timestamp']))
+        if not frames:
+            return []
+        
+        merged = merge_by_timestamp(frames)
+        if self.computer is None and merged['computer_id'].nunique() > 1:
+            # The pipeline samples one computer; take the one with the most history
+            self.computer = merged['computer_id'].value_counts().index[0]
+            print(f"ℹ️  Several computers in {self.source}; replaying {self.computer} (pass a computer ID to choose)")
+        if self.computer is not None:
+            merged = merged[merged['computer_id'] == self.computer]
+        
+        rows = merged.astype(object).where(merged.notna(), None).to_dict('records')
+        return [unflatten_sample(row) for row in rows]
+    
+    def records(self):
+        """Every record of the source, sorted by timestamp"""
+        if os.path.isfile(self.source) and self.source.endswith(('.json', '.jsonl')):
+            records = self._nested_records()
+        else:
+            records = self._flat_records()
+        records.sort(key=lambda record: record["timestamp"])
+        if records and self.computer is None:
+            self.computer = records[0]["computer_info"]["computer_id"]
+        return records
+
+
+class Replayer:
+    """Feeds records through a monitor's collection pipeline at a chosen speed"""
+    
+    def __init__(self, monitor, speed=1.0, display=False, stop=None):
+        self.monitor = monitor
+        self.speed = parse_speed(speed)
+        self.display = display
+        # Optional threading.Event; once set the replay ends after the current sample
+        self.stop = stop
+    
+    def run(self, records):
+        """Replay the records; returns throughput statistics"""
+        stats = {
+            "samples": 0,
+            "seconds": 0.0,
+            "span_seconds": 0.0,
+            "latencies": [],
+            "late": 0
+        }
+        if not records:
+            print("❌ Nothing to replay")
+            return stats
+        
+        first_timestamp = records[0]["timestamp"]
+        started = time.perf_counter()
+        
+        try:
+            for record in records:
+                if self.speed is not None:
+                    due = started + (record["timestamp"] - first_timestamp) / 1e9 / self.speed
+                    wait = due - time.perf_counter()
+                    if wait > 0:
+                        if self.stop is not None:
+                            self.stop.wait(wait)
+                        else:
+                            time.sleep(wait)
+                    elif wait < -0.1:
+                        stats["late"] += 1
+                if self.stop is not None and self.stop.is_set():
+                    print("\n⏹️  Replay stopped")
+                    break
+                
+                sample_started = time.perf_counter()
+                self.monitor.process_sample(record, display=self.display)
+                stats["latencies"].append(time.perf_counter() - sample_started)
+                stats["samples"] += 1
+        
+        except KeyboardInterrupt:
+            print("\n⏹️  Replay stopped by user")
+        
+        self.monitor.flush_stores()
+        stats["seconds"] = time.perf_counter() - started
+        if stats["samples"]:
+            stats["span_seconds"] = (records[stats["samples"] - 1]["timestamp"] - first_timestamp) / 1e9
+        self.report(stats)
+        return stats
+    
+    def report(self, stats):
+        """Print the replay's throughput and per-sample pipeline latency"""
+        if not stats["samples"]:
+            return
+        seconds = max(stats["seconds"], 1e-9)
+        latencies = sorted(stats["latencies"])
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        mean = sum(latencies) / len(latencies)
+        
+        print(f"\n✅ Replayed {stats['samples']} samples in {stats['seconds']:.2f}s "
+              f"({stats['samples'] / seconds:,.1f} samples/s)")
+        print(f"   ⏩ {stats['span_seconds'] / 3600:.2f}h of history at {stats['span_seconds'] / seconds:,.0f}x real time "
+              f"(target {'max' if self.speed is None else f'{self.speed:g}x'})")
+        print(f"   ⏱️  Pipeline latency per sample: mean {mean * 1000:.2f}ms, p95 {p95 * 1000:.2f}ms, max {latencies[-1] * 1000:.2f}ms")
+        if stats["late"]:
+            print(f"   ⚠️  {stats['late']} samples were processed more than 100ms behind schedule")
+
+
+def replay(source="data", speed=1.0, computer=None, output_dir=DEFAULT_OUTPUT_DIR, display=False, stores=(), start=None, end=None, listeners=(), stop=None):
+    """Replay stored history through a fresh monitor writing to output_dir; returns statistics
+    
+    `listeners` receive every replayed record, like monitor.add_sample_listener.
+    Setting the threading.Event `stop` ends the replay after the current sample.
+    """
+    from colector import SecurityEnhancedSystemMonitor
+    
+    replay_source = ReplaySource(source, computer, start, end)
+    records = replay_source.records()
+    if not records:
+        print(f"❌ No records to replay in {source}")
+        return None
+    
+    if os.path.isdir(output_dir) and os.listdir(output_dir):
+        print(f"⚠️  {output_dir} is not empty; replayed samples are appended to what is already there")
+    
+    monitor = SecurityEnhancedSystemMonitor(data_dir=output_dir, charts_dir=os.path.join(output_dir, "charts"))
+    # File names and stores follow the replayed computer, not this machine
+    monitor.computer_name = replay_source.computer
+    for store in stores:
+        getattr(monitor, f"enable_{store}_store")()
+    for listener in listeners:
+        monitor.add_sample_listener(listener)
+    
+    print(f"▶️  Replaying {len(records)} samples of {replay_source.computer} "
+          f"({to_iso(records[0]['timestamp'])} → {to_iso(records[-1]['timestamp'])}) into {output_dir}")
+    return Replayer(monitor, speed, display, stop).run(records)
+
+
+def main():
+    """Command line entry point: replay a source through the pipeline"""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    flags = [arg[2:] for arg in sys.argv[1:] if arg.startswith('--')]
+    
+    source = args[0] if len(args) > 0 else "data"
+    speed = args[1] if len(args) > 1 else "max"
+    computer = args[2] if len(args) > 2 and args[2] else None
+    output_dir = args[3] if len(args) > 3 else DEFAULT_OUTPUT_DIR
+    
+    stores = [STORE_FLAGS[flag] for flag in flags if flag in STORE_FLAGS]
+    
+    try:
+        parse_speed(speed)
+    except ValueError:
+        print("Usage: python replay.py [source] [speed|max] [computer_id] [output_dir] "
+              "[--display] [--sqlite] [--segments] [--memmap] [--snapshots]")
+        return
+    
+    replay(source, speed, computer, output_dir, display="display" in flags, stores=stores)
+
+
+if __name__ == "__main__":
+    main()
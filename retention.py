@@ -0,0 +1,369 @@
+# retention.py
+"""
+Tiered retention with downsampling rollups for the history CSV files.
+
+Tiers:
+  raw - every sample, kept for `raw_days`
+  5m  - 5-minute rollups (min/max/mean/last per metric), kept for `rollup_5m_days`
+  1h  - hourly rollups, kept forever
+
+Rows that age out of a tier are rolled into the next tier before they are
+removed, so disk use stays bounded while long-range trends survive. Cutoffs
+are aligned to bucket boundaries and the rolled-through point is stored in
+the data manifest, so each run only processes rows that aged out since the
+previous run and never rolls the same bucket twice.
+
+Run manually with:
+    python retention.py [data_dir] [raw_days] [rollup_5m_days]
+"""
+
+import os
+import sys
+import csv
+from timestamps import now_ns, to_epoch_ns, NS_PER_SECOND
+from file_catalog import HistoryFileCatalog, rollup_filename, GLOBAL_HISTORY_FILE
+from data_manifest import DataManifest
+from data_schema import skip_preamble, write_csv, schema_sidecar_path
+
+NS_PER_DAY = 86400 * NS_PER_SECOND
+
+TIER_SECONDS = {
+    "5m": 300,
+    "1h": 3600
+}
+
+# Numeric columns carried into rollups (booleans roll up as 0/1 fractions)
+ROLLUP_METRICS = [
+    'cpu_percent', 'memory_percent', 'memory_used_gb', 'memory_total_gb',
+    'disk_percent', 'disk_free_gb', 'disk_total_gb', 'process_count',
+    'temperature', 'uptime_hours', 'network_sent_mb', 'network_recv_mb',
+    'security_score', 'antivirus_enabled', 'real_time_protection',
+    'definition_age_days', 'suspicious_activity_count', 'vulnerability_count',
+    'security_software_count'
+]
+AGGREGATES = ['min', 'max', 'mean', 'last']
+
+ROLLUP_HEADERS = ['computer_id', 'bucket_start', 'bucket_seconds', 'count'] + [
+    f"{metric}_{aggregate}" for metric in ROLLUP_METRICS for aggregate in AGGREGATES
+]
+
+
+def _metric_value(value):
+    """Parse a CSV cell into a float (booleans become 0/1), or None"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        return float(value)
+    text = str(value)
+    if text in ('True', 'true'):
+        return 1.0
+    if text in ('False', 'false'):
+        return 0.0
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+class RollupBucket:
+    """Running min/max/mean/last aggregates for one time bucket"""
+    
+    def __init__(self, bucket_start):
+        self.bucket_start = bucket_start
+        self.count = 0
+        self.last_ts = None
+        self.stats = {}
+    
+    def add_sample(self, timestamp, row):
+        """Fold one raw sample into the bucket"""
+        self.count += 1
+        is_latest = self.last_ts is None or timestamp >= self.last_ts
+        if is_latest:
+            self.last_ts = timestamp
+        
+        for metric in ROLLUP_METRICS:
+            value = _metric_value(row.get(metric))
+            if value is not None:
+                self._merge(metric, value, value, value, 1, value, is_latest)
+    
+    def add_rollup(self, row):
+        """Fold a finer-grained rollup row into the bucket"""
+        count = int(float(row.get('count') or 0))
+        if count <= 0:
+            return
+        bucket_start = int(row['bucket_start'])
+        self.count += count
+        is_latest = self.last_ts is None or bucket_start >= self.last_ts
+        if is_latest:
+            self.last_ts = bucket_start
+        
+        for metric in ROLLUP_METRICS:
+            mean = _metric_value(row.get(f"{metric}_mean"))
+            if mean is None:
+                continue
+            self._merge(
+                metric,
+                _metric_value(row.get(f"{metric}_min")),
+                _metric_value(row.get(f"{metric}_max")),
+                mean,
+                count,
+                _metric_value(row.get(f"{metric}_last")),
+                is_latest
+            )
+    
+    def _merge(self, metric, low, high, mean, count, last, is_latest):
+        """Combine partial aggregates for one metric"""
+        stat = self.stats.get(metric)
+        if stat is None:
+            self.stats[metric] = {"min": low, "max": high, "sum": mean * count, "count": count, "last": last}
+            return
+        stat["min"] = min(stat["min"], low)
+        stat["max"] = max(stat["max"], high)
+        stat["sum"] += mean * count
+        stat["count"] += count
+        if is_latest:
+            stat["last"] = last
+    
+    def to_row(self, computer_id, bucket_seconds):
+        """Serialise the bucket as a rollup CSV row"""
+        row = {
+            'computer_id': computer_id,
+            'bucket_start': self.bucket_start,
+            'bucket_seconds': bucket_seconds,
+            'count': self.count
+        }
+        for metric in ROLLUP_METRICS:
+            stat = self.stats.get(metric)
+            for aggregate in AGGREGATES:
+                if stat is None:
+                    row[f"{metric}_{aggregate}"] = ''
+                elif aggregate == 'mean':
+                    row[f"{metric}_{aggregate}"] = stat["sum"] / stat["count"]
+                else:
+                    row[f"{metric}_{aggregate}"] = stat[aggregate]
+        return row
+
+
+class RetentionEngine:
+    """Rolls aged raw samples into 5-minute and hourly tiers and trims the raw files"""
+    
+    def __init__(self, data_dir, raw_days=7, rollup_5m_days=90, manifest=None):
+        self.data_dir = data_dir
+        self.raw_days = raw_days
+        self.rollup_5m_days = rollup_5m_days
+        self.manifest = manifest if manifest is not None else DataManifest(data_dir)
+        self.catalog = HistoryFileCatalog(data_dir)
+        self.unreadable_rows = 0
+    
+    def apply(self, now=None):
+        """Run every tier transition once; returns a summary of rows processed"""
+        now = now_ns() if now is None else to_epoch_ns(now)
+        raw_cutoff = self._align(now - int(self.raw_days * NS_PER_DAY), "5m")
+        rollup_cutoff = self._align(now - int(self.rollup_5m_days * NS_PER_DAY), "1h")
+        
+        summary = {"raw_rows_rolled": 0, "rollup_rows_rolled": 0, "computers": 0}
+        self.unreadable_rows = 0
+        self.manifest.ensure()
+        
+        for computer_id, paths in self.catalog.scan().items():
+            summary["computers"] += 1
+            for path in paths:
+                summary["raw_rows_rolled"] += self._roll_raw(computer_id, path, raw_cutoff)
+            summary["rollup_rows_rolled"] += self._roll_5m(computer_id, rollup_cutoff)
+        
+        # The fleet-wide file duplicates per-computer rows, which were rolled up above
+        global_path = os.path.join(self.data_dir, GLOBAL_HISTORY_FILE)
+        if os.path.exists(global_path):
+            self._trim_file(global_path, None, raw_cutoff)
+        
+        self.manifest.save()
+        # Rows whose timestamp cannot be parsed are never rolled up or deleted
+        summary["unreadable_rows_kept"] = self.unreadable_rows
+        return summary
+    
+    def _align(self, timestamp, tier):
+        """Round a timestamp down to the start of its bucket"""
+        bucket_ns = TIER_SECONDS[tier] * NS_PER_SECOND
+        return (timestamp // bucket_ns) * bucket_ns
+    
+    def _watermark(self, computer_id, tier):
+        """Timestamp below which rows were already rolled into `tier`"""
+        retention = self.manifest.data.setdefault("retention", {})
+        return retention.get(computer_id, {}).get(tier)
+    
+    def _set_watermark(self, computer_id, tier, value):
+        retention = self.manifest.data.setdefault("retention", {})
+        retention.setdefault(computer_id, {})[tier] = value
+    
+    def _read_rows(self, path):
+        """Read a CSV into (fieldnames, rows)"""
+        with open(path, 'r', newline='', encoding='utf-8', errors='replace') as f:
+            reader = csv.DictReader(skip_preamble(f))
+            return reader.fieldnames or [], list(reader)
+    
+    def _write_rows(self, path, fieldnames, rows):
+        """Atomically rewrite a CSV with the given rows (keeping its columns, stamping the schema version)"""
+        temp_path = path + ".tmp"
+        write_csv(temp_path, rows, append=False, fieldnames=fieldnames)
+        os.replace(temp_path, path)
+        os.replace(schema_sidecar_path(temp_path), schema_sidecar_path(path))
+    
+    def _append_rollups(self, computer_id, tier, buckets):
+        """Append finished buckets to a computer's rollup file"""
+        path = os.path.join(self.data_dir, rollup_filename(computer_id, tier))
+        file_exists = os.path.exists(path)
+        rows = [buckets[key].to_row(computer_id, TIER_SECONDS[tier]) for key in sorted(buckets)]
+        
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=ROLLUP_HEADERS)
+            if not file_exists:
+                writer.writeheader()
+            writer.writerows(rows)
+        
+        self.manifest.record_samples(
+            computer_id, os.path.basename(path), [row['bucket_start'] for row in rows],
+            file_format=f"rollup_{tier}", save=False
+        )
+    
+    def _row_timestamp(self, row):
+        """Epoch ns of a raw row, or None when the timestamp is missing or unreadable"""
+        try:
+            return to_epoch_ns(row.get('timestamp'))
+        except (TypeError, ValueError):
+            return None
+    
+    def _keep_unreadable(self, path, count):
+        """Report rows kept because their timestamp could not be parsed"""
+        if count:
+            self.unreadable_rows += count
+            print(f"⚠️  Retention kept {count} rows with unreadable timestamps in {os.path.basename(path)}")
+    
+    def _roll_raw(self, computer_id, path, cutoff):
+        """Move raw rows older than `cutoff` into 5-minute rollups"""
+        fieldnames, rows = self._read_rows(path)
+        watermark = self._watermark(computer_id, "5m")
+        buckets = {}
+        kept = []
+        kept_timestamps = []
+        rolled = 0
+        unreadable = 0
+        
+        for row in rows:
+            timestamp = self._row_timestamp(row)
+            if timestamp is None:
+                kept.append(row)
+                unreadable += 1
+                continue
+            if timestamp >= cutoff:
+                kept.append(row)
+                kept_timestamps.append(timestamp)
+                continue
+            if watermark is not None and timestamp < watermark:
+                continue  # already rolled up by an earlier run
+            bucket_start = self._align(timestamp, "5m")
+            buckets.setdefault(bucket_start, RollupBucket(bucket_start)).add_sample(timestamp, row)
+            rolled += 1
+        
+        if len(kept) == len(rows):
+            return 0
+        
+        if buckets:
+            self._append_rollups(computer_id, "5m", buckets)
+        self._set_watermark(computer_id, "5m", max(cutoff, watermark or cutoff))
+        self._write_rows(path, fieldnames, kept)
+        self._keep_unreadable(path, unreadable)
+        self.manifest.record_samples(
+            computer_id, os.path.basename(path), kept_timestamps, replace=True, save=False
+        )
+        return rolled
+    
+    def _roll_5m(self, computer_id, cutoff):
+        """Move 5-minute rollups older than `cutoff` into hourly rollups"""
+        path = os.path.join(self.data_dir, rollup_filename(computer_id, "5m"))
+        if not os.path.exists(path):
+            return 0
+        
+        fieldnames, rows = self._read_rows(path)
+        watermark = self._watermark(computer_id, "1h")
+        buckets = {}
+        kept = []
+        rolled = 0
+        
+        for row in rows:
+            bucket_start = int(row['bucket_start'])
+            if bucket_start >= cutoff:
+                kept.append(row)
+                continue
+            if watermark is not None and bucket_start < watermark:
+                continue
+            hour_start = self._align(bucket_start, "1h")
+            buckets.setdefault(hour_start, RollupBucket(hour_start)).add_rollup(row)
+            rolled += 1
+        
+        if len(kept) == len(rows):
+            return 0
+        
+        if buckets:
+            self._append_rollups(computer_id, "1h", buckets)
+        self._set_watermark(computer_id, "1h", max(cutoff, watermark or cutoff))
+        self._write_rows(path, fieldnames, kept)
+        self.manifest.record_samples(
+            computer_id, os.path.basename(path), [int(row['bucket_start']) for row in kept],
+            file_format="rollup_5m", replace=True, save=False
+        )
+        return rolled
+    
+    def _trim_file(self, path, computer_id, cutoff):
+        """Drop rows older than `cutoff` from a file without rolling them up"""
+        fieldnames, rows = self._read_rows(path)
+        kept = []
+        kept_timestamps = []
+        unreadable = 0
+        for row in rows:
+            timestamp = self._row_timestamp(row)
+            if timestamp is None:
+                kept.append(row)
+                unreadable += 1
+            elif timestamp >= cutoff:
+                kept.append(row)
+                kept_timestamps.append(timestamp)
+        
+        if len(kept) != len(rows):
+            self._write_rows(path, fieldnames, kept)
+            self._keep_unreadable(path, unreadable)
+            self.manifest.record_samples(
+                computer_id, os.path.basename(path), kept_timestamps, replace=True, save=False
+            )
+
+
+def load_rollups_as_samples(data_dir, computer_id):
+    """Hourly then 5-minute rollups for a computer, shaped like raw sample rows (mean values)"""
+    samples = []
+    for tier in ("1h", "5m"):
+        path = os.path.join(data_dir, rollup_filename(computer_id, tier))
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', newline='', encoding='utf-8', errors='replace') as f:
+            for row in csv.DictReader(skip_preamble(f)):
+                sample = {'timestamp': int(row['bucket_start']), 'computer_id': computer_id}
+                for metric in ROLLUP_METRICS:
+                    sample[metric] = _metric_value(row.get(f"{metric}_mean"))
+                samples.append(sample)
+    return samples
+
+
+def main():
+    """Command line entry point for a one-off retention run"""
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "data"
+    raw_days = float(sys.argv[2]) if len(sys.argv) > 2 else 7
+    rollup_5m_days = float(sys.argv[3]) if len(sys.argv) > 3 else 90
+    
+    engine = RetentionEngine(data_dir, raw_days, rollup_5m_days)
+    summary = engine.apply()
+    print(f"✅ Retention complete for {summary['computers']} computers: "
+          f"{summary['raw_rows_rolled']} raw rows → 5m, {summary['rollup_rows_rolled']} 5m rows → 1h, "
+          f"{summary['unreadable_rows_kept']} rows with unreadable timestamps kept")
+
+
+if __name__ == "__main__":
+    main()
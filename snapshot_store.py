@@ -0,0 +1,295 @@
+# snapshot_store.py
+"""
+Delta-encoded store for the full nested status records from colector.py.
+
+The flat history keeps only the schema columns; the nested records from
+get_current_status (battery, swap, CPU frequency, disk I/O counters and the
+per-scan security details such as which processes looked suspicious) were
+only kept in the JSON dump, which repeats every unchanged sub-dict on every
+tick. Here each record is one JSON line: every `keyframe_interval` records a
+full keyframe, and in between only the fields that changed since the
+previous record:
+
+    {"t": 1750000000000000000, "k": 1, "state": {...full record...}}
+    {"t": 1750000030000000000, "set": [[["cpu", "usage_percent"], 12.5], ...], "del": [...]}
+
+Lists (suspicious processes, vulnerabilities) are stored whole when they
+change. Ticks between security scans carry {"cached": true} instead of scan
+results; the last scan's details are carried forward, so the rebuilt record
+at any time holds the security state that was current then.
+
+Any point in time is rebuilt from the nearest keyframe at or before it plus
+at most keyframe_interval - 1 deltas.
+
+Convert the existing JSON dumps with:
+    python snapshot_store.py convert [data_dir]
+Print the record that was current at a given time:
+    python snapshot_store.py at <time> <snapshot_file>
+"""
+
+import os
+import re
+import sys
+import copy
+import json
+import bisect
+import threading
+from timestamps import to_epoch_ns, to_iso
+
+DEFAULT_KEYFRAME_INTERVAL = 60
+
+# Keyframe lines start with their timestamp and flag, so the index is built without parsing JSON
+KEYFRAME_PATTERN = re.compile(rb'^\{"t": (-?\d+), "k": 1')
+
+
+def snapshot_filename(computer_id):
+    """Name of a computer's snapshot file"""
+    return f"system_security_{computer_id}_snapshots.jsonl"
+
+
+def diff_state(old, new, path=()):
+    """(changed, removed) lists of key paths between two nested dicts"""
+    changed = []
+    removed = []
+    for key, value in new.items():
+        if key not in old:
+            changed.append([list(path + (key,)), value])
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            sub_changed, sub_removed = diff_state(old[key], value, path + (key,))
+            changed.extend(sub_changed)
+            removed.extend(sub_removed)
+        elif old[key] != value or type(old[key]) is not type(value):
+            changed.append([list(path + (key,)), value])
+    for key in old:
+        if key not in new:
+            removed.append(list(path + (key,)))
+    return changed, removed
+
+
+def apply_delta(state, changed, removed):
+    """Apply a delta from diff_state to a nested dict in place"""
+    for path in removed:
+        target = state
+        for key in path[:-1]:
+            target = target.get(key)
+            if not isinstance(target, dict):
+                break
+        else:
+            target.pop(path[-1], None)
+    for path, value in changed:
+        target = state
+        for key in path[:-1]:
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            target = target[key]
+        target[path[-1]] = value
+    return state
+
+
+def carry_forward_security(record, previous):
+    """Replace a {"cached": true} security section with the previous scan's details"""
+    security = record.get("security")
+    if previous is not None and isinstance(security, dict) and security.get("cached") and "security" in previous:
+        record = dict(record)
+        record["security"] = previous["security"]
+    return record
+
+
+class SnapshotWriter:
+    """Appends nested status records as keyframes and field-level deltas"""
+    
+    def __init__(self, path, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.lock = threading.Lock()
+        self.state = None
+        self.since_keyframe = 0
+        
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._open_existing()
+        else:
+            snapshot_dir = os.path.dirname(path)
+            if snapshot_dir and not os.path.exists(snapshot_dir):
+                os.makedirs(snapshot_dir)
+            open(path, 'ab').close()
+    
+    def _open_existing(self):
+        """Drop a partially written last line and rebuild the current state to diff against"""
+        with open(self.path, 'r+b') as f:
+            data = f.read()
+            end = data.rfind(b'\n') + 1
+            if end < len(data):
+                print(f"⚠️  Dropping {len(data) - end} bytes of incomplete snapshot data from {self.path}")
+                f.truncate(end)
+        
+        reader = SnapshotReader(self.path)
+        if reader.keyframes:
+            self.state, self.since_keyframe = reader.latest()
+    
+    def add_record(self, record):
+        """Append one nested status record; returns True if it was written as a keyframe"""
+        timestamp = to_epoch_ns(record.get("timestamp"))
+        state = json.loads(json.dumps(carry_forward_security(record, self.state), default=str))
+        state["timestamp"] = timestamp
+        
+        with self.lock:
+            keyframe = self.state is None or self.since_keyframe >= self.keyframe_interval - 1
+            if keyframe:
+                line = {"t": timestamp, "k": 1, "state": state}
+                self.since_keyframe = 0
+            else:
+                changed, removed = diff_state(self.state, state)
+                line = {"t": timestamp, "set": changed, "del": removed}
+                self.since_keyframe += 1
+            
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(line, separators=(', ', ': ')) + "\n")
+            self.state = state
+        return keyframe
+    
+    def insert_records(self, records):
+        """Append many nested status records in order"""
+        for record in records:
+            self.add_record(record)
+    
+    def close(self):
+        """Nothing is buffered; kept for symmetry with the other stores"""
+        return None
+
+
+class SnapshotReader:
+    """Rebuilds nested status records at any point in time from a snapshot file"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.keyframes = []  # (timestamp, byte offset), in file order
+        self._build_index()
+    
+    def _build_index(self):
+        """Locate every keyframe line"""
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                match = KEYFRAME_PATTERN.match(line)
+                if match and line.endswith(b'\n'):
+                    self.keyframes.append((int(match.group(1)), offset))
+                offset += len(line)
+        self.sorted = all(a[0] <= b[0] for a, b in zip(self.keyframes, self.keyframes[1:]))
+    
+    def _replay(self, offset, until=None):
+        """Yield (timestamp, state, deltas since keyframe) for the records from the keyframe at `offset`"""
+        state = None
+        since_keyframe = 0
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    return
+                entry = json.loads(line)
+                if until is not None and entry["t"] > until:
+                    return
+                if entry.get("k"):
+                    if state is not None and until is not None:
+                        # Next keyframe: the caller asked for the interval of the previous one only
+                        return
+                    state = entry["state"]
+                    since_keyframe = 0
+                elif state is not None:
+                    apply_delta(state, entry["set"], entry["del"])
+                    since_keyframe += 1
+                else:
+                    continue
+                yield entry["t"], state, since_keyframe
+    
+    def at(self, when):
+        """The full record that was current at `when` (None if before the first record)"""
+        if not self.keyframes:
+            return None
+        when = to_epoch_ns(when)
+        
+        if self.sorted:
+            position = bisect.bisect_right([timestamp for timestamp, _ in self.keyframes], when) - 1
+            if position < 0:
+                return None
+            candidates = [self.keyframes[position]]
+        else:
+            candidates = [keyframe for keyframe in self.keyframes if keyframe[0] <= when]
+        
+        best = None
+        for _, offset in candidates:
+            for timestamp, state, _ in self._replay(offset, until=when):
+                if best is None or timestamp >= best[0]:
+                    best = (timestamp, copy.deepcopy(state))
+        return best[1] if best else None
+    
+    def records(self, start=None, end=None):
+        """Yield every rebuilt record within [start, end] in file order"""
+        if not self.keyframes:
+            return
+        start = None if start is None else to_epoch_ns(start)
+        end = None if end is None else to_epoch_ns(end)
+        
+        for timestamp, state, _ in self._replay(self.keyframes[0][1]):
+            if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+                yield copy.deepcopy(state)
+    
+    def latest(self):
+        """(last rebuilt record, deltas written since its keyframe)"""
+        if not self.keyframes:
+            return None, 0
+        result = (None, 0)
+        for _, state, since_keyframe in self._replay(self.keyframes[-1][1]):
+            result = (state, since_keyframe)
+        return result
+
+
+def convert_json(json_path, snapshot_path, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+    """Write every record of a colector.py JSON dump into a new snapshot file"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    records = [record for record in records if isinstance(record, dict) and "computer_info" in record]
+    records.sort(key=lambda record: to_epoch_ns(record.get("timestamp")))
+    
+    if os.path.exists(snapshot_path):
+        os.remove(snapshot_path)
+    writer = SnapshotWriter(snapshot_path, keyframe_interval)
+    writer.insert_records(records)
+    return len(records)
+
+
+def main():
+    """Command line entry point: convert JSON dumps to snapshots, or rebuild one point in time"""
+    from file_catalog import computer_id_from_json_filename
+    
+    command = sys.argv[1] if len(sys.argv) > 1 else "convert"
+    
+    if command == "at" and len(sys.argv) > 3:
+        record = SnapshotReader(sys.argv[3]).at(sys.argv[2])
+        if record is None:
+            print(f"❌ No snapshot at or before {sys.argv[2]}")
+            return
+        print(f"🕒 Record current at {sys.argv[2]} (sampled {to_iso(record['timestamp'])}):")
+        print(json.dumps(record, indent=2))
+        return
+    
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else "data"
+    if command != "convert":
+        print("Usage: python snapshot_store.py convert [data_dir]")
+        print("       python snapshot_store.py at <time> <snapshot_file>")
+        return
+    
+    for name in sorted(os.listdir(data_dir)):
+        computer_id = computer_id_from_json_filename(name)
+        if computer_id is None:
+            continue
+        json_path = os.path.join(data_dir, name)
+        snapshot_path = os.path.join(data_dir, snapshot_filename(computer_id))
+        records = convert_json(json_path, snapshot_path)
+        json_size = os.path.getsize(json_path)
+        snapshot_size = os.path.getsize(snapshot_path)
+        ratio = json_size / snapshot_size if snapshot_size else 0
+        print(f"✅ {computer_id}: {records} records, {json_size:,} → {snapshot_size:,} bytes ({ratio:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# svg_report.py
+"""
+Self-contained HTML/SVG dashboard written with the standard library only.
+
+The portable build (EnhancedSecurityMonitor.spec) excludes matplotlib, numpy
+and pandas to keep the executable small, so its include_charts setting had
+nothing to draw with. This module turns the monitor's in-memory data_log (the
+flat sample rows) straight into one HTML file with inline SVG polylines for
+CPU, memory, disk and security score plus a summary table. No scripts, fonts
+or images are referenced, so the file opens anywhere and compresses well in
+the sync zip package.
+
+Long series are reduced to a per-bucket min/max pair so spikes survive while
+the file stays small (about MAX_POINTS vertices per chart).
+
+Usage:
+    python svg_report.py <history.csv> [output.html]
+"""
+
+import os
+import sys
+import csv
+import html
+import datetime
+from timestamps import to_epoch_ns
+
+MAX_POINTS = 600
+CHART_WIDTH = 560
+CHART_HEIGHT = 180
+MARGIN_LEFT = 40
+MARGIN_RIGHT = 12
+MARGIN_TOP = 30
+MARGIN_BOTTOM = 24
+
+# (column, title, color, fixed y limits or None)
+SVG_PANELS = [
+    ('cpu_percent', 'CPU Usage (%)', '#ff6b6b', (0, 100)),
+    ('memory_percent', 'Memory Usage (%)', '#4ecdc4', (0, 100)),
+    ('disk_percent', 'Disk Usage (%)', '#45b7d1', (0, 100)),
+    ('security_score', 'Security Score', '#96ceb4', (0, 100))
+]
+
+PAGE_STYLE = """
+body { font-family: Segoe UI, Arial, sans-serif; margin: 20px; color: #222; background: #fafafa; }
+h1 { font-size: 20px; margin-bottom: 4px; }
+.meta { color: #666; font-size: 13px; margin-bottom: 16px; }
+.grid { display: flex; flex-wrap: wrap; gap: 16px; }
+.grid svg { background: #fff; border: 1px solid #ddd; }
+table { border-collapse: collapse; margin-top: 20px; font-size: 13px; background: #fff; }
+th, td { border: 1px solid #ddd; padding: 4px 10px; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+"""
+
+
+def _number(value):
+    """Float value of a cell (None for missing or unparsable values)"""
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _timestamp(value):
+    """Epoch ns of a row's timestamp (CSV rows hold it as text)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return to_epoch_ns(value)
+
+
+def series_points(rows, column):
+    """(epoch ns, value) pairs of one column, in timestamp order, without missing values"""
+    points = []
+    for row in rows:
+        value = _number(row.get(column))
+        timestamp = _timestamp(row.get('timestamp'))
+        if value is not None and timestamp is not None:
+            points.append((timestamp, value))
+    points.sort()
+    return points
+
+
+def reduce_points(points, max_points=MAX_POINTS):
+    """Keep the min and max of each bucket (in time order) so peaks survive the reduction"""
+    if len(points) <= max_points:
+        return points
+    buckets = max(1, max_points // 2)
+    reduced = []
+    for bucket in range(buckets):
+        chunk = points[bucket * len(points) // buckets:(bucket + 1) * len(points) // buckets]
+        if not chunk:
+            continue
+        low = min(chunk, key=lambda point: point[1])
+        high = max(chunk, key=lambda point: point[1])
+        reduced.extend(sorted({low, high}))
+    return reduced
+
+
+def _time_label(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp / 1e9).strftime('%m-%d %H:%M')
+
+
+def svg_chart(points, title, color, ylim=None, width=CHART_WIDTH, height=CHART_HEIGHT):
+    """One line chart as an SVG element string"""
+    escaped_title = html.escape(title)
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+             f'viewBox="0 0 {width} {height}" font-family="Arial, sans-serif" font-size="11">']
+    
+    if not points:
+        parts.append(f'<text x="10" y="20" font-weight="bold" font-size="13">{escaped_title}</text>')
+        parts.append(f'<text x="{width / 2:.0f}" y="{height / 2:.0f}" text-anchor="middle" fill="#888">No data</text></svg>')
+        return "".join(parts)
+    
+    t0, t1 = points[0][0], points[-1][0]
+    if ylim is None:
+        values = [value for _, value in points]
+        low, high = min(values), max(values)
+        margin = (high - low) * 0.1 or max(abs(high) * 0.1, 1)
+        ylim = (low - margin, high + margin)
+    y0, y1 = ylim
+    
+    plot_width = width - MARGIN_LEFT - MARGIN_RIGHT
+    plot_height = height - MARGIN_TOP - MARGIN_BOTTOM
+    bottom = MARGIN_TOP + plot_height
+    
+    def x_of(timestamp):
+        return MARGIN_LEFT + (timestamp - t0) / ((t1 - t0) or 1) * plot_width
+    
+    def y_of(value):
+        value = min(max(value, y0), y1)
+        return bottom - (value - y0) / ((y1 - y0) or 1) * plot_height
+    
+    latest = points[-1][1]
+    parts.append(f'<text x="10" y="18" font-weight="bold" font-size="13">{escaped_title}</text>')
+    parts.append(f'<text x="{width - MARGIN_RIGHT}" y="18" text-anchor="end" fill="{color}">latest {latest:.1f}</text>')
+    
+    # Horizontal grid lines with value labels
+    for step in range(5):
+        value = y0 + (y1 - y0) * step / 4
+        y = y_of(value)
+        parts.append(f'<line x1="{MARGIN_LEFT}" y1="{y:.1f}" x2="{width - MARGIN_RIGHT}" y2="{y:.1f}" stroke="#eee"/>')
+        parts.append(f'<text x="{MARGIN_LEFT - 4}" y="{y + 4:.1f}" text-anchor="end" fill="#666">{value:.0f}</text>')
+    
+    coordinates = " ".join(f"{x_of(timestamp):.1f},{y_of(value):.1f}" for timestamp, value in reduce_points(points))
+    first_x, last_x = x_of(t0), x_of(t1)
+    parts.append(f'<polygon points="{first_x:.1f},{bottom:.1f} {coordinates} {last_x:.1f},{bottom:.1f}" '
+                 f'fill="{color}" fill-opacity="0.25" stroke="none"/>')
+    parts.append(f'<polyline points="{coordinates}" fill="none" stroke="{color}" stroke-width="1.5"/>')
+    
+    parts.append(f'<rect x="{MARGIN_LEFT}" y="{MARGIN_TOP}" width="{plot_width}" height="{plot_height}" fill="none" stroke="#999"/>')
+    parts.append(f'<text x="{MARGIN_LEFT}" y="{height - 6}" fill="#666">{_time_label(t0)}</text>')
+    parts.append(f'<text x="{width - MARGIN_RIGHT}" y="{height - 6}" text-anchor="end" fill="#666">{_time_label(t1)}</text>')
+    parts.append('</svg>')
+    return "".join(parts)
+
+
+def _summary_rows(rows):
+    """Table rows of latest / min / average / max per charted metric"""
+    table = []
+    for column, title, _, _ in SVG_PANELS:
+        values = [value for _, value in series_points(rows, column)]
+        if values:
+            table.append(f"<tr><td>{html.escape(title)}</td><td>{values[-1]:.1f}</td><td>{min(values):.1f}</td>"
+                         f"<td>{sum(values) / len(values):.1f}</td><td>{max(values):.1f}</td></tr>")
+    return "".join(table)
+
+
+def render_html_report(rows, computer_name="", title="System Security Dashboard"):
+    """The whole dashboard page for a list of flat sample rows, as a string"""
+    timestamps = sorted(timestamp for timestamp in (_timestamp(row.get('timestamp')) for row in rows) if timestamp is not None)
+    if timestamps:
+        span = f"{_time_label(timestamps[0])} → {_time_label(timestamps[-1])}"
+    else:
+        span = "no samples"
+    
+    latest = rows[-1] if rows else {}
+    security = ""
+    if latest:
+        security = (f"Antivirus: {'on' if str(latest.get('antivirus_enabled')) in ('True', '1') else 'OFF'} · "
+                    f"Real-time protection: {'on' if str(latest.get('real_time_protection')) in ('True', '1') else 'OFF'} · "
+                    f"Suspicious activity: {latest.get('suspicious_activity_count', 0)} · "
+                    f"Vulnerabilities: {latest.get('vulnerability_count', 0)}")
+    
+    charts = "".join(svg_chart(series_points(rows, column), panel_title, color, ylim)
+                     for column, panel_title, color, ylim in SVG_PANELS)
+    generated = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)} - {html.escape(str(computer_name))}</title>"
+        f"<style>{PAGE_STYLE}</style></head><body>"
+        f"<h1>{html.escape(title)} - {html.escape(str(computer_name))}</h1>"
+        f"<div class=\"meta\">{len(rows)} samples · {span} · generated {generated}<br>{html.escape(security)}</div>"
+        f"<div class=\"grid\">{charts}</div>"
+        "<table><tr><th>Metric</th><th>Latest</th><th>Min</th><th>Average</th><th>Max</th></tr>"
+        f"{_summary_rows(rows)}</table>"
+        "</body></html>\n"
+    )
+
+
+def write_html_report(rows, path, computer_name=""):
+    """Write the dashboard page to a file; returns the path"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(render_html_report(rows, computer_name))
+    return path
+
+
+def read_csv_rows(path):
+    """Flat sample rows of a history CSV as dicts of strings (no pandas needed)"""
+    from data_schema import skip_preamble
+    
+    with open(path, 'r', newline='', encoding='utf-8', errors='replace') as f:
+        return list(csv.DictReader(skip_preamble(f)))
+
+
+def main():
+    """Command line entry point: HTML dashboard of a history CSV"""
+    if len(sys.argv) < 2:
+        print("Usage: python svg_report.py <history.csv> [output.html]")
+        return
+    
+    source = sys.argv[1]
+    output = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source)[0] + "_dashboard.html"
+    rows = read_csv_rows(source)
+    computer_name = rows[-1].get('computer_id', '') if rows else ''
+    write_html_report(rows, output, computer_name)
+    print(f"✅ Wrote {len(rows)} samples to {output} ({os.path.getsize(output):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
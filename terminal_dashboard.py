@@ -0,0 +1,332 @@
+# terminal_dashboard.py
+"""
+Full-screen curses view of the collector for headless servers (top-style).
+
+display_current_status prints an 80-column block on every tick, which
+scrolls away and puts terminal output inside the collection loop. Here the
+collector runs in a background thread (LiveCollector) and hands every sample
+to a queue; the screen is drawn from the main thread at its own pace, so a
+slow terminal never delays sampling. Each metric gets a sparkline built from
+the in-memory ring buffer. curses keeps a copy of the screen and only sends
+the cells that changed since the last refresh.
+
+While the view is open, the pipeline's own status messages are captured and
+the latest one is shown on the bottom line instead of being printed over
+the screen.
+
+On Windows curses needs: pip install windows-curses
+
+Usage:
+    python terminal_dashboard.py [live] [interval_seconds] [duration_minutes]
+    python terminal_dashboard.py replay <source> [speed|max]
+"""
+
+import sys
+import time
+import queue
+import datetime
+import threading
+import collections
+from data_schema import flatten_status
+from timestamps import to_epoch_ns
+
+DEFAULT_INTERVAL_SECONDS = 1.0
+DEFAULT_POLL_SECONDS = 0.2
+SPARKLINE_POINTS = 512
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+# (label, column, unit, scale, warn at, alert at) - thresholds None for metrics without a bad direction
+TERMINAL_METRICS = [
+    ('CPU', 'cpu_percent', '%', 1, 70, 90),
+    ('Memory', 'memory_percent', '%', 1, 80, 90),
+    ('Disk', 'disk_percent', '%', 1, 85, 95),
+    ('Processes', 'process_count', '', 1, None, None),
+    ('Net sent', 'network_sent_mb', 'MB', 1, None, None),
+    ('Net recv', 'network_recv_mb', 'MB', 1, None, None),
+    ('Temperature', 'temperature', '°C', 1, 70, 85),
+    ('Uptime', 'uptime_hours', 'd', 1 / 24, None, None),
+    ('Security score', 'security_score', '/100', 1, None, None),
+    ('Suspicious', 'suspicious_activity_count', '', 1, 1, 3),
+    ('Vulnerabilities', 'vulnerability_count', '', 1, 1, 3)
+]
+
+
+def _import_curses():
+    """Import curses on first use, with an install hint when it is missing"""
+    try:
+        import curses
+    except ImportError:
+        raise ImportError("curses is not available. On Windows install it with: pip install windows-curses")
+    return curses
+
+
+def sparkline(values, width):
+    """The last `width` values as block characters scaled to their own min..max (blank for missing)"""
+    import numpy as np
+    
+    values = np.asarray(values[-width:], dtype='float64') if width > 0 else np.empty(0)
+    valid = values[~np.isnan(values)]
+    if not len(valid):
+        return " " * len(values)
+    low, high = valid.min(), valid.max()
+    levels = np.zeros(len(values), dtype='int64') if high == low else \
+        np.clip(((values - low) / (high - low) * (len(SPARK_CHARS) - 1)).round(), 0, len(SPARK_CHARS) - 1)
+    return "".join(" " if np.isnan(value) else SPARK_CHARS[int(level)] for value, level in zip(values, levels))
+
+
+class StatusCapture:
+    """Stands in for sys.stdout while the screen is open; keeps the latest messages"""
+    
+    def __init__(self, keep=50):
+        self.lines = collections.deque(maxlen=keep)
+        self.lock = threading.Lock()
+    
+    def write(self, text):
+        with self.lock:
+            for line in text.splitlines():
+                if line.strip():
+                    self.lines.append(line.strip())
+        return len(text)
+    
+    def flush(self):
+        pass
+    
+    def latest(self):
+        with self.lock:
+            return self.lines[-1] if self.lines else ""
+
+
+class TerminalDashboard:
+    """Top-style curses view over a queue of samples"""
+    
+    def __init__(self, computer_name="", history_points=SPARKLINE_POINTS):
+        from live_dashboard import SampleWindow
+        
+        self.computer_name = computer_name
+        self.window = SampleWindow(len(TERMINAL_METRICS), history_points)
+        self.samples = queue.Queue()
+        self.latest = None
+        self.received = 0
+        self.status = None
+        self.last_draw_seconds = 0.0
+    
+    def push(self, record):
+        """Queue a nested status record or flat row; safe to call from any thread"""
+        self.samples.put(flatten_status(record))
+    
+    def subscribe(self, monitor):
+        """Receive every sample the monitor processes, starting with the recent ones that fit the sparklines"""
+        recent = list(monitor.data_log)[-self.window.window_points:]
+        for record in recent:
+            self.push(record)
+        monitor.add_sample_listener(self.push)
+    
+    def unsubscribe(self, monitor):
+        monitor.remove_sample_listener(self.push)
+    
+    def drain(self):
+        """Move queued samples into the ring buffer; returns how many arrived"""
+        new_rows = 0
+        while True:
+            try:
+                row = self.samples.get_nowait()
+            except queue.Empty:
+                return new_rows
+            if row.get('timestamp') is None:
+                continue
+            self.window.append(to_epoch_ns(row['timestamp']), [
+                None if row.get(column) is None else float(row[column]) * scale
+                for _, column, _, scale, _, _ in TERMINAL_METRICS
+            ])
+            self.latest = row
+            self.received += 1
+            new_rows += 1
+    
+    def _put(self, screen, y, x, text, attr=0):
+        """Write text clipped to the screen (curses raises when writing the last cell)"""
+        height, width = screen.getmaxyx()
+        if 0 <= y < height and x < width:
+            try:
+                screen.addnstr(y, x, text, width - x - 1, attr)
+            except Exception:
+                pass
+    
+    def _level_attr(self, curses, value, warn, alert):
+        if value is None or warn is None or not curses.has_colors():
+            return 0
+        if value >= alert:
+            return curses.color_pair(3) | curses.A_BOLD
+        if value >= warn:
+            return curses.color_pair(2)
+        return curses.color_pair(1)
+    
+    def draw(self, screen, curses):
+        """Render the whole view into curses' buffer; refresh() then sends only the changed cells"""
+        started = time.perf_counter()
+        height, width = screen.getmaxyx()
+        row = self.latest or {}
+        
+        if row:
+            sampled = datetime.datetime.fromtimestamp(to_epoch_ns(row['timestamp']) / 1e9).strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            sampled = "waiting for the first sample..."
+        self._put(screen, 0, 0, f" Security Monitor - {self.computer_name}".ljust(width), curses.A_REVERSE)
+        self._put(screen, 1, 0, f" Last sample: {sampled}   Samples: {self.received}   Queue: {self.samples.qsize()}")
+        screen.clrtoeol()
+        
+        label_width = max(len(label) for label, *_ in TERMINAL_METRICS) + 2
+        value_width = 14
+        spark_x = 1 + label_width + value_width
+        spark_width = max(0, width - spark_x - 2)
+        
+        self._put(screen, 3, 1, "METRIC".ljust(label_width) + "NOW".rjust(value_width - 2), curses.A_BOLD)
+        self._put(screen, 3, spark_x, f"LAST {min(spark_width, len(self.window))} SAMPLES".ljust(spark_width), curses.A_BOLD)
+        
+        for index, (label, column, unit, scale, warn, alert) in enumerate(TERMINAL_METRICS):
+            y = 4 + index
+            value = row.get(column)
+            value = None if value is None else float(value) * scale
+            text = "n/a" if value is None else f"{value:,.1f}{unit}"
+            self._put(screen, y, 1, label.ljust(label_width))
+            self._put(screen, y, 1 + label_width, text.rjust(value_width - 2).ljust(value_width),
+                      self._level_attr(curses, value, warn, alert))
+            self._put(screen, y, spark_x, sparkline(self.window.series_view(index), spark_width).ljust(spark_width))
+        
+        y = 5 + len(TERMINAL_METRICS)
+        if row:
+            av = "on" if row.get('antivirus_enabled') else "OFF"
+            rtp = "on" if row.get('real_time_protection') else "OFF"
+            age = row.get('definition_age_days')
+            self._put(screen, y, 1, f"Antivirus: {av}   Real-time protection: {rtp}   "
+                                    f"Definitions: {'n/a' if age is None else f'{age} days old'}")
+            screen.clrtoeol()
+        
+        status = self.status.latest() if self.status is not None else ""
+        self._put(screen, height - 1, 0, f" q: quit | draw {self.last_draw_seconds * 1000:.1f} ms | {status}".ljust(width),
+                  curses.A_REVERSE)
+        self.last_draw_seconds = time.perf_counter() - started
+    
+    def run(self, screen, poll_seconds=DEFAULT_POLL_SECONDS, until=None):
+        """curses main loop: redraw when samples arrive or the terminal is resized; q quits"""
+        curses = _import_curses()
+        
+        try:
+            curses.curs_set(0)
+        except Exception:
+            pass
+        if curses.has_colors():
+            curses.use_default_colors()
+            curses.init_pair(1, curses.COLOR_GREEN, -1)
+            curses.init_pair(2, curses.COLOR_YELLOW, -1)
+            curses.init_pair(3, curses.COLOR_RED, -1)
+        screen.timeout(int(poll_seconds * 1000))
+        
+        dirty = True
+        while until is None or time.time() < until:
+            if self.drain():
+                dirty = True
+            if dirty:
+                self.draw(screen, curses)
+                screen.refresh()
+                dirty = False
+            key = screen.getch()
+            if key in (ord('q'), ord('Q'), 27):
+                break
+            if key == curses.KEY_RESIZE:
+                screen.erase()
+                dirty = True
+
+
+def show(dashboard, until=None):
+    """Open the full-screen view, capturing stdout while it is up"""
+    curses = _import_curses()
+    
+    dashboard.status = StatusCapture()
+    stdout = sys.stdout
+    sys.stdout = dashboard.status
+    try:
+        curses.wrapper(dashboard.run, until=until)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sys.stdout = stdout
+
+
+def run_terminal_dashboard(monitor, interval_seconds=DEFAULT_INTERVAL_SECONDS, duration_minutes=None):
+    """Collect in the background and show the full-screen view until q (or the duration ends)"""
+    from live_dashboard import LiveCollector
+    
+    try:
+        _import_curses()
+    except ImportError as e:
+        print(f"❌ {e}")
+        return None
+    
+    dashboard = TerminalDashboard(monitor.computer_name)
+    dashboard.subscribe(monitor)
+    collector = LiveCollector(monitor, interval_seconds)
+    until = None if duration_minutes is None else time.time() + duration_minutes * 60
+    
+    collector.start()
+    try:
+        show(dashboard, until)
+    finally:
+        collector.stop()
+        dashboard.unsubscribe(monitor)
+        monitor.flush_stores()
+    
+    print(f"✅ Terminal dashboard closed after {dashboard.received} samples")
+    return dashboard
+
+
+def replay_terminal_dashboard(source, speed="max"):
+    """Replay stored history into the full-screen view (through a scratch monitor, see replay.py)"""
+    from replay import replay
+    
+    try:
+        _import_curses()
+    except ImportError as e:
+        print(f"❌ {e}")
+        return None
+    
+    dashboard = TerminalDashboard(source)
+    stop = threading.Event()
+    worker = threading.Thread(target=replay, kwargs={"source": source, "speed": speed, "listeners": [dashboard.push], "stop": stop}, daemon=True)
+    worker.start()
+    try:
+        show(dashboard)
+    finally:
+        # End the replay before returning; its last messages stay in the status capture
+        stop.set()
+        stdout = sys.stdout
+        sys.stdout = dashboard.status or stdout
+        try:
+            worker.join()
+        finally:
+            sys.stdout = stdout
+    
+    print(f"✅ Terminal dashboard closed after {dashboard.received} replayed samples")
+    return dashboard
+
+
+def main():
+    """Command line entry point: full-screen view of this computer, or of a replayed history"""
+    args = sys.argv[1:]
+    command = args.pop(0) if args and args[0] in ('live', 'replay') else 'live'
+    
+    if command == 'replay':
+        if not args:
+            print("Usage: python terminal_dashboard.py replay <source> [speed|max]")
+            return
+        replay_terminal_dashboard(args[0], args[1] if len(args) > 1 else "max")
+        return
+    
+    from colector import SecurityEnhancedSystemMonitor
+    
+    interval_seconds = float(args[0]) if len(args) > 0 else DEFAULT_INTERVAL_SECONDS
+    duration_minutes = float(args[1]) if len(args) > 1 else None
+    run_terminal_dashboard(SecurityEnhancedSystemMonitor(), interval_seconds, duration_minutes)
+
+
+if __name__ == "__main__":
+    main()
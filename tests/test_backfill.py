@@ -0,0 +1,90 @@
+# test_backfill.py
+"""
+Backfill deduplication and resuming after an interrupted run.
+
+Run with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import backfill
+from backfill import Backfill
+from data_schema import write_csv
+from file_catalog import history_filename, json_history_filename
+from history_store import SQLiteHistoryStore, DEFAULT_DB_NAME
+
+START_NS = 1_750_000_000_000_000_000
+MINUTE_NS = 60_000_000_000
+
+
+def sample_rows(computer_id, count, first=0):
+    """Minute-spaced flat samples tagged with `computer_id`"""
+    return [{'timestamp': START_NS + (first + i) * MINUTE_NS, 'computer_name': computer_id,
+             'computer_id': computer_id, 'cpu_percent': float(first + i)} for i in range(count)]
+
+
+def stored_keys(data_dir):
+    """(computer_id, timestamp) of every row in the SQLite store"""
+    store = SQLiteHistoryStore(os.path.join(data_dir, DEFAULT_DB_NAME), read_only=True)
+    df = store.range()
+    store.close()
+    return list(zip(df['computer_id'], df['timestamp']))
+
+
+def test_overlapping_files_are_written_once(tmp_path):
+    data_dir = str(tmp_path)
+    # The CSV and the JSON dump of one computer share 20 samples
+    write_csv(os.path.join(data_dir, history_filename("PC-1")), sample_rows("PC-1", 30))
+    with open(os.path.join(data_dir, json_history_filename("PC-1")), 'w') as f:
+        json.dump(sample_rows("PC-1", 30, first=10), f)
+    
+    stats = Backfill(data_dir, "sqlite", workers=1).run(verbose=False)
+    assert stats["converted"] == 2
+    assert stats["rows_read"] == 60
+    assert stats["rows_written"] == 40
+    assert stats["duplicates"] == 20
+    
+    keys = stored_keys(data_dir)
+    assert len(keys) == len(set(keys)) == 40
+
+
+def test_resume_after_interruption(tmp_path, monkeypatch):
+    data_dir = str(tmp_path)
+    for name in ("PC-1", "PC-2", "PC-3"):
+        write_csv(os.path.join(data_dir, history_filename(name)), sample_rows(name, 10))
+    
+    write = backfill.BackfillTarget.write
+    calls = []
+    
+    def interrupted_write(target, df):
+        calls.append(len(df))
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return write(target, df)
+    
+    monkeypatch.setattr(backfill.BackfillTarget, "write", interrupted_write)
+    with pytest.raises(KeyboardInterrupt):
+        Backfill(data_dir, "sqlite", workers=1).run(verbose=False)
+    monkeypatch.setattr(backfill.BackfillTarget, "write", write)
+    assert len(stored_keys(data_dir)) == 10
+    
+    # The checkpoint holds the finished file only
+    stats = Backfill(data_dir, "sqlite", workers=1).run(verbose=False)
+    assert (stats["skipped"], stats["converted"], stats["rows_written"]) == (1, 2, 20)
+    
+    stats = Backfill(data_dir, "sqlite", workers=1).run(verbose=False)
+    assert (stats["skipped"], stats["converted"]) == (3, 0)
+    
+    # A file that changed since is converted again, and only its new row is written
+    write_csv(os.path.join(data_dir, history_filename("PC-2")), sample_rows("PC-2", 1, first=10))
+    stats = Backfill(data_dir, "sqlite", workers=1).run(verbose=False)
+    assert (stats["skipped"], stats["converted"], stats["rows_read"], stats["rows_written"]) == (2, 1, 11, 1)
+    
+    keys = stored_keys(data_dir)
+    assert len(keys) == len(set(keys)) == 31
@@ -0,0 +1,84 @@
+# test_chart_cache.py
+"""
+Chart cache hits and least-recently-used eviction.
+
+Run with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+import itertools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import chart_cache
+from chart_cache import ChartCache, chart_key
+
+START_NS = 1_750_000_000_000_000_000
+MINUTE_NS = 60_000_000_000
+
+
+def history(rows):
+    """Small plotting frame with `rows` samples"""
+    return pd.DataFrame({'timestamp': pd.to_datetime([START_NS + i * MINUTE_NS for i in range(rows)]),
+                         'cpu_percent': [float(i) for i in range(rows)]})
+
+
+def render(charts_dir, name, size=100):
+    """Stand-in for a rendered image"""
+    path = os.path.join(charts_dir, name)
+    with open(path, 'wb') as f:
+        f.write(b'\0' * size)
+    return path
+
+
+def test_unchanged_data_hits_the_cache(tmp_path):
+    charts_dir = str(tmp_path)
+    key = chart_key('cpu', 'PC-1', history(10), {'dpi': 100})
+    assert key == chart_key('cpu', 'PC-1', history(10), {'dpi': 100})
+    assert key != chart_key('cpu', 'PC-1', history(11), {'dpi': 100})
+    assert key != chart_key('cpu', 'PC-1', history(10), {'dpi': 150})
+    
+    cache = ChartCache(charts_dir)
+    assert cache.lookup(key) is None
+    path = render(charts_dir, "cpu.png")
+    cache.store(key, path, 'cpu', 'PC-1')
+    cache.commit()
+    
+    reopened = ChartCache(charts_dir)
+    assert reopened.lookup(key) == path
+    assert (reopened.hits, reopened.misses) == (1, 0)
+    
+    # An image deleted by hand is a miss, not a stale path
+    os.remove(path)
+    assert reopened.lookup(key) is None
+
+
+def test_least_recently_used_images_are_evicted(tmp_path, monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr(chart_cache, "now_ns", lambda: next(clock))
+    charts_dir = str(tmp_path)
+    cache = ChartCache(charts_dir, max_entries=3, max_bytes=None)
+    paths = {name: render(charts_dir, f"{name}.png") for name in "abcd"}
+    for name in "abc":
+        cache.store(name, paths[name])
+    assert cache.lookup("a") == paths["a"]
+    
+    cache.store("d", paths["d"])
+    assert cache.commit() == [paths["b"]]
+    assert not os.path.exists(paths["b"])
+    assert sorted(ChartCache(charts_dir).load()) == ["a", "c", "d"]
+    
+    # Images in use by the current run survive even when least recently used
+    cache.max_entries = 2
+    assert cache.commit(keep={"c"}) == [paths["a"]]
+    assert sorted(cache.load()) == ["c", "d"]
+    
+    # The byte limit evicts as well, and a foreign image is left alone
+    foreign = render(charts_dir, "mine.png")
+    cache.max_entries = None
+    cache.max_bytes = 150
+    assert cache.commit() == [paths["c"]]
+    assert os.path.exists(foreign) and os.path.exists(paths["d"])
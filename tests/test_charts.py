@@ -0,0 +1,53 @@
+# test_charts.py
+"""
+Parallel chart rendering writes every chart and reuses unchanged ones.
+
+Run with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+matplotlib.use('Agg')
+
+from charts import render_chart_sets, frame_from_rows, chart_filename, chart_kinds_for
+from chart_cache import ChartCache
+
+START_NS = 1_750_000_000_000_000_000
+MINUTE_NS = 60_000_000_000
+
+
+def sample_frame(computer_id, count):
+    """Plotting frame of flat samples with system and security columns"""
+    return frame_from_rows([{'timestamp': START_NS + i * MINUTE_NS, 'computer_id': computer_id,
+                             'cpu_percent': float(i % 50), 'memory_percent': 40.0 + i % 10,
+                             'memory_used_gb': 6.0, 'memory_total_gb': 16.0, 'disk_percent': 70.0,
+                             'process_count': 200 + i % 5, 'security_score': 80 - i % 3,
+                             'antivirus_enabled': True, 'real_time_protection': i % 7 != 0,
+                             'suspicious_activity_count': i % 4, 'vulnerability_count': 1} for i in range(count)])
+
+
+def test_parallel_render_writes_every_chart(tmp_path):
+    charts_dir = str(tmp_path)
+    chart_sets = [(name, sample_frame(name, 120), True, "20250615_120000") for name in ("PC-1", "PC-2")]
+    cache = ChartCache(charts_dir)
+    
+    results = render_chart_sets(chart_sets, charts_dir, workers=2, profile="preview", cache=cache)
+    for name, df, save_individual, timestamp in chart_sets:
+        expected = [os.path.join(charts_dir, chart_filename(kind, name, timestamp))
+                    for kind in chart_kinds_for(df, save_individual)]
+        assert len(expected) == 4
+        assert sorted(results[name]) == sorted(expected)
+        assert all(os.path.getsize(path) > 0 for path in expected)
+    
+    # Unchanged data is served from the cache without drawing again
+    for path in results["PC-1"] + results["PC-2"]:
+        os.utime(path, ns=(0, 0))
+    again = render_chart_sets([(name, df, True, "20250615_130000") for name, df, _, _ in chart_sets],
+                              charts_dir, workers=2, profile="preview", cache=ChartCache(charts_dir))
+    assert {name: sorted(paths) for name, paths in again.items()} == {name: sorted(paths) for name, paths in results.items()}
+    assert all(os.stat(path).st_mtime_ns == 0 for paths in again.values() for path in paths)
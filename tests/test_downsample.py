@@ -0,0 +1,57 @@
+# test_downsample.py
+"""
+Downsampling keeps the points a chart must not lose.
+
+Run with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from downsample import lttb, lttb_indices, minmax_envelope
+
+START_NS = 1_750_000_000_000_000_000
+MINUTE_NS = 60_000_000_000
+
+
+def noisy_series(length=20_000):
+    """Minute-spaced noise around 40 with one spike and one dip"""
+    rng = np.random.default_rng(11)
+    x = START_NS + np.arange(length, dtype='int64') * MINUTE_NS
+    y = 40 + rng.normal(0, 2, length)
+    y[length * 3 // 8] = 99.0
+    y[length * 3 // 4] = 1.0
+    return x, y
+
+
+def test_lttb_keeps_endpoints_and_extrema():
+    x, y = noisy_series()
+    indices = lttb_indices(x, y, 500)
+    assert len(indices) == 500
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert (np.diff(indices) > 0).all()
+    assert int(np.argmax(y)) in indices
+    assert int(np.argmin(y)) in indices
+    
+    small_x, small_y = lttb(x.astype('datetime64[ns]'), y, 500)
+    assert small_x[0] == x[0].astype('datetime64[ns]') and small_x[-1] == x[-1].astype('datetime64[ns]')
+    assert small_y.max() == y.max() and small_y.min() == y.min()
+
+
+def test_short_series_are_unchanged():
+    x, y = noisy_series(100)
+    assert lttb_indices(x, y, 500).tolist() == list(range(100))
+    small_x, lower, upper = minmax_envelope(x, y, 500)
+    assert np.array_equal(small_x, x) and np.array_equal(lower, y) and np.array_equal(upper, y)
+
+
+def test_envelope_keeps_every_extreme():
+    x, y = noisy_series()
+    _, lower, upper = minmax_envelope(x, y, 300)
+    assert len(lower) == len(upper) == 300
+    assert upper.max() == y.max() and lower.min() == y.min()
+    assert (lower <= upper).all()
@@ -0,0 +1,84 @@
+# test_gorilla_store.py
+"""
+Round trips through the Gorilla segment codec and segment files.
+
+Run with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+from gorilla_store import (GorillaSegmentWriter, GorillaSegmentReader, encode_timestamps, decode_timestamps,
+                           encode_floats, decode_floats)
+
+START_NS = 1_750_000_000_000_000_000
+MINUTE_NS = 60_000_000_000
+
+TIMESTAMP_CASES = {
+    'regular': [START_NS + i * MINUTE_NS for i in range(300)],
+    'jitter': [START_NS + i * MINUTE_NS + (i * 7919) % 5_000_000 for i in range(300)],
+    'out of order': [START_NS + ((i * 37) % 300) * MINUTE_NS for i in range(300)],
+    'huge jumps': [START_NS + i * MINUTE_NS + (10**17 if i % 10 == 0 else 0) for i in range(300)],
+    'single': [START_NS],
+}
+
+
+def float_cases():
+    rng = np.random.default_rng(3)
+    walk = np.clip(50 + np.cumsum(rng.normal(0, 1, 300)), 0, 100)
+    return {
+        'walk': walk.tolist(),
+        'gaps': [float('nan') if i % 7 == 0 else value for i, value in enumerate(walk)],
+        'constant with NaN': [float('nan') if i % 97 == 0 else 16.0 for i in range(300)],
+        'all NaN': [float('nan')] * 50,
+        'extremes': [0.0, -0.0, 1e-308, -1e308, float('inf'), float('-inf'), 42.0] * 10,
+    }
+
+
+@pytest.mark.parametrize("name", TIMESTAMP_CASES)
+def test_timestamp_round_trip(name):
+    values = TIMESTAMP_CASES[name]
+    encoded = encode_timestamps(values)
+    for count in sorted({1, 2, 3, len(values)}):
+        if count > len(values):
+            continue
+        out = np.zeros(count + 3, dtype='int64')
+        decode_timestamps(encoded, count, out, 3)
+        assert out[3:].tolist() == values[:count]
+
+
+@pytest.mark.parametrize("name", list(float_cases()))
+def test_float_round_trip_keeps_nan_bits(name):
+    values = float_cases()[name]
+    expected = np.asarray(values, dtype='float64').view('uint64')
+    out = np.zeros(len(values) + 2, dtype='uint64')
+    decode_floats(encode_floats(values), len(values), out, 2)
+    assert (out[2:] == expected).all()
+
+
+def test_segment_file_round_trip_with_late_samples(tmp_path):
+    path = str(tmp_path / "segments.gts")
+    rows = [{'timestamp': START_NS + i * MINUTE_NS, 'computer_id': 'PC-1', 'os_system': 'Windows',
+             'cpu_percent': None if i % 11 == 0 else float(i % 100), 'process_count': 100 + i,
+             'antivirus_enabled': i % 2 == 0} for i in range(120)]
+    # Samples arrive out of order, and some only after later blocks were written
+    arrival = rows[40:80][::-1] + rows[:40] + rows[80:]
+    writer = GorillaSegmentWriter(path, block_rows=25)
+    writer.insert_samples(arrival)
+    writer.close()
+    
+    frame = GorillaSegmentReader(path).read_frame()
+    assert frame['timestamp'].tolist() == [row['timestamp'] for row in rows]
+    assert frame['process_count'].tolist() == [row['process_count'] for row in rows]
+    assert frame['antivirus_enabled'].tolist() == [row['antivirus_enabled'] for row in rows]
+    cpu = frame['cpu_percent'].to_numpy()
+    assert np.isnan(cpu[::11]).all()
+    assert np.array_equal(cpu, [np.nan if row['cpu_percent'] is None else row['cpu_percent'] for row in rows], equal_nan=True)
+    
+    window = GorillaSegmentReader(path).read_frame(START_NS + 30 * MINUTE_NS, START_NS + 59 * MINUTE_NS)
+    assert window['timestamp'].tolist() == [row['timestamp'] for row in rows[30:60]]
@@ -0,0 +1,109 @@
+# test_history_loader.py
+"""
+Loading history files and stores from a data directory.
+
+Run with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import history_loader
+from data_schema import write_csv
+from file_catalog import history_filename
+from history_loader import IncrementalCSVLoader, history_frames, merge_by_timestamp
+
+START_NS = 1_750_000_000_000_000_000
+MINUTE_NS = 60_000_000_000
+
+
+def sample_rows(computer_id, count, first=0):
+    """Minute-spaced flat samples tagged with `computer_id`"""
+    return [{'timestamp': START_NS + (first + i) * MINUTE_NS, 'computer_name': computer_id,
+             'computer_id': computer_id, 'cpu_percent': float(i)} for i in range(count)]
+
+
+def test_rows_keep_an_id_that_differs_from_the_filename(tmp_path):
+    data_dir = str(tmp_path)
+    # Files are named after the computer name, rows carry the generated computer ID
+    write_csv(os.path.join(data_dir, history_filename("Laptop_Windows")), sample_rows("LAPTOP_7NF3NNFS_Windows_26eb5b", 27))
+    write_csv(os.path.join(data_dir, history_filename("MSI_Windows")), sample_rows("MSI_Windows", 20))
+    
+    frames = list(history_frames(data_dir))
+    assert sum(len(frame) for frame in frames) == 47
+    
+    merged = merge_by_timestamp(frames)
+    assert sorted(merged['computer_id'].unique()) == ["LAPTOP_7NF3NNFS_Windows_26eb5b", "MSI_Windows"]
+    
+    # An explicit computer still filters on the ID in the rows
+    single = list(history_frames(os.path.join(data_dir, history_filename("Laptop_Windows")), "LAPTOP_7NF3NNFS_Windows_26eb5b"))
+    assert sum(len(frame) for frame in single) == 27
+
+
+def test_incremental_loader_parses_only_appended_rows(tmp_path, monkeypatch):
+    path = os.path.join(str(tmp_path), history_filename("PC-1"))
+    write_csv(path, sample_rows("PC-1", 10))
+    full_loads = []
+    parse_whole_file = history_loader.parse_whole_file
+    monkeypatch.setattr(history_loader, "parse_whole_file",
+                        lambda *args: full_loads.append(args[0]) or parse_whole_file(*args))
+    
+    loader = IncrementalCSVLoader()
+    assert len(loader.load(path)) == 10
+    
+    # Appended rows are read from the tail; a half-written line waits for its newline
+    write_csv(path, sample_rows("PC-1", 5, first=10))
+    with open(path, 'ab') as f:
+        f.write(b"1750000900000000000,PC-1")
+    df = loader.load(path)
+    assert df['timestamp'].tolist() == [row['timestamp'] for row in sample_rows("PC-1", 15)]
+    assert df['cpu_percent'].tolist() == [float(i) for i in list(range(10)) + list(range(5))]
+    assert len(full_loads) == 1
+    
+    # A rewrite of the parsed region is detected even when the size stays the same
+    size = os.path.getsize(path)
+    rows = sample_rows("PC-1", 10) + sample_rows("PC-1", 5, first=10)
+    for row in rows:
+        row['cpu_percent'] = 9.0 - row['cpu_percent']
+    write_csv(path, rows, append=False)
+    with open(path, 'ab') as f:
+        f.write(b"1750000900000000000,PC-1")
+    assert os.path.getsize(path) == size
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    df = loader.load(path)
+    assert df['cpu_percent'].tolist() == [9.0 - i for i in list(range(10)) + list(range(5))]
+    assert len(full_loads) == 2
+    
+    # A truncated file is reloaded as well
+    write_csv(path, sample_rows("PC-1", 3), append=False)
+    assert len(loader.load(path)) == 3
+    assert len(full_loads) == 3
+
+
+def test_parallel_load_matches_serial_load(tmp_path):
+    data_dir = str(tmp_path)
+    paths = []
+    for n in range(6):
+        path = os.path.join(data_dir, history_filename(f"PC-{n}"))
+        write_csv(path, sample_rows(f"PC-{n}", 20 + n, first=n))
+        paths.append(path)
+    missing = os.path.join(data_dir, history_filename("PC-gone"))
+    
+    serial = IncrementalCSVLoader().load_many(paths + [missing], workers=1, progress=False)
+    for executor in ("process", "thread"):
+        loader = IncrementalCSVLoader()
+        parallel = loader.load_many(paths + [missing], workers=3, executor=executor, progress=False)
+        assert list(parallel) == paths + [missing]
+        assert isinstance(parallel[missing], FileNotFoundError)
+        for path in paths:
+            assert parallel[path].equals(serial[path])
+    
+    # The parallel parse seeds the cache, so an append is read from the tail
+    write_csv(paths[0], sample_rows("PC-0", 1, first=40))
+    df = loader.load(paths[0])
+    assert len(df) == 21 and df['timestamp'].iloc[-1] == START_NS + 40 * MINUTE_NS
+    assert set(loader.files) == set(paths)
@@ -0,0 +1,51 @@
+# test_history_store.py
+"""
+Read-only access to the SQLite history store.
+
+Run with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from history_store import SQLiteHistoryStore
+
+
+def test_read_only_open_leaves_the_database_alone(tmp_path):
+    path = str(tmp_path / "history.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE samples (timestamp INTEGER, computer_id TEXT, cpu_percent REAL)")
+    conn.execute("INSERT INTO samples VALUES (5, 'PC-1', 2.0)")
+    conn.commit()
+    conn.close()
+    
+    store = SQLiteHistoryStore(path, read_only=True)
+    df = store.range()
+    assert df['computer_id'].tolist() == ['PC-1']
+    assert 'security_score' in df.columns
+    with pytest.raises(sqlite3.OperationalError):
+        store.insert_samples([{'timestamp': 6, 'computer_id': 'PC-1'}])
+    store.close()
+    
+    conn = sqlite3.connect(path)
+    assert [row[1] for row in conn.execute("PRAGMA table_info(samples)")] == ['timestamp', 'computer_id', 'cpu_percent']
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+    conn.close()
+
+
+def test_reads_after_close_use_a_new_connection(tmp_path):
+    store = SQLiteHistoryStore(str(tmp_path / "history.db"))
+    store.insert_samples([{'timestamp': 1, 'computer_id': 'PC-1', 'cpu_percent': 1.0}])
+    assert len(store.range()) == 1
+    store.close()
+    
+    reader = SQLiteHistoryStore(str(tmp_path / "history.db"), read_only=True)
+    assert reader.computers() == ['PC-1']
+    reader.close()
+    assert reader.computers() == ['PC-1']
+    reader.close()
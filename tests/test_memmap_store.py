@@ -0,0 +1,62 @@
+# test_memmap_store.py
+"""
+Zero-copy reads from the memory-mapped history store.
+
+Run with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from memmap_store import MemmapHistoryWriter, MemmapHistoryReader
+
+START_NS = 1_750_000_000_000_000_000
+MINUTE_NS = 60_000_000_000
+
+
+def write_history(path, rows=50):
+    """Minute-spaced samples for one computer, with a gap in the OS text"""
+    writer = MemmapHistoryWriter(path)
+    writer.insert_samples([{
+        'timestamp': START_NS + i * MINUTE_NS,
+        'computer_id': 'PC-1',
+        'os_system': None if i % 10 == 0 else 'Windows',
+        'cpu_percent': float(i),
+        'process_count': 100 + i,
+        'antivirus_enabled': i % 2 == 0,
+    } for i in range(rows)])
+    writer.close()
+
+
+def test_numeric_columns_share_the_map(tmp_path):
+    path = str(tmp_path / "history.hist")
+    write_history(path)
+    reader = MemmapHistoryReader(path)
+    
+    frame = reader.read_frame()
+    for name in ('timestamp', 'cpu_percent', 'process_count', 'antivirus_enabled'):
+        assert np.shares_memory(frame[name].to_numpy(), reader.records), name
+    for name, view in reader.numeric_views().items():
+        assert np.shares_memory(view, reader.records), name
+    
+    window = reader.read_frame(START_NS + 10 * MINUTE_NS, START_NS + 19 * MINUTE_NS)
+    assert len(window) == 10
+    assert np.shares_memory(window['cpu_percent'].to_numpy(), reader.records)
+
+
+def test_text_columns_from_codes(tmp_path):
+    path = str(tmp_path / "history.hist")
+    write_history(path)
+    reader = MemmapHistoryReader(path)
+    
+    categorical = reader.read_frame()['os_system']
+    decoded = reader.read_frame(categories=False)['os_system']
+    assert str(categorical.dtype) == 'category'
+    assert categorical.isna().sum() == decoded.isna().sum() == 5
+    assert list(categorical.astype(object).where(categorical.notna(), None)) == \
+        list(decoded.astype(object).where(decoded.notna(), None))
+    assert (reader.read_frame()['process_count'].to_numpy() == 100 + np.arange(50)).all()
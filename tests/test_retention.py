@@ -0,0 +1,75 @@
+# test_retention.py
+"""
+Retention rolls aged samples into 5-minute and hourly buckets exactly once.
+
+Run with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+import csv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_schema import write_csv, read_history_csv
+from file_catalog import history_filename, rollup_filename
+from retention import RetentionEngine, load_rollups_as_samples
+from timestamps import NS_PER_SECOND
+
+HOUR_NS = 3600 * NS_PER_SECOND
+MINUTE_NS = 60 * NS_PER_SECOND
+DAY_NS = 24 * HOUR_NS
+START_NS = 1_750_000_000_000_000_000 // HOUR_NS * HOUR_NS
+NOW_NS = START_NS + 10 * DAY_NS
+
+
+def sample_rows(first, count):
+    """Minute-spaced samples whose cpu_percent is the minute number"""
+    return [{'timestamp': START_NS + i * MINUTE_NS, 'computer_name': 'PC-1', 'computer_id': 'PC-1',
+             'cpu_percent': float(i), 'antivirus_enabled': i % 2 == 0} for i in range(first, first + count)]
+
+
+def read_rollups(data_dir, tier):
+    """Rows of PC-1's rollup file for one tier"""
+    with open(os.path.join(data_dir, rollup_filename('PC-1', tier)), newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_raw_samples_roll_up_once(tmp_path):
+    data_dir = str(tmp_path)
+    raw_path = os.path.join(data_dir, history_filename('PC-1'))
+    # Two aged hours plus a recent hour that stays raw
+    write_csv(raw_path, sample_rows(0, 120) + sample_rows(9 * 24 * 60, 60))
+    
+    summary = RetentionEngine(data_dir, raw_days=7, rollup_5m_days=90).apply(NOW_NS)
+    assert summary['raw_rows_rolled'] == 120
+    assert len(read_history_csv(raw_path)) == 60
+    
+    buckets = read_rollups(data_dir, '5m')
+    assert [int(row['bucket_start']) for row in buckets] == [START_NS + i * 5 * MINUTE_NS for i in range(24)]
+    first = buckets[0]
+    assert (int(first['count']), float(first['cpu_percent_min']), float(first['cpu_percent_max'])) == (5, 0.0, 4.0)
+    assert (float(first['cpu_percent_mean']), float(first['cpu_percent_last'])) == (2.0, 4.0)
+    assert float(first['antivirus_enabled_mean']) == 0.6
+    
+    # A late sample behind the watermark is not rolled into a bucket a second time
+    write_csv(raw_path, sample_rows(3, 1))
+    summary = RetentionEngine(data_dir, raw_days=7, rollup_5m_days=90).apply(NOW_NS)
+    assert summary['raw_rows_rolled'] == 0
+    assert len(read_rollups(data_dir, '5m')) == 24
+    assert len(read_history_csv(raw_path)) == 60
+    
+    # Once the 5-minute tier ages out it becomes hourly rollups
+    summary = RetentionEngine(data_dir, raw_days=7, rollup_5m_days=9).apply(NOW_NS)
+    assert summary['rollup_rows_rolled'] == 24
+    assert read_rollups(data_dir, '5m') == []
+    hours = read_rollups(data_dir, '1h')
+    assert [int(row['bucket_start']) for row in hours] == [START_NS, START_NS + HOUR_NS]
+    assert [int(row['count']) for row in hours] == [60, 60]
+    assert [float(row['cpu_percent_mean']) for row in hours] == [29.5, 89.5]
+    assert [(float(row['cpu_percent_min']), float(row['cpu_percent_max'])) for row in hours] == [(0.0, 59.0), (60.0, 119.0)]
+    assert float(hours[1]['cpu_percent_last']) == 119.0
+    
+    samples = load_rollups_as_samples(data_dir, 'PC-1')
+    assert [sample['cpu_percent'] for sample in samples] == [29.5, 89.5]
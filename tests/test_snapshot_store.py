@@ -0,0 +1,71 @@
+# test_snapshot_store.py
+"""
+Delta snapshots rebuild the record that was current at any point in time.
+
+Run with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot_store import SnapshotWriter, SnapshotReader
+
+START_NS = 1_750_000_000_000_000_000
+TICK_NS = 30_000_000_000
+
+
+def status_records(count):
+    """Nested status records with changing, added and removed fields and cached security ticks"""
+    records = []
+    for i in range(count):
+        record = {
+            'timestamp': START_NS + i * TICK_NS,
+            'computer_info': {'computer_id': 'PC-1', 'hostname': 'pc-1'},
+            'cpu': {'usage_percent': float(i % 7), 'count': 8},
+            'memory': {'percent': 40.0 + i // 5},
+        }
+        if i % 3 == 0:
+            record['battery'] = {'percent': 100 - i, 'plugged': i % 2 == 0}
+        if i % 4 == 0:
+            record['security'] = {'security_score': 80 - i, 'suspicious_processes': [f"proc{n}" for n in range(i % 3)]}
+        else:
+            record['security'] = {'cached': True}
+        records.append(record)
+    return records
+
+
+def expected_states(records):
+    """What the reader should rebuild for each record (security carried forward)"""
+    states = []
+    for record in records:
+        state = dict(record)
+        if state['security'].get('cached') and states:
+            state['security'] = states[-1]['security']
+        states.append(state)
+    return states
+
+
+def test_at_rebuilds_every_record(tmp_path):
+    path = str(tmp_path / "snapshots.jsonl")
+    records = status_records(23)
+    writer = SnapshotWriter(path, keyframe_interval=4)
+    writer.insert_records(records[:15])
+    # A crash mid-line is dropped when the writer reopens, and deltas continue from the last state
+    with open(path, 'a') as f:
+        f.write('{"t": 1, "set": [[["cpu"')
+    writer = SnapshotWriter(path, keyframe_interval=4)
+    writer.insert_records(records[15:])
+    
+    reader = SnapshotReader(path)
+    assert len(reader.keyframes) == 6
+    states = expected_states(records)
+    for record, state in zip(records, states):
+        assert reader.at(record['timestamp']) == state
+        # Between ticks the earlier record is still current
+        assert reader.at(record['timestamp'] + TICK_NS // 2) == state
+    assert reader.at(START_NS - 1) is None
+    assert list(reader.records(states[5]['timestamp'], states[9]['timestamp'])) == states[5:10]
+    assert reader.latest() == (states[-1], 2)
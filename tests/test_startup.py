@@ -0,0 +1,26 @@
+# test_startup.py
+"""
+Status-only startup must not import the heavy plotting and data modules.
+
+Run with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib')
+
+
+def test_colector_import_skips_heavy_modules():
+    script = ("import sys, colector\n"
+              f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                            cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "", f"heavy modules imported at startup: {result.stdout.strip()}"
+    
+    imported = {line.split("|")[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+    assert not imported & set(HEAVY_MODULES)
@@ -0,0 +1,71 @@
+# test_zone_maps.py
+"""
+Zone-map pruning returns the same rows as a full scan.
+
+Run with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+from gorilla_store import GorillaSegmentWriter, GorillaSegmentReader
+from zone_maps import compute_zone, zone_may_match, row_mask, frame_mask
+
+START_NS = 1_750_000_000_000_000_000
+MINUTE_NS = 60_000_000_000
+
+PREDICATES = ["disk_percent>90", "disk_percent<=20", "disk_percent==50", "disk_percent!=50",
+              "cpu_percent>=75", "security_score<60", "os_system!=Windows"]
+
+
+def write_segments(path, rows=600, block_rows=50):
+    """Blocks with constant runs, gaps (NaN) and a block of constant 50s"""
+    rng = np.random.default_rng(7)
+    samples = []
+    for i in range(rows):
+        block = i // block_rows
+        if block == 3:
+            disk = 50.0
+        elif block == 4:
+            disk = None if i % 3 == 0 else 50.0
+        elif block == 5:
+            disk = None
+        else:
+            disk = float(rng.integers(0, 100))
+        samples.append({'timestamp': START_NS + i * MINUTE_NS, 'computer_id': 'PC-1',
+                        'os_system': None if block == 6 and i % 2 else 'Windows',
+                        'disk_percent': disk, 'cpu_percent': float(rng.integers(0, 100)),
+                        'security_score': int(rng.integers(40, 100))})
+    writer = GorillaSegmentWriter(path, block_rows=block_rows)
+    writer.insert_samples(samples)
+    writer.close()
+
+
+@pytest.mark.parametrize("predicate", PREDICATES)
+def test_pruned_read_matches_full_scan(tmp_path, predicate):
+    path = str(tmp_path / "segments.gts")
+    write_segments(path)
+    reader = GorillaSegmentReader(path)
+    
+    full = reader.read_frame()
+    expected = full[frame_mask(full, predicate)].reset_index(drop=True)
+    pruned = reader.read_frame(where=predicate)
+    
+    assert pruned['timestamp'].tolist() == expected['timestamp'].tolist()
+    assert reader.last_scan['blocks_read'] <= reader.last_scan['blocks_total']
+
+
+def test_not_equal_ignores_gaps_like_the_zone():
+    values = np.array([50.0, np.nan, 50.0])
+    zone = compute_zone(values)
+    assert not zone_may_match(zone, '!=', 50.0)
+    assert not row_mask({'disk_percent': values}, [('disk_percent', '!=', 50.0)], 3).any()
+    
+    gaps_only = np.array([np.nan, np.nan])
+    assert not zone_may_match(compute_zone(gaps_only), '!=', 50.0)
+    assert not row_mask({'disk_percent': gaps_only}, [('disk_percent', '!=', 50.0)], 2).any()
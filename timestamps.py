@@ -0,0 +1,137 @@
+# timestamps.py
+"""
+Epoch timestamp helpers shared by the monitors, stores and loaders.
+
+Samples carry `timestamp` as an int64 count of nanoseconds since the Unix epoch.
+ISO strings are only produced at display and export boundaries. Rows written
+by older versions hold naive local-time ISO strings (datetime.isoformat()), so
+every reader here accepts both forms.
+"""
+
+import time
+import datetime
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MICROSECOND = 1_000
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def now_ns():
+    """Current time as integer epoch nanoseconds"""
+    return time.time_ns()
+
+
+def to_epoch_ns(value):
+    """Convert an epoch-ns value, datetime or legacy ISO string to epoch nanoseconds"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise TypeError("Boolean is not a valid timestamp")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if hasattr(value, 'to_pydatetime'):
+        # pandas.Timestamp - naive values are local time, like legacy rows
+        if value.tzinfo is None:
+            value = value.tz_localize(_local_timezone())
+        return int(value.as_unit('ns').value)
+    if isinstance(value, datetime.datetime):
+        return _datetime_to_ns(value)
+    
+    text = str(value).strip()
+    if text.lstrip('-').isdigit():
+        return int(text)
+    return _datetime_to_ns(datetime.datetime.fromisoformat(text))
+
+
+def _datetime_to_ns(dt):
+    """Convert a datetime (naive values are treated as local time) to epoch nanoseconds"""
+    if dt.tzinfo is None:
+        dt = dt.astimezone()
+    delta = dt - EPOCH
+    return (delta.days * 86400 + delta.seconds) * NS_PER_SECOND + delta.microseconds * NS_PER_MICROSECOND
+
+
+def to_datetime(value):
+    """Convert a timestamp to a naive local datetime for display"""
+    ns = to_epoch_ns(value)
+    seconds, remainder = divmod(ns, NS_PER_SECOND)
+    return datetime.datetime.fromtimestamp(seconds).replace(microsecond=remainder // NS_PER_MICROSECOND)
+
+
+def to_iso(value):
+    """Format a timestamp as a local ISO string (display/export only)"""
+    return to_datetime(value).isoformat()
+
+
+def epoch_ns_series(series):
+    """Vectorised conversion of a timestamp column to int64 epoch nanoseconds
+    
+    Integer columns are returned as-is. Text columns may mix epoch-ns digits with
+    legacy ISO strings; the ISO rows are parsed as local time. Unparseable rows
+    become <NA>.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if pd.api.types.is_integer_dtype(series):
+        if series.isna().any():
+            return series.astype('Int64')
+        return series.astype('int64')
+    if pd.api.types.is_float_dtype(series):
+        return series.round().astype('Int64')
+    if pd.api.types.is_datetime64_any_dtype(series):
+        if series.dt.tz is None:
+            series = series.dt.tz_localize(_local_timezone(), ambiguous='NaT', nonexistent='shift_forward')
+        return _checked_int64(series.dt.tz_convert('UTC').dt.as_unit('ns'))
+    
+    text = series.astype('string').str.strip()
+    is_epoch = text.str.fullmatch(r'-?\d+').fillna(False).to_numpy(dtype=bool)
+    values = np.zeros(len(series), dtype='int64')
+    valid = is_epoch.copy()
+    
+    if is_epoch.any():
+        values[is_epoch] = text[is_epoch].astype('int64').to_numpy()
+    
+    legacy = ~is_epoch & text.notna().to_numpy(dtype=bool)
+    if legacy.any():
+        parsed = pd.to_datetime(text[legacy], format='ISO8601', errors='coerce')
+        if parsed.dt.tz is None:
+            parsed = parsed.dt.tz_localize(_local_timezone(), ambiguous='NaT', nonexistent='shift_forward')
+        parsed = parsed.dt.tz_convert('UTC').dt.as_unit('ns')
+        parsed_ok = parsed.notna().to_numpy(dtype=bool)
+        legacy_positions = np.flatnonzero(legacy)
+        values[legacy_positions[parsed_ok]] = parsed[parsed_ok].astype('int64').to_numpy()
+        valid[legacy_positions[parsed_ok]] = True
+    
+    if valid.all():
+        return pd.Series(values, index=series.index, name=series.name)
+    return pd.Series(pd.arrays.IntegerArray(values, ~valid), index=series.index, name=series.name)
+
+
+def _checked_int64(series):
+    """Cast a datetime column to epoch-ns integers, keeping NaT as <NA>"""
+    import pandas as pd
+    
+    missing = series.isna().to_numpy(dtype=bool)
+    if missing.any():
+        values = pd.arrays.IntegerArray(series.array.asi8.copy(), missing)
+        return pd.Series(values, index=series.index, name=series.name)
+    return series.astype('int64')
+
+
+def to_local_datetime(series):
+    """Convert an epoch-ns column to naive local datetimes for plotting and features"""
+    import pandas as pd
+    
+    ns = epoch_ns_series(series)
+    utc = pd.to_datetime(ns, unit='ns', utc=True)
+    return utc.dt.tz_convert(_local_timezone()).dt.tz_localize(None)
+
+
+def _local_timezone():
+    """Local timezone object understood by pandas"""
+    from dateutil import tz
+    return tz.tzlocal()
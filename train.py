@@ -10,6 +10,15 @@ import seaborn as sns
 from datetime import datetime
 import warnings
 import os
+from history_store import SQLiteHistoryStore
+from gorilla_store import read_segment_frame
+from zone_maps import frame_mask
+from data_schema import read_history_csv, apply_schema
+from memmap_store import read_memmap_frame
+from file_catalog import HistoryFileCatalog
+from history_loader import IncrementalCSVLoader, merge_by_timestamp, history_frames
+from timestamps import to_local_datetime
+from data_manifest import DataManifest
 warnings.filterwarnings('ignore')
 
 class SecurityEnhancedComputerHealthAI:
@@ -33,57 +42,77 @@ class SecurityEnhancedComputerHealthAI:
             'suspicious_activity_count', 'vulnerability_count', 'security_software_count'
         ]
         
-    def load_security_data(self, csv_file_path):
-        """Load and preprocess the security-enhanced monitoring data"""
+    def load_security_data(self, csv_file_path, where=None, workers=None):
+        """Load and preprocess the security-enhanced monitoring data
+        
+        `where` takes predicates such as "disk_percent>90"; segment files and
+        directories of them only decode the blocks whose zone maps can match.
+        A directory of CSV history files is parsed by `workers` processes.
+        """
         try:
             print(f"📊 Loading security data from {csv_file_path}...")
             
             # Try to load the security-enhanced data first
-            if os.path.exists(csv_file_path):
-                df = pd.read_csv(csv_file_path)
+            if csv_file_path.endswith(('.db', '.sqlite')) and os.path.exists(csv_file_path):
+                # Indexed SQLite history store (all computers)
+                store = SQLiteHistoryStore(csv_file_path, read_only=True)
+                df = store.range()
+                store.close()
+            elif csv_file_path.endswith('.gts') and os.path.exists(csv_file_path):
+                # Compressed segment file (one computer)
+                df = read_segment_frame(csv_file_path, where=where)
+            elif csv_file_path.endswith('.hist') and os.path.exists(csv_file_path):
+                # Memory-mapped history file (one computer, pages shared with other readers)
+                df = read_memmap_frame(csv_file_path)
+            elif os.path.isdir(csv_file_path) and any(name.endswith(('.db', '.gts', '.hist')) for name in os.listdir(csv_file_path)):
+                # A data directory with history stores: each computer's store merged with the
+                # CSV history it does not cover (segments only decode blocks that can match)
+                df = merge_by_timestamp(list(history_frames(csv_file_path, where=where)))
+                if len(df) == 0:
+                    raise FileNotFoundError(f"No matching history in {csv_file_path}")
+            elif os.path.isdir(csv_file_path):
+                # Every computer's CSV history, parsed in parallel and merged by timestamp
+                paths = [path for paths in HistoryFileCatalog(csv_file_path).scan().values() for path in paths]
+                if not paths:
+                    raise FileNotFoundError(f"No security monitoring files found in {csv_file_path}")
+                loaded = IncrementalCSVLoader().load_many(paths, workers=workers)
+                frames = []
+                for path, frame in loaded.items():
+                    if isinstance(frame, Exception):
+                        print(f"⚠️  Error loading {path}: {frame}")
+                    else:
+                        frames.append(frame)
+                df = merge_by_timestamp(frames)
+            elif os.path.exists(csv_file_path):
+                df = read_history_csv(csv_file_path)
             else:
-                # Fallback to look for any security files in data directory
+                # Fallback to the data directory manifest
                 data_dir = "data"
                 if os.path.exists(data_dir):
-                    security_files = [f for f in os.listdir(data_dir) if 'security' in f and f.endswith('.csv')]
-                    if security_files:
-                        # Use the most recent security file
-                        latest_file = max([os.path.join(data_dir, f) for f in security_files], 
-                                        key=os.path.getmtime)
+                    latest_file = DataManifest(data_dir).latest_file()
+                    if latest_file:
+                        # Use the file holding the most recent samples
                         print(f"📁 Using latest security file: {latest_file}")
-                        df = pd.read_csv(latest_file)
+                        df = read_history_csv(latest_file)
                     else:
                         raise FileNotFoundError("No security monitoring files found")
                 else:
                     raise FileNotFoundError(f"Data directory not found: {data_dir}")
             
+            if where is not None:
+                df = df[frame_mask(df, where)].reset_index(drop=True)
+            
             print(f"✅ Loaded {len(df)} data points from {len(df['computer_name'].unique())} computers")
             
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            # Convert epoch-ns (or legacy ISO) timestamps to datetimes for time features
+            df['timestamp'] = to_local_datetime(df['timestamp'])
+            df = df.dropna(subset=['timestamp'])
             
             # Sort by timestamp
             df = df.sort_values(['computer_name', 'timestamp']).reset_index(drop=True)
             
-            # Clean data
-            df = df.fillna(0)  # Fill missing values
-            
-            # Add missing columns if they don't exist (for backwards compatibility)
-            expected_columns = [
-                'security_score', 'antivirus_enabled', 'real_time_protection',
-                'definition_age_days', 'suspicious_activity_count', 'vulnerability_count',
-                'security_software_count'
-            ]
-            
-            for col in expected_columns:
-                if col not in df.columns:
-                    print(f"⚠️  Adding missing column: {col}")
-                    if col == 'security_score':
-                        df[col] = 85  # Default good security score
-                    elif col in ['antivirus_enabled', 'real_time_protection']:
-                        df[col] = True  # Assume enabled by default
-                    else:
-                        df[col] = 0  # Default to 0 for counts and ages
+            # Exact dtypes, per-column defaults for gaps and for columns older files lack
+            df = apply_schema(df)
             
             print(f"📋 Computers in dataset: {', '.join(df['computer_name'].unique())}")
             
@@ -729,7 +758,7 @@ def main():
                 
                 # Check for default data file
                 default_file = "data/system_security_all_computers.csv"
-                custom_file = input(f"📁 Enter CSV file path (or press Enter for '{default_file}'): ").strip()
+                custom_file = input(f"📁 Enter CSV, SQLite (.db), segment (.gts) or memmap (.hist) file path (or press Enter for '{default_file}'): ").strip()
                 
                 if not custom_file:
                     csv_file = default_file
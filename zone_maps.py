@@ -0,0 +1,157 @@
+# zone_maps.py
+"""
+Block-level zone maps and the predicates evaluated against them.
+
+Every stored block keeps a min/max/count summary for each metric next to its
+timestamp range. A predicate such as disk_percent > 90 can rule a block out
+from its summary alone, so a query like "when did disk_percent exceed 90 on
+any host" only decodes the blocks that might hold a matching row.
+
+Predicates are (column, operator, value) tuples or strings like
+"disk_percent>90"; several predicates are combined with AND.
+"""
+
+import re
+import struct
+import operator
+from timestamps import to_epoch_ns
+
+# Per-column block summary: min, max, number of non-missing values
+ZONE_ENTRY = struct.Struct('<ddI')
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne
+}
+
+PREDICATE_PATTERN = re.compile(r'^\s*(?P<column>\w+)\s*(?P<op>>=|<=|==|!=|>|<)\s*(?P<value>\S.*?)\s*$')
+
+
+def _predicate_value(column, value):
+    """Coerce a predicate value to the type stored for its column"""
+    if column == 'timestamp':
+        return to_epoch_ns(value)
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        if value in ('True', 'true'):
+            return 1.0
+        if value in ('False', 'false'):
+            return 0.0
+        try:
+            return float(value)
+        except ValueError:
+            return value.strip('\'"')
+    return value
+
+
+def parse_predicate(text):
+    """Parse "column<op>value" into a (column, operator, value) tuple"""
+    match = PREDICATE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Invalid predicate: {text!r} (expected e.g. disk_percent>90)")
+    column = match.group('column')
+    return column, match.group('op'), _predicate_value(column, match.group('value'))
+
+
+def normalise_predicates(where):
+    """Turn None, a string, a tuple or a list of either into a list of predicate tuples"""
+    if where is None:
+        return []
+    if isinstance(where, str):
+        return [parse_predicate(where)]
+    if isinstance(where, tuple) and len(where) == 3 and where[1] in OPERATORS:
+        where = [where]
+    
+    predicates = []
+    for predicate in where:
+        if isinstance(predicate, str):
+            predicates.append(parse_predicate(predicate))
+        else:
+            column, op, value = predicate
+            if op not in OPERATORS:
+                raise ValueError(f"Unsupported operator: {op}")
+            predicates.append((column, op, _predicate_value(column, value)))
+    return predicates
+
+
+def compute_zone(values):
+    """Summarise a float array as (min, max, count), ignoring NaN"""
+    import numpy as np
+    
+    valid = values[~np.isnan(values)]
+    if len(valid) == 0:
+        return float('nan'), float('nan'), 0
+    return float(valid.min()), float(valid.max()), len(valid)
+
+
+def zone_may_match(zone, op, value):
+    """Whether any value summarised by `zone` could satisfy `op value`"""
+    low, high, count = zone
+    if count == 0 or isinstance(value, str):
+        return count > 0
+    if op == '>':
+        return high > value
+    if op == '>=':
+        return high >= value
+    if op == '<':
+        return low < value
+    if op == '<=':
+        return low <= value
+    if op == '==':
+        return low <= value <= high
+    return not (low == high == value)
+
+
+def block_may_match(min_ts, max_ts, zones, predicates):
+    """False only when the block's summaries prove that no row can match"""
+    for column, op, value in predicates:
+        if column == 'timestamp':
+            if not zone_may_match((min_ts, max_ts, 1), op, value):
+                return False
+        elif zones is not None and column in zones:
+            if not zone_may_match(zones[column], op, value):
+                return False
+    return True
+
+
+def row_mask(columns, predicates, length):
+    """Row-level boolean mask for predicates over a dict of column arrays
+    
+    Missing values (NaN, None) match no predicate, not even '!=', so the
+    mask agrees with zone_may_match, which only counts present values.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    mask = np.ones(length, dtype=bool)
+    for column, op, value in predicates:
+        if column not in columns:
+            raise KeyError(f"Unknown column in predicate: {column}")
+        values = np.asarray(columns[column])
+        if values.dtype == bool:
+            values = values.astype('float64')
+        present = ~np.asarray(pd.isna(values), dtype=bool)
+        matches = np.zeros(length, dtype=bool)
+        matches[present] = np.asarray(OPERATORS[op](values[present], value), dtype=bool)
+        mask &= matches
+    return mask
+
+
+def frame_mask(df, where):
+    """Row mask for predicates over a DataFrame (epoch-ns or datetime timestamps)"""
+    import pandas as pd
+    
+    predicates = normalise_predicates(where)
+    columns = {}
+    for column, _, _ in predicates:
+        if column == 'timestamp' and not pd.api.types.is_integer_dtype(df['timestamp']):
+            from timestamps import epoch_ns_series
+            columns[column] = epoch_ns_series(df['timestamp']).to_numpy()
+        elif column in df.columns:
+            columns[column] = df[column].to_numpy()
+    return row_mask(columns, predicates, len(df))